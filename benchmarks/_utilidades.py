@@ -0,0 +1,24 @@
+"""
+Utilidades compartidas por los archivos de benchmarks
+"""
+
+import os
+
+
+# Exponente máximo de 10 para los tamaños de los casos (BENCH_ESCALA)
+ESCALA_MAXIMA = int(os.environ.get('BENCH_ESCALA', 6))
+
+
+def tamaños(minimo=3, maximo=None):
+    """
+    Tamaños 10^minimo ... 10^k para parametrizar casos, con k acotado por BENCH_ESCALA
+    
+    Parámetros:
+    minimo (int): Exponente inicial
+    maximo (int, opcional): Exponente máximo propio del caso
+    
+    Retorna:
+    list: Tamaños a medir
+    """
+    tope = ESCALA_MAXIMA if maximo is None else min(maximo, ESCALA_MAXIMA)
+    return [10 ** k for k in range(minimo, tope + 1)]
@@ -0,0 +1,145 @@
+"""
+Configuración de la suite de benchmarks
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Mide con `time.perf_counter` los casos de cada archivo test_*.py, guarda los
+resultados en JSON y hace fallar un caso cuando su mejor tiempo supera al de la
+línea base en más del umbral configurado.
+
+Variables de entorno:
+    BENCH_ESCALA                 Exponente máximo de 10 para los tamaños (por defecto 6)
+    BENCH_UMBRAL                 Cociente tiempo / línea base que cuenta como regresión (1.5)
+    BENCH_TOLERANCIA             Holgura absoluta en segundos para casos muy cortos (0.001)
+    BENCH_TIEMPO_MINIMO          Segundos mínimos de medición por caso (0.2)
+    BENCH_RESULTADOS             Archivo JSON de resultados (benchmarks/resultados.json)
+    BENCH_LINEA_BASE             Archivo JSON de línea base (benchmarks/linea_base.json)
+    BENCH_ACTUALIZAR_LINEA_BASE  Si es 1, guarda esta corrida como nueva línea base
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+for unidad in ('unidad_1', 'unidad_2', 'unidad_3'):
+    sys.path.insert(0, str(RAIZ / 'notebooks' / unidad))
+
+CARPETA = Path(__file__).resolve().parent
+sys.path.insert(0, str(CARPETA))
+
+from _utilidades import ESCALA_MAXIMA
+
+UMBRAL = float(os.environ.get('BENCH_UMBRAL', 1.5))
+TOLERANCIA = float(os.environ.get('BENCH_TOLERANCIA', 0.001))
+TIEMPO_MINIMO = float(os.environ.get('BENCH_TIEMPO_MINIMO', 0.2))
+RUTA_RESULTADOS = Path(os.environ.get('BENCH_RESULTADOS', CARPETA / 'resultados.json'))
+RUTA_LINEA_BASE = Path(os.environ.get('BENCH_LINEA_BASE', CARPETA / 'linea_base.json'))
+ACTUALIZAR_LINEA_BASE = os.environ.get('BENCH_ACTUALIZAR_LINEA_BASE') == '1'
+
+_resultados = {}
+
+
+def _cargar_linea_base():
+    if not RUTA_LINEA_BASE.exists():
+        return {}
+    return json.loads(RUTA_LINEA_BASE.read_text(encoding='utf-8')).get('casos', {})
+
+_linea_base = _cargar_linea_base()
+
+
+class Medidor:
+    """
+    Mide una función: una ejecución de calentamiento y luego rondas hasta
+    juntar al menos `rondas_minimas` y TIEMPO_MINIMO segundos
+    """
+    
+    def __init__(self, caso):
+        self.caso = caso
+        self.estadisticas = None
+    
+    def __call__(self, funcion, *args, rondas_minimas=3, **kwargs):
+        resultado = funcion(*args, **kwargs)
+        tiempos = []
+        total = 0.0
+        while len(tiempos) < rondas_minimas or total < TIEMPO_MINIMO:
+            inicio = time.perf_counter()
+            funcion(*args, **kwargs)
+            tiempos.append(time.perf_counter() - inicio)
+            total += tiempos[-1]
+        tiempos = np.array(tiempos)
+        self.estadisticas = {'minimo': float(tiempos.min()),
+                             'mediana': float(np.median(tiempos)),
+                             'media': float(tiempos.mean()),
+                             'desvio': float(tiempos.std()),
+                             'rondas': int(len(tiempos))}
+        return resultado
+
+
+@pytest.fixture
+def medir(request):
+    """
+    Fixture que mide una función y compara su mejor tiempo con la línea base
+    
+    Uso: `medir(funcion, *args, **kwargs)` devuelve el resultado de la función.
+    """
+    caso = request.node.nodeid.split('::', 1)[-1]
+    caso = f"{Path(request.node.fspath).stem}::{caso}"
+    medidor = Medidor(caso)
+    yield medidor
+    if medidor.estadisticas is None:
+        return
+    _resultados[caso] = medidor.estadisticas
+    base = _linea_base.get(caso)
+    if base is not None and not ACTUALIZAR_LINEA_BASE:
+        limite = base['minimo'] * UMBRAL + TOLERANCIA
+        if medidor.estadisticas['minimo'] > limite:
+            pytest.fail(f"Regresión en {caso}: {medidor.estadisticas['minimo'] * 1e3:.3f} ms "
+                        f"> {limite * 1e3:.3f} ms (línea base {base['minimo'] * 1e3:.3f} ms "
+                        f"× {UMBRAL} + {TOLERANCIA * 1e3:.3f} ms)", pytrace=False)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _resultados:
+        return
+    salida = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'entorno': {'python': platform.python_version(), 'plataforma': platform.platform(),
+                    'numpy': np.__version__, 'pandas': pd.__version__,
+                    'matplotlib': matplotlib.__version__},
+        'configuracion': {'escala': ESCALA_MAXIMA, 'umbral': UMBRAL,
+                          'tolerancia': TOLERANCIA, 'tiempo_minimo': TIEMPO_MINIMO},
+        'casos': dict(sorted(_resultados.items())),
+    }
+    texto = json.dumps(salida, indent=2, ensure_ascii=False)
+    RUTA_RESULTADOS.parent.mkdir(parents=True, exist_ok=True)
+    RUTA_RESULTADOS.write_text(texto, encoding='utf-8')
+    if ACTUALIZAR_LINEA_BASE:
+        # Se conservan los casos de la línea base que no se corrieron esta vez
+        salida['casos'] = dict(sorted({**_linea_base, **_resultados}.items()))
+        RUTA_LINEA_BASE.write_text(json.dumps(salida, indent=2, ensure_ascii=False),
+                                   encoding='utf-8')
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _resultados:
+        return
+    terminalreporter.section('benchmarks')
+    for caso, estadisticas in sorted(_resultados.items()):
+        base = _linea_base.get(caso)
+        relacion = f"  ×{estadisticas['minimo'] / base['minimo']:.2f}" if base else ''
+        terminalreporter.write_line(f"{estadisticas['minimo'] * 1e3:12.3f} ms  "
+                                    f"({estadisticas['rondas']:4d} rondas)  {caso}{relacion}")
+    terminalreporter.write_line(f"Resultados en {RUTA_RESULTADOS}")
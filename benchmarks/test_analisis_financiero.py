@@ -0,0 +1,76 @@
+"""
+Benchmarks de ratios, Z-Score de Altman y dashboards sobre paneles de empresas (unidad 2)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from _utilidades import tamaños
+from analisis_financiero import (CAMPOS_ALTMAN, CAMPOS_RATIOS, FAMILIAS_RATIOS,
+                                 calcular_ratios_panel, z_score_altman, z_score_altman_panel)
+from dashboards_lote import PlantillaDashboard, generar_dashboards, ratios_dashboard
+
+
+def _panel(filas, periodos=4):
+    """Panel ancho sintético de `filas` estados: filas / periodos empresas × periodos"""
+    rng = np.random.default_rng(0)
+    campos = sorted(set(sum(CAMPOS_RATIOS.values(), CAMPOS_ALTMAN)))
+    panel = pd.DataFrame({c: rng.uniform(100, 10_000, filas) for c in campos})
+    panel['capital_trabajo'] = panel['activo_corriente'] - panel['pasivo_corriente']
+    panel['empresa'] = np.repeat(np.arange(filas // periodos + 1), periodos)[:filas]
+    panel['periodo'] = np.tile(np.arange(periodos), filas // periodos + 1)[:filas]
+    return panel.set_index(['empresa', 'periodo'])
+
+
+@pytest.mark.parametrize('n', tamaños(3, 6))
+@pytest.mark.parametrize('familia', list(FAMILIAS_RATIOS))
+def test_familia_ratios(medir, familia, n):
+    panel = _panel(n)
+    ratios = medir(calcular_ratios_panel, panel, [familia])
+    assert len(ratios) == n
+
+
+@pytest.mark.parametrize('n', tamaños(3, 6))
+def test_calcular_ratios_panel(medir, n):
+    panel = _panel(n)
+    assert len(medir(calcular_ratios_panel, panel)) == n
+
+
+@pytest.mark.parametrize('n', tamaños(3, 6))
+def test_z_score_altman_panel(medir, n):
+    panel = _panel(n)
+    assert len(medir(z_score_altman_panel, panel)) == n
+
+
+@pytest.mark.parametrize('n', tamaños(2, 3))
+def test_z_score_altman_por_empresa(medir, n):
+    panel = _panel(n)
+    filas = panel.to_dict('records')
+    
+    def recorrer():
+        return [z_score_altman(f['activo_corriente'] - f['pasivo_corriente'],
+                               f['utilidades_retenidas'], f['resultado_operativo'],
+                               f['valor_mercado_capital'], f['ventas'],
+                               f['activo_total'], f['pasivo_total']) for f in filas]
+    
+    assert len(medir(recorrer)) == n
+
+
+def test_dashboard_plantilla(medir, tmp_path):
+    ratios = calcular_ratios_panel(_panel(8))
+    plantilla = PlantillaDashboard(ratios_dashboard(ratios.columns))
+    fila = ratios.iloc[0]
+    
+    def dibujar():
+        plantilla.actualizar('EMP', fila)
+        plantilla.guardar(tmp_path / 'dashboard.png')
+    
+    medir(dibujar)
+
+
+@pytest.mark.parametrize('formato', ['png', 'pdf'])
+def test_generar_dashboards(medir, formato, tmp_path):
+    ratios = calcular_ratios_panel(_panel(40))
+    rutas = medir(generar_dashboards, ratios.iloc[:10], tmp_path, formato, rondas_minimas=1)
+    assert len(rutas) >= 1
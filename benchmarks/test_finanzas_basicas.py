@@ -0,0 +1,47 @@
+"""
+Benchmarks de las funciones de valor temporal del dinero (unidad 1)
+"""
+
+import numpy as np
+import pytest
+
+from _utilidades import tamaños
+from finanzas_basicas import (valor_futuro, valor_actual, va_anualidad_ordinaria,
+                              vf_anualidad_adelantada, va_anualidad_diferida,
+                              tna_a_tea, convertir_tasa_efectiva)
+
+
+def _datos(n):
+    rng = np.random.default_rng(0)
+    return (rng.uniform(1_000, 100_000, n), rng.uniform(0.0, 0.1, n),
+            rng.integers(1, 360, n).astype(np.float64))
+
+
+@pytest.mark.parametrize('n', tamaños(3, 7))
+@pytest.mark.parametrize('funcion', [valor_futuro, valor_actual, va_anualidad_ordinaria,
+                                     vf_anualidad_adelantada], ids=lambda f: f.__name__)
+def test_valor_temporal(medir, funcion, n):
+    montos, tasas, periodos = _datos(n)
+    resultado = medir(funcion, montos, tasas, periodos)
+    assert resultado.shape == (n,)
+
+
+@pytest.mark.parametrize('n', tamaños(3, 7))
+def test_valor_temporal_out(medir, n):
+    montos, tasas, periodos = _datos(n)
+    salida = np.empty(n)
+    medir(va_anualidad_ordinaria, montos, tasas, periodos, out=salida)
+    assert np.isfinite(salida).all()
+
+
+@pytest.mark.parametrize('n', tamaños(3, 7))
+def test_va_anualidad_diferida(medir, n):
+    montos, tasas, periodos = _datos(n)
+    resultado = medir(va_anualidad_diferida, montos, tasas, periodos, 6)
+    assert resultado.shape == (n,)
+
+
+@pytest.mark.parametrize('n', tamaños(3, 7))
+def test_conversion_tasas(medir, n):
+    _, tasas, _ = _datos(n)
+    medir(lambda: convertir_tasa_efectiva(tna_a_tea(tasas, 12), 1, 12))
@@ -0,0 +1,70 @@
+"""
+Benchmarks de valuación de bonos sobre carteras (unidad 3)
+
+Las versiones escalares (`precio_bono`, `rendimiento_al_vencimiento`,
+`convexidad`) se miden bono por bono sobre carteras chicas; las vectorizadas
+sobre la cartera completa.
+"""
+
+import numpy as np
+import pytest
+
+from _utilidades import tamaños
+from valuacion_bonos import (CarteraBonos, precio_bono, rendimiento_al_vencimiento,
+                             convexidad, metricas_bono, rendimiento_al_vencimiento_lote)
+
+
+def _cartera(n):
+    rng = np.random.default_rng(0)
+    return (np.full(n, 1000.0), rng.uniform(0.02, 0.12, n),
+            rng.integers(1, 31, n).astype(np.float64), rng.choice([1, 2, 4], n),
+            rng.uniform(0.01, 0.15, n))
+
+
+@pytest.mark.parametrize('n', tamaños(2, 3))
+@pytest.mark.parametrize('funcion', [precio_bono, convexidad], ids=lambda f: f.__name__)
+def test_escalar_por_bono(medir, funcion, n):
+    nominal, cupon, años, frecuencia, rendimiento = _cartera(n)
+    
+    def recorrer():
+        return [funcion(nominal[i], cupon[i], años[i], rendimiento[i], frecuencia[i])
+                for i in range(n)]
+    
+    assert len(medir(recorrer)) == n
+
+
+@pytest.mark.parametrize('n', tamaños(2, 3))
+def test_rendimiento_al_vencimiento_por_bono(medir, n):
+    nominal, cupon, años, frecuencia, rendimiento = _cartera(n)
+    precios = metricas_bono(nominal, cupon, años, rendimiento, frecuencia).precio
+    
+    def recorrer():
+        return [rendimiento_al_vencimiento(precios[i], nominal[i], cupon[i], años[i],
+                                           frecuencia[i]) for i in range(n)]
+    
+    assert len(medir(recorrer)) == n
+
+
+@pytest.mark.parametrize('n', tamaños(3, 7))
+def test_metricas_bono(medir, n):
+    nominal, cupon, años, frecuencia, rendimiento = _cartera(n)
+    resultado = medir(metricas_bono, nominal, cupon, años, rendimiento, frecuencia)
+    assert resultado.convexidad.shape == (n,)
+
+
+@pytest.mark.parametrize('n', tamaños(3, 6))
+def test_rendimiento_al_vencimiento_lote(medir, n):
+    nominal, cupon, años, frecuencia, rendimiento = _cartera(n)
+    precios = metricas_bono(nominal, cupon, años, rendimiento, frecuencia).precio
+    resultado = medir(rendimiento_al_vencimiento_lote, precios, nominal, cupon, años, frecuencia)
+    np.testing.assert_allclose(resultado.rendimiento, rendimiento, atol=1e-8)
+
+
+@pytest.mark.parametrize('n', tamaños(3, 6))
+@pytest.mark.parametrize('metodo', ['precio', 'convexidad'])
+def test_cartera_bonos(medir, metodo, n):
+    nominal, cupon, años, frecuencia, rendimiento = _cartera(n)
+    cartera = CarteraBonos()
+    cartera.agregar(nominal, cupon, años, frecuencia)
+    resultado = medir(getattr(cartera, metodo), rendimiento)
+    assert len(resultado) == n
@@ -0,0 +1,273 @@
+"""
+Módulo de Evaluación de Proyectos
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo evalúa carteras completas de proyectos de inversión a partir de una
+matriz de flujos (proyectos × períodos), donde la columna 0 es el momento de la
+inversión inicial. Los proyectos de distinta duración se completan con ceros al
+final, lo que no altera ni el VAN ni la TIR.
+
+El VAN para muchas tasas de descuento sale de un único producto matricial
+contra la matriz de factores de descuento, y la TIR de todos los proyectos se
+resuelve en simultáneo con iteraciones de Newton protegidas por un intervalo.
+La regla de los signos de Descartes marca los proyectos sin TIR o con posibles
+TIR múltiples.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+
+from finanzas_basicas import valor_actual
+
+
+# Intervalo de búsqueda de la TIR por período
+TIR_MINIMA = -0.99
+TIR_MAXIMA = 10.0
+
+# Diagnóstico según la cantidad de cambios de signo de los flujos
+DIAGNOSTICOS_TIR = ('sin_tir', 'unica', 'multiple_posible')
+
+
+class ResultadoTIR(NamedTuple):
+    """
+    Resultado de `tir_proyectos`.
+    
+    tir : TIR por período de cada proyecto (NaN donde no convergió)
+    convergido : máscara booleana de convergencia por proyecto
+    iteraciones : iteraciones utilizadas por cada proyecto
+    cambios_signo : cambios de signo de los flujos de cada proyecto
+    """
+    tir: np.ndarray
+    convergido: np.ndarray
+    iteraciones: np.ndarray
+    cambios_signo: np.ndarray
+
+
+def matriz_flujos(flujos):
+    """
+    Convierte los flujos de una cartera de proyectos en una matriz rectangular
+    
+    Acepta una matriz (o DataFrame) de proyectos × períodos o una lista de
+    secuencias de distinto largo; los huecos y los NaN se completan con ceros.
+    
+    Parámetros:
+    flujos (array_like, DataFrame o list): Flujos de cada proyecto desde el período 0
+    
+    Retorna:
+    tuple: (matriz float64 de proyectos × períodos, índice de proyectos o None)
+    """
+    indice = flujos.index if isinstance(flujos, pd.DataFrame) else None
+    if isinstance(flujos, (list, tuple)) and any(np.ndim(f) != 1 or len(f) != len(flujos[0])
+                                                for f in flujos):
+        largos = np.array([len(f) for f in flujos])
+        matriz = np.zeros((len(flujos), largos.max(initial=0)))
+        matriz[np.arange(largos.max(initial=0)) < largos[:, None]] = np.concatenate(
+            [np.asarray(f, dtype=np.float64) for f in flujos])
+    else:
+        matriz = np.atleast_2d(np.asarray(flujos, dtype=np.float64))
+    return np.nan_to_num(matriz, nan=0.0), indice
+
+def factores_descuento(tasas, periodos):
+    """
+    Matriz de factores de descuento (1 + r)^-t de períodos × tasas
+    
+    Parámetros:
+    tasas (float o array_like): Tasas de descuento por período
+    periodos (int): Cantidad de columnas de flujos (incluye el período 0)
+    
+    Retorna:
+    np.ndarray: Matriz de factores de descuento
+    """
+    tasas = np.atleast_1d(np.asarray(tasas, dtype=np.float64))
+    return valor_actual(1.0, tasas[None, :], np.arange(periodos)[:, None])
+
+def van_proyectos(flujos, tasas):
+    """
+    Calcula el VAN de todos los proyectos para todas las tasas de descuento
+    
+    Parámetros:
+    flujos (array_like, DataFrame o list): Flujos de cada proyecto desde el período 0
+    tasas (float o array_like): Tasas de descuento por período
+    
+    Retorna:
+    np.ndarray o DataFrame: VAN de proyectos × tasas (DataFrame si los flujos
+    venían en un DataFrame)
+    """
+    matriz, indice = matriz_flujos(flujos)
+    tasas = np.atleast_1d(np.asarray(tasas, dtype=np.float64))
+    van = matriz @ factores_descuento(tasas, matriz.shape[1])
+    if indice is not None:
+        return pd.DataFrame(van, index=indice, columns=pd.Index(tasas, name='tasa'))
+    return van
+
+def cambios_de_signo(flujos):
+    """
+    Cuenta los cambios de signo de los flujos de cada proyecto, ignorando ceros
+    
+    Por la regla de Descartes, sin cambios de signo no hay TIR, con uno la TIR
+    es única y con más de uno puede haber varias.
+    
+    Parámetros:
+    flujos (array_like, DataFrame o list): Flujos de cada proyecto desde el período 0
+    
+    Retorna:
+    np.ndarray: Cantidad de cambios de signo por proyecto
+    """
+    matriz, _ = matriz_flujos(flujos)
+    signos = np.sign(matriz)
+    # Arrastrar el último signo no nulo sobre los ceros
+    columnas = np.where(signos != 0, np.arange(matriz.shape[1]), 0)
+    signos = np.take_along_axis(signos, np.maximum.accumulate(columnas, axis=1), axis=1)
+    return np.count_nonzero(signos[:, 1:] * signos[:, :-1] < 0, axis=1)
+
+def _van_y_derivada(matriz, tasa):
+    """
+    VAN y su derivada respecto de la tasa, fila a fila
+    
+    Cada fila se multiplica por la constante positiva que lleva su mayor
+    factor de descuento a 1, de modo que con tasas cercanas a -100% y plazos
+    largos no hay desbordes. El signo del VAN y el paso de Newton no cambian.
+    """
+    t = np.arange(matriz.shape[1])
+    exponente = -t * np.log1p(tasa)[:, None]
+    descuento = np.exp(exponente - exponente.max(axis=1, keepdims=True))
+    van = np.einsum('ij,ij->i', matriz, descuento)
+    derivada = -np.einsum('ij,ij->i', matriz * t, descuento) / (1 + tasa)
+    return van, derivada
+
+def tir_proyectos(flujos, estimacion=0.1, tol=1e-10, max_iter=100):
+    """
+    Calcula la TIR de todos los proyectos a la vez
+    
+    Resuelve VAN(r) = 0 con iteraciones de Newton vectorizadas. Cada proyecto
+    mantiene un intervalo [TIR_MINIMA, TIR_MAXIMA] que se achica con el signo
+    del VAN en cada iterado. El paso de Newton se reemplaza por una bisección
+    cuando cae fuera del intervalo, o cuando no achicó el intervalo a la mitad
+    y además no es menor que la mitad del paso anterior (Newton estancado, como
+    ocurre con plazos largos tras un primer paso a tasas muy negativas). Así,
+    en cada iteración se reduce a la mitad el intervalo o el paso, y la
+    cantidad de iteraciones queda acotada por el ancho del intervalo. Los proyectos sin cambio de signo del VAN en
+    el intervalo quedan en NaN. Con varios cambios de signo en los flujos se
+    devuelve una de las raíces; consultar `cambios_signo`.
+    
+    Parámetros:
+    flujos (array_like, DataFrame o list): Flujos de cada proyecto desde el período 0
+    estimacion (float o array_like): Estimación inicial de la TIR
+    tol (float): Tolerancia sobre el VAN relativo a la inversión y sobre el paso
+    max_iter (int): Máximo de iteraciones
+    
+    Retorna:
+    ResultadoTIR: TIR por período, convergencia, iteraciones y cambios de signo
+    """
+    matriz, _ = matriz_flujos(flujos)
+    n = matriz.shape[0]
+    escala = np.abs(matriz).max(axis=1, initial=0.0)
+    escala[escala == 0] = 1.0
+    matriz = matriz / escala[:, None]
+    
+    x = np.clip(np.broadcast_to(np.asarray(estimacion, dtype=np.float64), (n,)),
+                TIR_MINIMA, TIR_MAXIMA)
+    inferior = np.full(n, TIR_MINIMA)
+    superior = np.full(n, TIR_MAXIMA)
+    ancho = superior - inferior
+    paso_anterior = np.full(n, np.inf)
+    convergido = np.zeros(n, dtype=bool)
+    iteraciones = np.zeros(n, dtype=int)
+    
+    with np.errstate(all='ignore'):
+        signo_inferior = np.sign(_van_y_derivada(matriz, inferior)[0])
+        acotado = signo_inferior * np.sign(_van_y_derivada(matriz, superior)[0]) < 0
+    activos = np.flatnonzero(acotado)
+    
+    for _ in range(max_iter):
+        if activos.size == 0:
+            break
+        xa, lo, hi = x[activos], inferior[activos], superior[activos]
+        with np.errstate(all='ignore'):
+            van, derivada = _van_y_derivada(matriz[activos], xa)
+            
+            mismo_signo = np.sign(van) == signo_inferior[activos]
+            lo = np.where(mismo_signo, xa, lo)
+            hi = np.where(mismo_signo, hi, xa)
+            
+            x_nuevo = xa - van / derivada
+            paso = np.abs(x_nuevo - xa)
+            estancado = ((hi - lo) > 0.5 * ancho[activos]) & (paso > 0.5 * paso_anterior[activos])
+            fuera = ~np.isfinite(x_nuevo) | (x_nuevo <= lo) | (x_nuevo >= hi) | estancado
+            x_nuevo = np.where(fuera, 0.5 * (lo + hi), x_nuevo)
+            paso = np.abs(x_nuevo - xa)
+            
+            listo = (np.abs(van) <= tol) | (paso <= tol * (1 + np.abs(xa)))
+        
+        x[activos] = np.where(np.abs(van) <= tol, xa, x_nuevo)
+        inferior[activos], superior[activos] = lo, hi
+        ancho[activos] = hi - lo
+        paso_anterior[activos] = paso
+        iteraciones[activos] += 1
+        convergido[activos] = listo
+        activos = activos[~listo]
+    
+    x[~convergido] = np.nan
+    return ResultadoTIR(x, convergido, iteraciones, cambios_de_signo(matriz))
+
+def evaluar_proyectos(flujos, tasa, nombres=None):
+    """
+    Resume VAN, TIR y diagnóstico de la TIR de una cartera de proyectos
+    
+    Parámetros:
+    flujos (array_like, DataFrame o list): Flujos de cada proyecto desde el período 0
+    tasa (float): Tasa de descuento por período (costo de capital)
+    nombres (list, opcional): Nombres de los proyectos
+    
+    Retorna:
+    DataFrame: van, tir, cambios_signo, diagnostico_tir y acepta (VAN > 0)
+    """
+    matriz, indice = matriz_flujos(flujos)
+    van = (matriz @ factores_descuento(tasa, matriz.shape[1]))[:, 0]
+    resultado = tir_proyectos(matriz, estimacion=tasa)
+    diagnostico = pd.Categorical.from_codes(np.minimum(resultado.cambios_signo, 2),
+                                            categories=DIAGNOSTICOS_TIR)
+    if nombres is not None:
+        indice = pd.Index(nombres)
+    return pd.DataFrame({'van': van,
+                         'tir': resultado.tir,
+                         'cambios_signo': resultado.cambios_signo,
+                         'diagnostico_tir': diagnostico,
+                         'acepta': van > 0},
+                        index=indice if indice is not None else pd.RangeIndex(len(van),
+                                                                               name='proyecto'))
+
+
+if __name__ == "__main__":
+    import time
+    
+    print("=== TESTING MÓDULO EVALUACIÓN DE PROYECTOS ===")
+    
+    # Alternativas del notebook 1.2 parte 3, más un proyecto no convencional
+    flujos = [[-200000, 0, 0, 300000],
+              [-200000, 40000, 40000, 240000],
+              [-1000, 3600, -4310, 1716],
+              [500, 200, 100]]
+    print(evaluar_proyectos(flujos, 0.12,
+                            nombres=['Plazo Fijo UVA', 'Bono corporativo', 'no convencional', 'sin inversión']).round(4))
+    print(van_proyectos(flujos[:2], [0.08, 0.12, 0.16]).round(2))
+    
+    rng = np.random.default_rng(0)
+    matriz = np.hstack([-rng.uniform(50, 150, (50_000, 1)), rng.uniform(0, 40, (50_000, 10))])
+    inicio = time.perf_counter()
+    resultado = tir_proyectos(matriz)
+    van = van_proyectos(matriz, np.linspace(0.0, 0.3, 31))
+    print(f"\n{len(matriz)} proyectos: TIR y VAN para 31 tasas en "
+          f"{time.perf_counter() - inicio:.2f}s, convergidos {resultado.convergido.mean():.1%}")
+    print(f"VAN máximo en la TIR: {np.nanmax(np.abs(van_proyectos(matriz[:100], resultado.tir[:100]).diagonal())):.2e}")
+    
+    # Plazos largos: un egreso y 30 años de ingresos mensuales
+    largos = np.hstack([-rng.uniform(500, 1500, (5_000, 1)), rng.uniform(0, 20, (5_000, 360))])
+    resultado = tir_proyectos(largos)
+    print(f"360 períodos: convergidos {resultado.convergido.mean():.1%}, "
+          f"iteraciones máximas {resultado.iteraciones.max()}")
+    print(f"TIR de [-1000] + [10] * 300: {tir_proyectos([[-1000] + [10] * 300]).tir[0]:.6f}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -2,118 +2,395 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def valor_futuro(va, tasa, periodos):
+# Todas las funciones de valor temporal del dinero aceptan escalares, arreglos de
+# NumPy o pd.Series en cualquier argumento y aplican las reglas de broadcasting de
+# NumPy, de modo que una cartera completa se valúa con una sola llamada. Los
+# argumentos opcionales `dtype` y `out` permiten elegir el tipo de la salida o
+# escribir el resultado en un arreglo preasignado.
+
+def _como_arrays(*argumentos):
+    """
+    Convierte los argumentos a arreglos float64 para operar con broadcasting
+    
+    Retorna:
+    tuple: (lista de arreglos, índice de la primera pd.Series encontrada o None)
+    """
+    indice = None
+    arreglos = []
+    for argumento in argumentos:
+        if indice is None and isinstance(argumento, pd.Series):
+            indice = argumento.index
+        arreglos.append(np.asarray(argumento, dtype=np.float64))
+    return arreglos, indice
+
+def _aplicar(operacion, a, b, indice, dtype=None, out=None):
+    """
+    Aplica la operación final de una fórmula respetando `dtype` y `out`
+    
+    Si se pasa `out`, el resultado se escribe en ese arreglo (su tipo manda sobre
+    `dtype`). Si algún argumento era una pd.Series, se devuelve una Series con el
+    mismo índice.
+    """
+    if out is not None:
+        return operacion(a, b, out=out, casting='same_kind')
+    resultado = operacion(a, b, dtype=dtype)
+    if indice is not None and np.ndim(resultado) == 1 and len(resultado) == len(indice):
+        return pd.Series(resultado, index=indice)
+    return resultado
+
+def _factor_va_anualidad(tasa, periodos):
+    """
+    Factor de valor actual de una anualidad: (1 - (1 + i)^-n) / i
+    
+    Para i == 0 se usa el límite n, elemento a elemento. Se calcula con
+    log1p/expm1 para no perder precisión con tasas muy pequeñas.
+    """
+    es_cero = tasa == 0
+    tasa_segura = np.where(es_cero, 1.0, tasa)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        factor = -np.expm1(-periodos * np.log1p(tasa_segura)) / tasa_segura
+    return np.where(es_cero, periodos, factor)
+
+def _factor_vf_anualidad(tasa, periodos):
+    """
+    Factor de valor futuro de una anualidad: ((1 + i)^n - 1) / i
+    
+    Para i == 0 se usa el límite n, elemento a elemento.
+    """
+    es_cero = tasa == 0
+    tasa_segura = np.where(es_cero, 1.0, tasa)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        factor = np.expm1(periodos * np.log1p(tasa_segura)) / tasa_segura
+    return np.where(es_cero, periodos, factor)
+
+def valor_futuro(va, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor futuro de una inversión
     
     Parámetros:
-    va (float): Valor actual o inversión inicial
-    tasa (float): Tasa de interés (en decimales, ej: 0.10 para 10%)
-    periodos (int): Número de períodos
+    va (float o array_like): Valor actual o inversión inicial
+    tasa (float o array_like): Tasa de interés (en decimales, ej: 0.10 para 10%)
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor futuro
+    float, np.ndarray o pd.Series: Valor futuro
     """
-    return va * (1 + tasa) ** periodos
+    (va, tasa, periodos), indice = _como_arrays(va, tasa, periodos)
+    return _aplicar(np.multiply, va, (1 + tasa) ** periodos, indice, dtype, out)
 
-def valor_actual(vf, tasa, periodos):
+def valor_actual(vf, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor actual de un monto futuro
     
     Parámetros:
-    vf (float): Valor futuro
-    tasa (float): Tasa de interés (en decimales)
-    periodos (int): Número de períodos
+    vf (float o array_like): Valor futuro
+    tasa (float o array_like): Tasa de interés (en decimales)
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor actual
+    float, np.ndarray o pd.Series: Valor actual
     """
-    return vf / (1 + tasa) ** periodos
+    (vf, tasa, periodos), indice = _como_arrays(vf, tasa, periodos)
+    return _aplicar(np.divide, vf, (1 + tasa) ** periodos, indice, dtype, out)
 
-def va_anualidad_ordinaria(pago, tasa, periodos):
+def va_anualidad_ordinaria(pago, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor actual de una anualidad ordinaria
     
+    Con tasa igual a cero el resultado es pago * periodos.
+    
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
-    periodos (int): Número de períodos
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor actual de la anualidad
+    float, np.ndarray o pd.Series: Valor actual de la anualidad
     """
-    return pago * (1 - (1 + tasa) ** -periodos) / tasa
+    (pago, tasa, periodos), indice = _como_arrays(pago, tasa, periodos)
+    return _aplicar(np.multiply, pago, _factor_va_anualidad(tasa, periodos),
+                    indice, dtype, out)
 
-def va_anualidad_adelantada(pago, tasa, periodos):
+def va_anualidad_adelantada(pago, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor actual de una anualidad adelantada
     
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
-    periodos (int): Número de períodos
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor actual de la anualidad
+    float, np.ndarray o pd.Series: Valor actual de la anualidad
     """
-    return va_anualidad_ordinaria(pago, tasa, periodos) * (1 + tasa)
+    (pago, tasa, periodos), indice = _como_arrays(pago, tasa, periodos)
+    factor = _factor_va_anualidad(tasa, periodos) * (1 + tasa)
+    return _aplicar(np.multiply, pago, factor, indice, dtype, out)
 
-def va_anualidad_diferida(pago, tasa, periodos, periodos_gracia):
+def va_anualidad_diferida(pago, tasa, periodos, periodos_gracia, dtype=None, out=None):
     """
     Calcula el valor actual de una anualidad diferida
     
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
-    periodos (int): Número de períodos de la anualidad
-    periodos_gracia (int): Número de períodos de gracia antes del primer pago
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    periodos (int o array_like): Número de períodos de la anualidad
+    periodos_gracia (int o array_like): Número de períodos de gracia antes del primer pago
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor actual de la anualidad diferida
+    float, np.ndarray o pd.Series: Valor actual de la anualidad diferida
     """
-    va = va_anualidad_ordinaria(pago, tasa, periodos)
-    return va / (1 + tasa) ** periodos_gracia
+    (pago, tasa, periodos, periodos_gracia), indice = _como_arrays(
+        pago, tasa, periodos, periodos_gracia)
+    factor = _factor_va_anualidad(tasa, periodos) / (1 + tasa) ** periodos_gracia
+    return _aplicar(np.multiply, pago, factor, indice, dtype, out)
 
-def va_perpetuidad(pago, tasa):
+def va_perpetuidad(pago, tasa, dtype=None, out=None):
     """
     Calcula el valor actual de una perpetuidad
     
+    Con tasa igual a cero el valor es infinito (con el signo del pago).
+    
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor actual de la perpetuidad
+    float, np.ndarray o pd.Series: Valor actual de la perpetuidad
     """
-    return pago / tasa
+    (pago, tasa), indice = _como_arrays(pago, tasa)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _aplicar(np.divide, pago, tasa, indice, dtype, out)
 
-def vf_anualidad_ordinaria(pago, tasa, periodos):
+def vf_anualidad_ordinaria(pago, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor futuro de una anualidad ordinaria
     
+    Con tasa igual a cero el resultado es pago * periodos.
+    
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
-    periodos (int): Número de períodos
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
     
     Retorna:
-    float: Valor futuro de la anualidad
+    float, np.ndarray o pd.Series: Valor futuro de la anualidad
     """
-    return pago * ((1 + tasa) ** periodos - 1) / tasa
+    (pago, tasa, periodos), indice = _como_arrays(pago, tasa, periodos)
+    return _aplicar(np.multiply, pago, _factor_vf_anualidad(tasa, periodos),
+                    indice, dtype, out)
 
-def vf_anualidad_adelantada(pago, tasa, periodos):
+def vf_anualidad_adelantada(pago, tasa, periodos, dtype=None, out=None):
     """
     Calcula el valor futuro de una anualidad adelantada
     
     Parámetros:
-    pago (float): Pago periódico
-    tasa (float): Tasa de interés por período
-    periodos (int): Número de períodos
+    pago (float o array_like): Pago periódico
+    tasa (float o array_like): Tasa de interés por período
+    periodos (int o array_like): Número de períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
+    
+    Retorna:
+    float, np.ndarray o pd.Series: Valor futuro de la anualidad adelantada
+    """
+    (pago, tasa, periodos), indice = _como_arrays(pago, tasa, periodos)
+    factor = _factor_vf_anualidad(tasa, periodos) * (1 + tasa)
+    return _aplicar(np.multiply, pago, factor, indice, dtype, out)
+
+# Motor de amortización para carteras de préstamos. Los cronogramas de todos los
+# préstamos se guardan en arreglos planos contiguos: el préstamo j ocupa las
+# posiciones offsets[j]:offsets[j+1]. Los factores (1 + i)^k de cada cuota salen
+# de la forma cerrada del producto acumulado, sin recorrer los períodos.
+
+SISTEMAS_AMORTIZACION = ('frances', 'aleman')
+TAMAÑO_BLOQUE_PRESTAMOS = 100_000
+
+def calcular_cuota(monto_prestamo, tasa, plazo, dtype=None, out=None):
+    """
+    Calcula la cuota periódica de un préstamo (sistema francés)
+    
+    Parámetros:
+    monto_prestamo (float o array_like): Monto del préstamo
+    tasa (float o array_like): Tasa de interés por período
+    plazo (int o array_like): Plazo en períodos
+    dtype (np.dtype, opcional): Tipo de dato de la salida
+    out (np.ndarray, opcional): Arreglo preasignado donde escribir el resultado
+    
+    Retorna:
+    float, np.ndarray o pd.Series: Cuota periódica
+    """
+    (monto_prestamo, tasa, plazo), indice = _como_arrays(monto_prestamo, tasa, plazo)
+    return _aplicar(np.divide, monto_prestamo, _factor_va_anualidad(tasa, plazo),
+                    indice, dtype, out)
+
+class CronogramaPrestamos:
+    """
+    Cronogramas de amortización de muchos préstamos en arreglos planos
+    
+    Cada arreglo por cuota (periodo, cuota, interes, capital, saldo) tiene una
+    posición por cuota de cada préstamo; `prestamo` indica a qué préstamo
+    pertenece cada posición y `offsets` delimita los tramos.
+    """
+    
+    __slots__ = ('sistema', 'offsets', 'prestamo', 'periodo',
+                 'cuota', 'interes', 'capital', 'saldo')
+    
+    def __init__(self, sistema, offsets, periodo, cuota, interes, capital, saldo):
+        self.sistema = sistema
+        self.offsets = offsets
+        self.prestamo = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        self.periodo = periodo
+        self.cuota = cuota
+        self.interes = interes
+        self.capital = capital
+        self.saldo = saldo
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __repr__(self):
+        return (f"CronogramaPrestamos(sistema='{self.sistema}', préstamos={len(self)}, "
+                f"cuotas={len(self.cuota)})")
+    
+    def tabla(self, j):
+        """
+        Tabla de amortización de un préstamo, con las columnas de los notebooks
+        
+        Parámetros:
+        j (int): Posición del préstamo en la cartera
+        
+        Retorna:
+        DataFrame: Tabla de amortización
+        """
+        tramo = slice(self.offsets[j], self.offsets[j + 1])
+        return pd.DataFrame({
+            'Período': self.periodo[tramo],
+            'Cuota': self.cuota[tramo],
+            'Interés': self.interes[tramo],
+            'Capital': self.capital[tramo],
+            'Saldo': self.saldo[tramo]
+        })
+    
+    def por_mes(self, mes_inicio=0, meses=None):
+        """
+        Agrega los flujos de toda la cartera por mes calendario
+        
+        Parámetros:
+        mes_inicio (int o array_like): Mes de la primera cuota de cada préstamo
+        meses (int, opcional): Largo mínimo del resultado
+        
+        Retorna:
+        DataFrame: Cuota, interés, capital y saldo total por mes
+        """
+        mes_inicio = np.broadcast_to(np.asarray(mes_inicio, dtype=np.int64), (len(self),))
+        mes = mes_inicio[self.prestamo] + self.periodo - 1
+        largo = max(int(mes.max(initial=-1)) + 1, meses or 0)
+        return pd.DataFrame(
+            {columna: np.bincount(mes, weights=getattr(self, columna), minlength=largo)
+             for columna in ('cuota', 'interes', 'capital', 'saldo')},
+            index=pd.RangeIndex(largo, name='mes'))
+
+def cronograma_amortizacion(montos, tasas, plazos, sistema='frances', dtype=np.float64):
+    """
+    Genera los cronogramas de amortización de una cartera de préstamos
+    
+    En el sistema francés la cuota es constante y el capital crece con el
+    factor (1 + i)^(k-1); en el alemán el capital es constante y el interés se
+    calcula sobre el saldo que decrece linealmente.
+    
+    Parámetros:
+    montos (float o array_like): Monto de cada préstamo
+    tasas (float o array_like): Tasa de interés por período de cada préstamo
+    plazos (int o array_like): Plazo en períodos de cada préstamo
+    sistema (str): 'frances' o 'aleman'
+    dtype (np.dtype): Tipo de dato de los arreglos de montos
+    
+    Retorna:
+    CronogramaPrestamos: Cronogramas de todos los préstamos en arreglos planos
+    """
+    if sistema not in SISTEMAS_AMORTIZACION:
+        raise ValueError(f"El sistema debe ser uno de {SISTEMAS_AMORTIZACION}")
+    montos, tasas, plazos = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(montos, dtype=np.float64)),
+        np.atleast_1d(np.asarray(tasas, dtype=np.float64)),
+        np.atleast_1d(np.asarray(plazos)))
+    plazos = plazos.astype(np.int64)
+    if np.any(plazos < 1):
+        raise ValueError("Los plazos deben ser de al menos un período")
+    
+    offsets = np.concatenate([[0], np.cumsum(plazos)])
+    prestamo = np.repeat(np.arange(len(plazos)), plazos)
+    periodo = np.arange(offsets[-1]) - offsets[prestamo] + 1
+    monto = montos[prestamo]
+    tasa = tasas[prestamo]
+    
+    if sistema == 'frances':
+        cuota_prestamo = montos / _factor_va_anualidad(tasas, plazos)
+        cuota = cuota_prestamo[prestamo]
+        # Saldo al inicio de la cuota k: P(1 + i)^(k-1) - C((1 + i)^(k-1) - 1) / i
+        crecimiento = np.exp((periodo - 1) * np.log1p(tasa))
+        saldo_inicial = monto * crecimiento - cuota * _factor_vf_anualidad(tasa, periodo - 1)
+        interes = saldo_inicial * tasa
+        capital = cuota - interes
+    else:
+        capital = (montos / plazos)[prestamo]
+        saldo_inicial = monto - capital * (periodo - 1)
+        interes = saldo_inicial * tasa
+        cuota = capital + interes
+    
+    saldo = saldo_inicial - capital
+    saldo[offsets[1:] - 1] = 0.0  # Evitar saldos residuales por redondeo
+    
+    return CronogramaPrestamos(sistema, offsets, periodo,
+                               *(np.asarray(x, dtype=dtype)
+                                 for x in (cuota, interes, capital, saldo)))
+
+def flujos_mensuales(montos, tasas, plazos, sistema='frances', mes_inicio=0,
+                     tamaño_bloque=TAMAÑO_BLOQUE_PRESTAMOS):
+    """
+    Flujos agregados por mes de una cartera grande, procesada por bloques
+    
+    Genera los cronogramas de a `tamaño_bloque` préstamos y acumula cada bloque
+    con `CronogramaPrestamos.por_mes`, de modo que la memoria queda acotada
+    aunque la cartera tenga millones de préstamos.
+    
+    Parámetros:
+    montos (array_like): Monto de cada préstamo
+    tasas (float o array_like): Tasa de interés por período
+    plazos (int o array_like): Plazo en períodos
+    sistema (str): 'frances' o 'aleman'
+    mes_inicio (int o array_like): Mes de la primera cuota de cada préstamo
+    tamaño_bloque (int): Préstamos por bloque
     
     Retorna:
-    float: Valor futuro de la anualidad adelantada
+    DataFrame: Cuota, interés, capital y saldo total por mes
     """
-    return vf_anualidad_ordinaria(pago, tasa, periodos) * (1 + tasa)
+    montos, tasas, plazos, mes_inicio = np.broadcast_arrays(
+        np.atleast_1d(montos), np.atleast_1d(tasas),
+        np.atleast_1d(plazos), np.atleast_1d(mes_inicio))
+    meses = int((mes_inicio + plazos).max())
+    total = None
+    for inicio in range(0, len(montos), tamaño_bloque):
+        bloque = slice(inicio, inicio + tamaño_bloque)
+        parcial = cronograma_amortizacion(montos[bloque], tasas[bloque], plazos[bloque],
+                                          sistema).por_mes(mes_inicio[bloque], meses)
+        total = parcial if total is None else total + parcial
+    return total
 
 def tna_a_tea(tna, capitalizaciones_por_anio):
     """
@@ -186,7 +463,7 @@ def graficar_crecimiento(va, tasa_anual, meses):
     """
     tasa_mensual = (1 + tasa_anual) ** (1/12) - 1
     periodos = np.arange(meses + 1)
-    valores = [valor_futuro(va, tasa_mensual, p) for p in periodos]
+    valores = valor_futuro(va, tasa_mensual, periodos)
     
     plt.figure(figsize=(10, 6))
     plt.plot(periodos, valores, 'b-', label='Valor de la inversión')
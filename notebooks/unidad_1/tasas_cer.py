@@ -0,0 +1,309 @@
+"""
+Módulo de Tasas y CER
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo convierte series completas de tasas entre convenciones (TNA con
+cualquier frecuencia de capitalización, TEA, TEM, TED, etc.) en una sola
+llamada, pasando siempre por el logaritmo del factor de crecimiento anual.
+
+También mantiene un índice CER acumulado por día: el ajuste por inflación entre
+dos fechas cualesquiera es el cociente de dos valores del índice, ubicados con
+`searchsorted`, sin recomponer la inflación período a período. Esto es lo que
+necesitan la valuación de BONCER y los reportes de tasas reales.
+"""
+
+import numpy as np
+import pandas as pd
+
+from finanzas_basicas import tasa_real
+
+
+# Períodos por año de cada convención de tasa efectiva
+CONVENCIONES_EFECTIVAS = {'tea': 1, 'tes': 2, 'tet': 4, 'tem': 12, 'ted': 365}
+
+# Capitalizaciones por año por defecto de una TNA (mensual)
+CAPITALIZACIONES_TNA = 12
+
+
+def _como_fechas(fechas):
+    """Convierte fechas (str, datetime, Timestamp o secuencias) a datetime64[D]."""
+    if np.ndim(fechas) == 0:
+        return np.datetime64(pd.Timestamp(fechas), 'D')
+    return np.asarray(pd.to_datetime(fechas).values, dtype='datetime64[D]')
+
+def _como_serie(valores, original):
+    """Devuelve `valores` con el índice de `original` si era una pd.Series."""
+    if isinstance(original, pd.Series):
+        return pd.Series(valores, index=original.index, name=original.name)
+    return valores
+
+def _crecimiento_anual(tasas, convencion, capitalizaciones):
+    """
+    Logaritmo del factor de crecimiento de un año para tasas en una convención
+    """
+    if convencion == 'tna':
+        return capitalizaciones * np.log1p(tasas / capitalizaciones)
+    if convencion not in CONVENCIONES_EFECTIVAS:
+        raise ValueError(f"Convención desconocida: {convencion!r}. Opciones: "
+                         f"'tna', {', '.join(map(repr, CONVENCIONES_EFECTIVAS))}")
+    return CONVENCIONES_EFECTIVAS[convencion] * np.log1p(tasas)
+
+def _desde_crecimiento(crecimiento, convencion, capitalizaciones):
+    """
+    Tasa en una convención a partir del logaritmo del factor de crecimiento anual
+    """
+    if convencion == 'tna':
+        return capitalizaciones * np.expm1(crecimiento / capitalizaciones)
+    if convencion not in CONVENCIONES_EFECTIVAS:
+        raise ValueError(f"Convención desconocida: {convencion!r}. Opciones: "
+                         f"'tna', {', '.join(map(repr, CONVENCIONES_EFECTIVAS))}")
+    return np.expm1(crecimiento / CONVENCIONES_EFECTIVAS[convencion])
+
+def convertir_tasas(tasas, origen, destino, capitalizaciones_origen=CAPITALIZACIONES_TNA,
+                    capitalizaciones_destino=CAPITALIZACIONES_TNA):
+    """
+    Convierte tasas entre convenciones en una sola operación vectorizada
+    
+    Las convenciones son 'tna' (nominal anual, con la cantidad de
+    capitalizaciones por año indicada; ej: 365/30 para un plazo fijo a 30 días)
+    y las efectivas de CONVENCIONES_EFECTIVAS ('tea', 'tes', 'tet', 'tem', 'ted').
+    
+    Parámetros:
+    tasas (float, array_like o pd.Series): Tasas en la convención de origen (en decimales)
+    origen (str): Convención de origen
+    destino (str): Convención de destino
+    capitalizaciones_origen (float o array_like): Capitalizaciones por año si origen es 'tna'
+    capitalizaciones_destino (float o array_like): Capitalizaciones por año si destino es 'tna'
+    
+    Retorna:
+    float, np.ndarray o pd.Series: Tasas en la convención de destino
+    """
+    valores = np.asarray(tasas, dtype=np.float64)
+    crecimiento = _crecimiento_anual(valores, origen, capitalizaciones_origen)
+    return _como_serie(_desde_crecimiento(crecimiento, destino, capitalizaciones_destino), tasas)
+
+def tasas_reales(tasas, inflacion, convencion='tea', capitalizaciones=CAPITALIZACIONES_TNA):
+    """
+    Tasas reales por la fórmula de Fisher para series de tasas e inflación
+    
+    Tasas e inflación deben estar expresadas en la misma convención; el
+    resultado queda en esa convención.
+    
+    Parámetros:
+    tasas (float, array_like o pd.Series): Tasas nominales
+    inflacion (float, array_like o pd.Series): Inflación del mismo período
+    convencion (str): Convención de ambas series
+    capitalizaciones (float): Capitalizaciones por año si la convención es 'tna'
+    
+    Retorna:
+    float, np.ndarray o pd.Series: Tasas reales
+    """
+    if convencion == 'tea':
+        return tasa_real(tasas, inflacion)
+    tea = convertir_tasas(tasas, convencion, 'tea', capitalizaciones)
+    inflacion_tea = convertir_tasas(inflacion, convencion, 'tea', capitalizaciones)
+    return convertir_tasas(tasa_real(tea, inflacion_tea), 'tea', convencion,
+                           capitalizaciones_destino=capitalizaciones)
+
+class IndiceCER:
+    """
+    Índice CER diario acumulado con consultas O(1) entre fechas
+    
+    Guarda las fechas como datetime64[D] ordenadas y los valores del índice. El
+    valor en una fecha es el último publicado en o antes de esa fecha (se
+    alinea con `searchsorted`), de modo que fines de semana y feriados toman el
+    valor vigente; fechas anteriores al inicio dan NaN.
+    """
+    
+    __slots__ = ('fechas', 'valores')
+    
+    def __init__(self, valores, fechas=None):
+        """
+        Parámetros:
+        valores (pd.Series o array_like): Valores del CER (Series con índice de fechas)
+        fechas (array_like, opcional): Fechas, si `valores` no es una Series
+        """
+        if fechas is None:
+            fechas = valores.index
+        fechas = _como_fechas(fechas)
+        valores = np.asarray(valores, dtype=np.float64)
+        orden = np.argsort(fechas, kind='stable')
+        self.fechas = fechas[orden]
+        self.valores = valores[orden]
+    
+    @classmethod
+    def desde_tasas(cls, tasas_diarias, fechas=None, valor_inicial=1.0):
+        """
+        Construye el índice acumulando tasas diarias de ajuste
+        
+        La tasa de cada fecha se aplica desde esa fecha, y el índice del primer
+        día es `valor_inicial`.
+        
+        Parámetros:
+        tasas_diarias (pd.Series o array_like): Variación diaria del índice
+        fechas (array_like, opcional): Fechas, si las tasas no son una Series
+        valor_inicial (float): Valor del índice en la primera fecha
+        
+        Retorna:
+        IndiceCER: Índice acumulado
+        """
+        if fechas is None:
+            fechas = tasas_diarias.index
+        crecimiento = np.log1p(np.asarray(tasas_diarias, dtype=np.float64))
+        acumulado = np.concatenate([[0.0], np.cumsum(crecimiento[1:])])
+        return cls(valor_inicial * np.exp(acumulado), fechas)
+    
+    @classmethod
+    def desde_inflacion_mensual(cls, inflacion, valor_inicial=1.0, rezago_meses=0):
+        """
+        Construye un índice diario a partir de inflación mensual
+        
+        Cada mes distribuye su inflación en forma geométrica entre sus días
+        corridos. Con `rezago_meses` la inflación del mes m se aplica en el mes
+        m + rezago (el CER oficial usa la inflación de dos meses antes).
+        
+        Parámetros:
+        inflacion (pd.Series): Inflación mensual indexada por mes (fechas o períodos)
+        valor_inicial (float): Valor del índice el primer día
+        rezago_meses (int): Meses entre la inflación y su aplicación
+        
+        Retorna:
+        IndiceCER: Índice diario acumulado
+        """
+        meses = pd.PeriodIndex(inflacion.index, freq='M') + rezago_meses
+        inicio = meses.min().start_time.to_datetime64().astype('datetime64[D]')
+        fin = (meses.max() + 1).start_time.to_datetime64().astype('datetime64[D]')
+        fechas = np.arange(inicio, fin + 1)
+        
+        mes_de_cada_dia = fechas[:-1].astype('datetime64[M]')
+        dias_del_mes = ((mes_de_cada_dia + 1).astype('datetime64[D]')
+                        - mes_de_cada_dia.astype('datetime64[D]')).astype(int)
+        tasas_mes = pd.Series(np.log1p(np.asarray(inflacion, dtype=np.float64)),
+                              index=meses.to_timestamp().values.astype('datetime64[M]'))
+        crecimiento = tasas_mes.reindex(mes_de_cada_dia).fillna(0.0).to_numpy() / dias_del_mes
+        acumulado = np.concatenate([[0.0], np.cumsum(crecimiento)])
+        return cls(valor_inicial * np.exp(acumulado), fechas)
+    
+    def __len__(self):
+        return len(self.fechas)
+    
+    def __repr__(self):
+        if len(self) == 0:
+            return "IndiceCER(vacío)"
+        return f"IndiceCER({self.fechas[0]} a {self.fechas[-1]}, {len(self)} valores)"
+    
+    def valor(self, fechas):
+        """
+        Valor vigente del índice en cada fecha
+        
+        Parámetros:
+        fechas (fecha o array_like de fechas): Fechas a consultar
+        
+        Retorna:
+        float o np.ndarray: Valores del índice (NaN antes del inicio)
+        """
+        posiciones = np.searchsorted(self.fechas, _como_fechas(fechas), side='right') - 1
+        return np.where(posiciones >= 0, self.valores[np.maximum(posiciones, 0)], np.nan)
+    
+    def coeficiente(self, desde, hasta):
+        """
+        Coeficiente de ajuste CER(hasta) / CER(desde), con broadcasting de fechas
+        
+        Parámetros:
+        desde (fecha o array_like de fechas): Fechas de inicio
+        hasta (fecha o array_like de fechas): Fechas de fin
+        
+        Retorna:
+        float o np.ndarray: Coeficientes de ajuste
+        """
+        return self.valor(hasta) / self.valor(desde)
+    
+    def ajustar(self, montos, desde, hasta):
+        """
+        Ajusta montos por CER entre dos fechas (ej: capital de un BONCER)
+        
+        Parámetros:
+        montos (float o array_like): Montos expresados a la fecha `desde`
+        desde (fecha o array_like de fechas): Fecha base de cada monto
+        hasta (fecha o array_like de fechas): Fecha a la que se ajusta
+        
+        Retorna:
+        float o np.ndarray: Montos ajustados
+        """
+        return np.asarray(montos, dtype=np.float64) * self.coeficiente(desde, hasta)
+    
+    def deflactar(self, serie, fecha_base=None):
+        """
+        Expresa una serie nominal fechada en moneda constante de `fecha_base`
+        
+        Parámetros:
+        serie (pd.Series): Valores nominales con índice de fechas
+        fecha_base (fecha, opcional): Fecha de la moneda constante (por defecto la última de la serie)
+        
+        Retorna:
+        pd.Series: Valores en moneda constante
+        """
+        fecha_base = serie.index.max() if fecha_base is None else fecha_base
+        return serie * self.coeficiente(serie.index, fecha_base)
+    
+    def inflacion(self, desde, hasta, convencion='tea', capitalizaciones=CAPITALIZACIONES_TNA):
+        """
+        Inflación entre dos fechas, expresada como tasa en una convención
+        
+        Se anualiza con días corridos / 365, de modo que el resultado es
+        comparable con tasas de la misma convención (ver `tasas_reales`).
+        
+        Parámetros:
+        desde (fecha o array_like de fechas): Fechas de inicio
+        hasta (fecha o array_like de fechas): Fechas de fin
+        convencion (str): Convención del resultado
+        capitalizaciones (float): Capitalizaciones por año si la convención es 'tna'
+        
+        Retorna:
+        float o np.ndarray: Inflación en la convención pedida
+        """
+        dias = (_como_fechas(hasta) - _como_fechas(desde)).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crecimiento = np.log(self.coeficiente(desde, hasta)) * 365 / dias
+        return _desde_crecimiento(crecimiento, convencion, capitalizaciones)
+
+
+if __name__ == "__main__":
+    import time
+    from finanzas_basicas import tna_a_tea, convertir_tasa_efectiva
+    
+    print("=== TESTING MÓDULO TASAS Y CER ===")
+    
+    fechas = pd.date_range('2020-01-01', '2024-12-31', freq='D')
+    rng = np.random.default_rng(0)
+    tna = pd.Series(rng.uniform(0.3, 1.2, len(fechas)), index=fechas, name='tna')
+    
+    tea = convertir_tasas(tna, 'tna', 'tea')
+    print(f"TNA→TEA igual a tna_a_tea: {np.allclose(tea, tna_a_tea(tna, 12))}")
+    tem = convertir_tasas(tea, 'tea', 'tem')
+    print(f"TEA→TEM igual a convertir_tasa_efectiva: "
+          f"{np.allclose(tem, convertir_tasa_efectiva(tea, 1, 12))}")
+    print(f"Ida y vuelta TNA→TED→TNA: "
+          f"{np.abs(convertir_tasas(convertir_tasas(tna, 'tna', 'ted'), 'ted', 'tna') - tna).max():.1e}")
+    
+    meses = pd.period_range('2019-11', '2024-12', freq='M')
+    inflacion = pd.Series(rng.uniform(0.02, 0.12, len(meses)), index=meses)
+    cer = IndiceCER.desde_inflacion_mensual(inflacion, rezago_meses=2)
+    print(cer)
+    
+    esperado = np.prod(1 + inflacion['2020-01':'2020-12'].to_numpy())
+    print(f"Coeficiente 2020-03-01 → 2021-03-01: {cer.coeficiente('2020-03-01', '2021-03-01'):.6f} "
+          f"(esperado {esperado:.6f})")
+    
+    inicio = time.perf_counter()
+    desde = fechas[rng.integers(0, len(fechas), 1_000_000)]
+    hasta = desde + pd.to_timedelta(rng.integers(30, 720, len(desde)), unit='D')
+    coeficientes = cer.coeficiente(desde, hasta)
+    print(f"{len(coeficientes)} coeficientes en {time.perf_counter() - inicio:.2f}s")
+    
+    reales = tasas_reales(tea, cer.inflacion(fechas - pd.Timedelta(days=365), fechas))
+    print(reales.dropna().describe().round(4))
+    print(cer.deflactar(pd.Series(1000.0, index=fechas[::365])).round(2))
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -15,6 +15,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Dict, List, Tuple, Optional
 import warnings
+from bisect import bisect_left, bisect_right
 warnings.filterwarnings('ignore')
 
 # Configuración de visualización
@@ -24,24 +25,63 @@ sns.set_palette("husl")
 class AnalizadorFinanciero:
     """
     Clase principal para el análisis financiero automatizado
+    
+    Guarda en memoria los estados financieros de muchas empresas y períodos
+    (un panel ancho indexado por (empresa, periodo), una columna por cuenta) y
+    calcula las familias de ratios, el DuPont y el Z-Score de Altman recién
+    cuando se piden por primera vez. Los resultados quedan en caché; al cargar
+    datos nuevos sólo se recalculan las filas cuyas cuentas cambiaron, y sólo
+    en las familias que usan esas cuentas.
+    
+    Ejemplo:
+    --------
+    >>> analizador = AnalizadorFinanciero()
+    >>> analizador.cargar_panel(estados)            # miles de (empresa, periodo)
+    >>> analizador.ratios('liquidez')               # se calcula y se guarda
+    >>> analizador.cargar_cuentas('YPF', '2024', ventas=1.2e6)
+    >>> analizador.ratios('liquidez')               # sin recálculo: no usa ventas
+    >>> analizador.ratios('rentabilidad')           # recalcula sólo YPF 2024
     """
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False, modelo_altman: str = 'original',
+                 dias_año: int = 365):
         self.empresa = None
         self.periodo = None
         self.estados_financieros = {}
-        
-    def cargar_estados_financieros(self, balance: pd.DataFrame, 
-                                 estado_resultados: pd.DataFrame,
+        self.verbose = verbose
+        self.modelo_altman = modelo_altman
+        self.dias_año = dias_año
+        self._estados = pd.DataFrame(
+            index=pd.MultiIndex.from_arrays([[], []], names=INDICE_PANEL), dtype=np.float64)
+        self._cache = {}
+        self._pendientes = {}
+    
+    def __len__(self) -> int:
+        return len(self._estados)
+    
+    def __repr__(self) -> str:
+        return (f"AnalizadorFinanciero({len(self)} estados, {self._estados.shape[1]} cuentas, "
+                f"en caché: {sorted(self._cache)})")
+    
+    @property
+    def estados(self) -> pd.DataFrame:
+        """Panel de estados cargados, indexado por (empresa, periodo)"""
+        return self._estados
+    
+    def cargar_estados_financieros(self, balance, estado_resultados,
                                  empresa: str = None, periodo: str = None):
         """
         Carga los estados financieros para análisis
         
+        Si ambos estados vienen como cuentas normalizadas (dict, pd.Series o
+        DataFrame con columnas 'cuenta' y 'valor'), además se incorporan al
+        panel bajo la clave (empresa, periodo)
+        
         Parameters:
         -----------
-        balance : pd.DataFrame
+        balance : pd.DataFrame, pd.Series o dict
             Estado de Situación Patrimonial
-        estado_resultados : pd.DataFrame  
+        estado_resultados : pd.DataFrame, pd.Series o dict
             Estado de Resultados
         empresa : str
             Nombre de la empresa
@@ -52,7 +92,152 @@ class AnalizadorFinanciero:
         self.estados_financieros['resultados'] = estado_resultados
         self.empresa = empresa
         self.periodo = periodo
-        print(f"Estados financieros cargados para {empresa} - Período {periodo}")
+        
+        cuentas_balance = _como_cuentas(balance)
+        cuentas_resultados = _como_cuentas(estado_resultados)
+        if cuentas_balance is not None and cuentas_resultados is not None:
+            self.cargar_cuentas(empresa, periodo, **cuentas_balance, **cuentas_resultados)
+        
+        if self.verbose:
+            print(f"Estados financieros cargados para {empresa} - Período {periodo}")
+    
+    def cargar_cuentas(self, empresa: str, periodo, **cuentas: float) -> pd.MultiIndex:
+        """
+        Carga (o actualiza) las cuentas de un único estado
+        
+        Parameters:
+        -----------
+        empresa : str
+            Nombre de la empresa
+        periodo : str
+            Período
+        **cuentas : float
+            Valores por cuenta (ej: activo_corriente=1500, ventas=9000)
+        
+        Returns:
+        --------
+        pd.MultiIndex
+            Claves cuyo contenido cambió
+        """
+        fila = {'empresa': [empresa], 'periodo': [periodo]}
+        fila.update({cuenta: [valor] for cuenta, valor in cuentas.items()})
+        return self.cargar_panel(pd.DataFrame(fila), formato='ancho')
+    
+    def cargar_panel(self, datos, formato: str = 'auto') -> pd.MultiIndex:
+        """
+        Incorpora un panel de estados (ver `preparar_panel`)
+        
+        Las cuentas informadas reemplazan a las existentes para cada
+        (empresa, periodo); las no informadas se conservan. Sólo se invalidan
+        en la caché las filas que cambiaron, y sólo en las familias que usan
+        alguna de las cuentas modificadas.
+        
+        Parameters:
+        -----------
+        datos : pd.DataFrame o dict
+            Panel en formato largo o ancho
+        formato : str
+            'auto', 'largo' o 'ancho'
+        
+        Returns:
+        --------
+        pd.MultiIndex
+            Claves (empresa, periodo) nuevas o con algún valor distinto
+        """
+        nuevo = preparar_panel(datos, formato)
+        if not nuevo.index.is_unique:
+            raise ValueError("El panel tiene claves (empresa, periodo) repetidas")
+        
+        columnas = self._estados.columns.union(nuevo.columns, sort=False)
+        estados = self._estados.reindex(columns=columnas)
+        
+        # Celdas informadas y distintas de las claves ya cargadas; un NaN del
+        # panel nuevo es una cuenta no informada y conserva el valor anterior
+        comunes = nuevo.index.intersection(estados.index)
+        anterior = estados.loc[comunes, nuevo.columns]
+        actual = nuevo.loc[comunes]
+        cambios = actual.notna() & (anterior != actual)
+        altas = nuevo.index.difference(estados.index)
+        
+        if len(comunes):
+            estados.loc[comunes, nuevo.columns] = actual.where(actual.notna(), anterior)
+        if len(altas):
+            estados = pd.concat([estados, nuevo.loc[altas].reindex(columns=columnas)])
+        self._estados = estados
+        
+        for familia in self._cache:
+            usadas = nuevo.columns.intersection(_campos_familia(familia))
+            sucias = comunes[cambios[usadas].to_numpy().any(axis=1)] if len(usadas) else comunes[:0]
+            self._pendientes[familia].update(sucias.append(altas).tolist())
+        
+        modificadas = comunes[cambios.to_numpy().any(axis=1)].append(altas)
+        if self.verbose:
+            print(f"Panel cargado: {len(altas)} estados nuevos, "
+                  f"{len(modificadas) - len(altas)} modificados")
+        return modificadas
+    
+    def invalidar(self, familia: Optional[str] = None):
+        """Descarta la caché de una familia (o de todas)"""
+        for nombre in ([familia] if familia is not None else list(self._cache)):
+            self._cache.pop(nombre, None)
+            self._pendientes.pop(nombre, None)
+    
+    def _calcular(self, familia: str, panel: pd.DataFrame) -> pd.DataFrame:
+        if familia == 'altman':
+            return z_score_altman_panel(panel, self.modelo_altman, 'ancho')
+        if familia == 'actividad':
+            resultado = ratios_actividad_panel(panel, 'ancho', self.dias_año)
+        elif familia in FAMILIAS_RATIOS:
+            resultado = FAMILIAS_RATIOS[familia](panel, 'ancho')
+        else:
+            raise ValueError(f"Familia de ratios desconocida: {familia}")
+        
+        # Un estado al que le falta una cuenta obligatoria no tiene ratios
+        obligatorias = [c for c in CAMPOS_RATIOS[familia] if c not in CAMPOS_OPCIONALES]
+        incompletas = panel[obligatorias].isna().any(axis=1).to_numpy()
+        if incompletas.any():
+            resultado.loc[incompletas] = np.nan
+        return resultado
+    
+    def ratios(self, familia: Optional[str] = None) -> pd.DataFrame:
+        """
+        Ratios de una familia para todos los estados cargados
+        
+        Parameters:
+        -----------
+        familia : str, optional
+            'liquidez', 'actividad', 'endeudamiento', 'rentabilidad', 'dupont'
+            o 'altman'. Si se omite se devuelven todas las familias de
+            ratios, con columnas (familia, ratio).
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Ratios indexados por (empresa, periodo)
+        """
+        if familia is None:
+            return pd.concat({f: self.ratios(f) for f in FAMILIAS_RATIOS}, axis=1,
+                             names=['familia', 'ratio'])
+        
+        if familia not in self._cache:
+            self._cache[familia] = self._calcular(familia, self._estados)
+            self._pendientes[familia] = set()
+        elif self._pendientes[familia]:
+            claves = pd.MultiIndex.from_tuples(list(self._pendientes[familia]),
+                                               names=INDICE_PANEL)
+            parcial = self._calcular(familia, self._estados.loc[claves])
+            vigente = self._cache[familia].drop(claves, errors='ignore')
+            self._cache[familia] = pd.concat([vigente, parcial]).reindex(self._estados.index)
+            self._pendientes[familia] = set()
+        return self._cache[familia]
+    
+    def dupont(self) -> pd.DataFrame:
+        """Componentes del DuPont de todos los estados cargados"""
+        return self.ratios('dupont')
+    
+    def altman(self) -> pd.DataFrame:
+        """Z-Score de Altman (modelo `modelo_altman`) de todos los estados cargados"""
+        return self.ratios('altman')
 
 def calcular_ratios_liquidez(activo_corriente: float, 
                            pasivo_corriente: float,
@@ -363,6 +548,39 @@ def analisis_dupont(resultado_neto: float,
     
     return dupont
 
+# Coeficientes y umbrales de zona de cada versión del Z-Score de Altman:
+# Z = constante + x1·X1 + ... + x5·X5; zona segura si Z >= zona_segura, gris
+# si Z >= zona_gris y de peligro en otro caso
+MODELOS_ALTMAN = pd.DataFrame(
+    {
+        'constante':   [0.0,   0.0,   3.25],
+        'x1':          [1.2,   0.717, 6.56],
+        'x2':          [1.4,   0.847, 3.26],
+        'x3':          [3.3,   3.107, 6.72],
+        'x4':          [0.6,   0.420, 1.05],
+        'x5':          [1.0,   0.998, 0.0],
+        'zona_gris':   [1.81,  1.23,  4.15],
+        'zona_segura': [2.99,  2.90,  5.85],
+    },
+    # original (1968): empresas cotizantes; revisado (1983): no cotizantes;
+    # emergentes: Z''-Score para mercados emergentes
+    index=pd.Index(['original', 'revisado', 'emergentes'], name='modelo')
+)
+
+# MODELOS_ALTMAN como tuplas de floats para la versión escalar, que así no
+# paga búsquedas de pandas en cada llamada:
+# modelo -> (constante, x1, x2, x3, x4, x5, zona_gris, zona_segura)
+_PARAMETROS_ALTMAN = {
+    modelo: tuple(float(v) for v in fila)
+    for modelo, fila in zip(MODELOS_ALTMAN.index, MODELOS_ALTMAN.itertuples(index=False))
+}
+
+# Textos por zona (0 = peligro, 1 = gris, 2 = segura)
+CLASIFICACIONES_ALTMAN = ["Zona de Peligro - Alto riesgo de quiebra",
+                          "Zona Gris - Riesgo moderado",
+                          "Zona Segura - Bajo riesgo de quiebra"]
+NIVELES_RIESGO_ALTMAN = ["Alto", "Moderado", "Bajo"]
+
 def z_score_altman(capital_trabajo: float,
                   utilidades_retenidas: float,
                   resultado_operativo: float,
@@ -400,54 +618,33 @@ def z_score_altman(capital_trabajo: float,
         Z-Score y clasificación de riesgo
     """
     
-    resultado = {}
+    if modelo not in _PARAMETROS_ALTMAN:
+        raise ValueError("Modelo debe ser 'original', 'revisado' o 'emergentes'")
     
     # Variables del modelo
     x1 = capital_trabajo / activo_total
     x2 = utilidades_retenidas / activo_total
     x3 = resultado_operativo / activo_total
-    x4 = valor_mercado_capital / pasivo_total
+    x4 = valor_mercado_capital / pasivo_total  # Valor libro del patrimonio en el revisado
     x5 = ventas / activo_total
     
-    # Selección del modelo
-    if modelo == 'original':
-        # Modelo original (1968) - empresas cotizantes
-        z_score = 1.2*x1 + 1.4*x2 + 3.3*x3 + 0.6*x4 + 1.0*x5
-        zona_segura = 2.99
-        zona_gris_inf = 1.81
-        
-    elif modelo == 'revisado':
-        # Modelo revisado (1983) - empresas no cotizantes
-        x4_revisado = valor_mercado_capital / pasivo_total  # Valor libro del patrimonio
-        z_score = 0.717*x1 + 0.847*x2 + 3.107*x3 + 0.420*x4_revisado + 0.998*x5
-        zona_segura = 2.90
-        zona_gris_inf = 1.23
-        
-    elif modelo == 'emergentes':
-        # Modelo para mercados emergentes (Z''-Score)
-        z_score = 3.25 + 6.56*x1 + 3.26*x2 + 6.72*x3 + 1.05*x4
-        zona_segura = 5.85
-        zona_gris_inf = 4.15
-        
-    else:
-        raise ValueError("Modelo debe ser 'original', 'revisado' o 'emergentes'")
+    # Coeficientes y umbrales del modelo (ver MODELOS_ALTMAN)
+    constante, a1, a2, a3, a4, a5, zona_gris, zona_segura = _PARAMETROS_ALTMAN[modelo]
+    z_score = constante + a1*x1 + a2*x2 + a3*x3 + a4*x4 + a5*x5
     
     # Clasificación de riesgo
     if z_score >= zona_segura:
-        clasificacion = "Zona Segura - Bajo riesgo de quiebra"
-        riesgo = "Bajo"
-    elif z_score >= zona_gris_inf:
-        clasificacion = "Zona Gris - Riesgo moderado"
-        riesgo = "Moderado"
+        zona = 2
+    elif z_score >= zona_gris:
+        zona = 1
     else:
-        clasificacion = "Zona de Peligro - Alto riesgo de quiebra"
-        riesgo = "Alto"
+        zona = 0
     
     resultado = {
         'z_score': z_score,
         'modelo': modelo,
-        'clasificacion': clasificacion,
-        'nivel_riesgo': riesgo,
+        'clasificacion': CLASIFICACIONES_ALTMAN[zona],
+        'nivel_riesgo': NIVELES_RIESGO_ALTMAN[zona],
         'x1_capital_trabajo': x1,
         'x2_utilidades_retenidas': x2,
         'x3_rentabilidad': x3,
@@ -457,6 +654,447 @@ def z_score_altman(capital_trabajo: float,
     
     return resultado
 
+# ---------------------------------------------------------------------------
+# Ratios sobre paneles de muchas empresas y períodos
+# ---------------------------------------------------------------------------
+
+# Niveles del índice de los paneles
+INDICE_PANEL = ['empresa', 'periodo']
+
+# Cuentas que usa cada familia de ratios (mismos nombres que los argumentos
+# de las funciones escalares)
+CAMPOS_RATIOS = {
+    'liquidez': ['activo_corriente', 'pasivo_corriente', 'inventarios', 'efectivo',
+                 'inversiones_temporales'],
+    'actividad': ['ventas', 'costo_ventas', 'cuentas_por_cobrar', 'inventarios',
+                  'cuentas_por_pagar', 'activo_total', 'activo_fijo'],
+    'endeudamiento': ['activo_total', 'pasivo_total', 'patrimonio_neto', 'pasivo_corriente',
+                      'pasivo_no_corriente', 'gastos_financieros', 'resultado_operativo'],
+    'rentabilidad': ['resultado_neto', 'resultado_operativo', 'ventas', 'activo_total',
+                     'patrimonio_neto', 'activo_operativo'],
+    'dupont': ['resultado_neto', 'ventas', 'activo_total', 'patrimonio_neto'],
+}
+
+# Valor por defecto de las cuentas opcionales (como en las funciones escalares)
+CAMPOS_OPCIONALES = {
+    'inventarios': 0.0,
+    'efectivo': 0.0,
+    'inversiones_temporales': 0.0,
+    'activo_operativo': np.nan,
+}
+
+def preparar_panel(datos, formato: str = 'auto') -> pd.DataFrame:
+    """
+    Lleva un panel de estados financieros a formato ancho: una fila por
+    (empresa, periodo) y una columna float64 por cuenta
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        - Formato largo: columnas 'empresa', 'periodo', 'cuenta' y 'valor'
+        - Formato ancho: una columna por cuenta, con 'empresa' y 'periodo'
+          como columnas o como índice
+        - dict de columnas (listas o arreglos de NumPy) en formato ancho
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Panel ancho indexado por (empresa, periodo)
+    """
+    if not isinstance(datos, pd.DataFrame):
+        datos = pd.DataFrame(dict(datos))
+    
+    if formato == 'auto':
+        formato = 'largo' if {'cuenta', 'valor'}.issubset(datos.columns) else 'ancho'
+    
+    if formato == 'largo':
+        panel = datos.set_index(INDICE_PANEL + ['cuenta'])['valor'].unstack('cuenta')
+        panel.columns.name = None
+    elif formato == 'ancho':
+        columnas_indice = [c for c in INDICE_PANEL if c in datos.columns]
+        panel = datos.set_index(columnas_indice) if columnas_indice else datos
+    else:
+        raise ValueError("formato debe ser 'auto', 'largo' o 'ancho'")
+    
+    return panel.astype(np.float64)
+
+def _columnas(panel: pd.DataFrame, familia: str) -> Dict[str, np.ndarray]:
+    """Extrae como arreglos las cuentas que necesita una familia de ratios"""
+    columnas = {}
+    faltantes = []
+    for campo in CAMPOS_RATIOS[familia]:
+        if campo in panel.columns:
+            valores = panel[campo].to_numpy(dtype=np.float64)
+            if campo in CAMPOS_OPCIONALES:
+                valores = np.where(np.isnan(valores), CAMPOS_OPCIONALES[campo], valores)
+            columnas[campo] = valores
+        elif campo in CAMPOS_OPCIONALES:
+            columnas[campo] = np.full(len(panel), CAMPOS_OPCIONALES[campo])
+        else:
+            faltantes.append(campo)
+    if faltantes:
+        raise KeyError(f"Faltan cuentas para los ratios de {familia}: {faltantes}")
+    return columnas
+
+def _dividir(numerador, denominador, condicion, alternativa=0.0) -> np.ndarray:
+    """
+    División enmascarada: numerador / denominador donde se cumple la condición
+    y `alternativa` (escalar o arreglo) en el resto, sin avisos de división por cero.
+    Si falta el numerador o el denominador (NaN) el resultado es NaN
+    """
+    resultado = np.empty(np.broadcast(numerador, denominador).shape)
+    resultado[...] = alternativa
+    np.divide(numerador, denominador, out=resultado, where=condicion)
+    resultado[np.isnan(numerador) | np.isnan(denominador)] = np.nan
+    return resultado
+
+def ratios_liquidez_panel(datos, formato: str = 'auto') -> pd.DataFrame:
+    """
+    Versión de panel de `calcular_ratios_liquidez`
+    
+    A diferencia de la versión escalar, un pasivo corriente igual a cero no
+    interrumpe el cálculo: los ratios de esa fila valen np.inf
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Ratios de liquidez indexados por (empresa, periodo)
+    """
+    panel = preparar_panel(datos, formato)
+    c = _columnas(panel, 'liquidez')
+    pc = c['pasivo_corriente']
+    hay_pasivo = pc != 0
+    
+    return pd.DataFrame({
+        'liquidez_corriente': _dividir(c['activo_corriente'], pc, hay_pasivo, np.inf),
+        'liquidez_acida': _dividir(c['activo_corriente'] - c['inventarios'], pc,
+                                   hay_pasivo, np.inf),
+        'liquidez_absoluta': _dividir(c['efectivo'] + c['inversiones_temporales'], pc,
+                                      hay_pasivo, np.inf),
+    }, index=panel.index)
+
+def ratios_actividad_panel(datos, formato: str = 'auto', dias_año: int = 365) -> pd.DataFrame:
+    """
+    Versión de panel de `calcular_ratios_actividad`, con las mismas reglas
+    para denominadores nulos (np.inf o 0). Si hay cuentas por cobrar pero no
+    ventas, los días de cobro valen np.inf
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    dias_año : int
+        Días del año (365 por defecto)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Ratios de actividad indexados por (empresa, periodo)
+    """
+    panel = preparar_panel(datos, formato)
+    c = _columnas(panel, 'actividad')
+    ventas, costo = c['ventas'], c['costo_ventas']
+    cxc, inv, cxp = c['cuentas_por_cobrar'], c['inventarios'], c['cuentas_por_pagar']
+    at, af = c['activo_total'], c['activo_fijo']
+    
+    con_cxc = cxc > 0
+    rotacion_cxc = _dividir(ventas, cxc, con_cxc, np.inf)
+    dias_cobro = _dividir(dias_año, rotacion_cxc, con_cxc & (rotacion_cxc != 0),
+                          np.where(con_cxc, np.inf, 0.0))
+    
+    con_inv = (inv > 0) & (costo > 0)
+    rotacion_inv = _dividir(costo, inv, con_inv, np.where(inv == 0, np.inf, 0.0))
+    dias_inventario = _dividir(dias_año, rotacion_inv, con_inv)
+    
+    con_cxp = (cxp > 0) & (costo > 0)
+    rotacion_cxp = _dividir(costo, cxp, con_cxp, np.where(cxp == 0, np.inf, 0.0))
+    dias_pago = _dividir(dias_año, rotacion_cxp, con_cxp)
+    
+    return pd.DataFrame({
+        'rotacion_cxc': rotacion_cxc,
+        'dias_cobro': dias_cobro,
+        'rotacion_inventarios': rotacion_inv,
+        'dias_inventario': dias_inventario,
+        'rotacion_cxp': rotacion_cxp,
+        'dias_pago': dias_pago,
+        'ciclo_efectivo': dias_cobro + dias_inventario - dias_pago,
+        'rotacion_activo_total': _dividir(ventas, at, at > 0),
+        'rotacion_activo_fijo': _dividir(ventas, af, af > 0, np.where(ventas > 0, np.inf, 0.0)),
+    }, index=panel.index)
+
+def ratios_endeudamiento_panel(datos, formato: str = 'auto') -> pd.DataFrame:
+    """
+    Versión de panel de `calcular_ratios_endeudamiento`, con las mismas reglas
+    para denominadores nulos (np.inf o 0)
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Ratios de endeudamiento indexados por (empresa, periodo)
+    """
+    panel = preparar_panel(datos, formato)
+    c = _columnas(panel, 'endeudamiento')
+    at, pt, pn = c['activo_total'], c['pasivo_total'], c['patrimonio_neto']
+    ro, gf = c['resultado_operativo'], c['gastos_financieros']
+    
+    return pd.DataFrame({
+        'endeudamiento_total': _dividir(pt, at, at > 0),
+        'autonomia': _dividir(pn, at, at > 0),
+        'apalancamiento': _dividir(pt, pn, pn > 0, np.inf),
+        'multiplicador_capital': _dividir(at, pn, pn > 0, np.inf),
+        'pasivo_corriente_sobre_total': _dividir(c['pasivo_corriente'], pt, pt > 0),
+        'pasivo_no_corriente_sobre_total': _dividir(c['pasivo_no_corriente'], pt, pt > 0),
+        'cobertura_intereses': _dividir(ro, gf, gf > 0, np.where(ro > 0, np.inf, 0.0)),
+    }, index=panel.index)
+
+def ratios_rentabilidad_panel(datos, formato: str = 'auto') -> pd.DataFrame:
+    """
+    Versión de panel de `calcular_ratios_rentabilidad`, con las mismas reglas
+    para denominadores nulos (np.inf o 0). Si falta la cuenta
+    'activo_operativo' (o no es positiva) se usa el activo total
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Ratios de rentabilidad indexados por (empresa, periodo)
+    """
+    panel = preparar_panel(datos, formato)
+    c = _columnas(panel, 'rentabilidad')
+    rn, ro, ventas = c['resultado_neto'], c['resultado_operativo'], c['ventas']
+    at, pn, aop = c['activo_total'], c['patrimonio_neto'], c['activo_operativo']
+    
+    roi_operativo = _dividir(ro, at, at > 0)
+    
+    return pd.DataFrame({
+        'margen_neto': _dividir(rn, ventas, ventas > 0),
+        'margen_operativo': _dividir(ro, ventas, ventas > 0),
+        'roa': _dividir(rn, at, at > 0),
+        'roi_operativo': roi_operativo,
+        'roe': _dividir(rn, pn, pn > 0, np.where(rn > 0, np.inf, 0.0)),
+        'roi_activo_operativo': np.where(np.isnan(aop), roi_operativo,
+                                         _dividir(ro, aop, aop > 0, roi_operativo)),
+    }, index=panel.index)
+
+def dupont_panel(datos, formato: str = 'auto') -> pd.DataFrame:
+    """
+    Versión de panel de `analisis_dupont`
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Componentes del DuPont indexados por (empresa, periodo)
+    """
+    panel = preparar_panel(datos, formato)
+    c = _columnas(panel, 'dupont')
+    rn, ventas = c['resultado_neto'], c['ventas']
+    at, pn = c['activo_total'], c['patrimonio_neto']
+    
+    margen = _dividir(rn, ventas, ventas > 0)
+    rotacion = _dividir(ventas, at, at > 0)
+    multiplicador = _dividir(at, pn, pn > 0, np.inf)
+    with np.errstate(invalid='ignore'):
+        roe_calculado = margen * rotacion * multiplicador
+    
+    return pd.DataFrame({
+        'margen_neto': margen,
+        'rotacion_activos': rotacion,
+        'multiplicador_capital': multiplicador,
+        'roe': _dividir(rn, pn, pn > 0, np.where(rn > 0, np.inf, 0.0)),
+        'roe_calculado': roe_calculado,
+    }, index=panel.index)
+
+FAMILIAS_RATIOS = {
+    'liquidez': ratios_liquidez_panel,
+    'actividad': ratios_actividad_panel,
+    'endeudamiento': ratios_endeudamiento_panel,
+    'rentabilidad': ratios_rentabilidad_panel,
+    'dupont': dupont_panel,
+}
+
+def calcular_ratios_panel(datos, familias: Optional[List[str]] = None,
+                          formato: str = 'auto', dias_año: int = 365) -> pd.DataFrame:
+    """
+    Calcula las familias de ratios de un panel de muchas empresas y períodos,
+    columna por columna y sin bucles por fila
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros en formato largo o ancho (ver `preparar_panel`)
+    familias : List[str], optional
+        Familias a calcular (por defecto todas las de FAMILIAS_RATIOS)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    dias_año : int
+        Días del año para los ratios de actividad
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Ratios float64 indexados por (empresa, periodo), con columnas
+        (familia, ratio)
+    
+    Ejemplo:
+    --------
+    >>> ratios = calcular_ratios_panel(estados, familias=['liquidez', 'rentabilidad'])
+    >>> ratios['liquidez', 'liquidez_corriente'].groupby('empresa').mean()
+    """
+    panel = preparar_panel(datos, formato)
+    familias = list(FAMILIAS_RATIOS) if familias is None else list(familias)
+    
+    resultados = {}
+    for familia in familias:
+        if familia not in FAMILIAS_RATIOS:
+            raise ValueError(f"Familia de ratios desconocida: {familia}")
+        if familia == 'actividad':
+            resultados[familia] = ratios_actividad_panel(panel, 'ancho', dias_año)
+        else:
+            resultados[familia] = FAMILIAS_RATIOS[familia](panel, 'ancho')
+    
+    return pd.concat(resultados, axis=1, names=['familia', 'ratio'])
+
+# Cuentas que usa el Z-Score de Altman sobre un panel. Si falta
+# 'capital_trabajo' se usa activo_corriente - pasivo_corriente, y si falta
+# 'valor_mercado_capital' se usa el patrimonio neto (valor libro)
+CAMPOS_ALTMAN = ['capital_trabajo', 'activo_corriente', 'pasivo_corriente',
+                 'utilidades_retenidas', 'resultado_operativo', 'valor_mercado_capital',
+                 'patrimonio_neto', 'ventas', 'activo_total', 'pasivo_total']
+
+def _campos_familia(familia: str) -> List[str]:
+    """Cuentas de las que depende una familia de resultados"""
+    return CAMPOS_ALTMAN if familia == 'altman' else CAMPOS_RATIOS[familia]
+
+def _como_cuentas(estado) -> Optional[Dict[str, float]]:
+    """Convierte un estado en un dict cuenta -> valor, si tiene ese formato"""
+    if isinstance(estado, dict):
+        return dict(estado)
+    if isinstance(estado, pd.Series):
+        return estado.to_dict()
+    if isinstance(estado, pd.DataFrame) and {'cuenta', 'valor'}.issubset(estado.columns):
+        return dict(zip(estado['cuenta'], estado['valor']))
+    return None
+
+def z_score_altman_panel(datos, modelo='original', formato: str = 'auto') -> pd.DataFrame:
+    """
+    Versión de panel de `z_score_altman`, guiada por la tabla MODELOS_ALTMAN
+    
+    Las cinco variables se arman por columnas, el Z-Score de todas las filas
+    sale de un único producto matricial contra la tabla de coeficientes y la
+    zona se asigna con `np.select`. Cada fila puede usar un modelo distinto.
+    Si falta 'capital_trabajo' se usa activo_corriente - pasivo_corriente, y
+    si falta 'valor_mercado_capital' se usa el patrimonio neto. Con activo o
+    pasivo total igual a cero el Z-Score es NaN y la zona queda sin asignar.
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel de estados financieros (ver `preparar_panel`)
+    modelo : str, array_like o pd.Series
+        Un modelo para todas las filas ('original', 'revisado' o
+        'emergentes'), uno por fila en el orden del panel, o una pd.Series
+        indexada por (empresa, periodo)
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Las mismas columnas que `z_score_altman`, indexadas por
+        (empresa, periodo); 'modelo', 'clasificacion' y 'nivel_riesgo' son
+        categóricas
+    """
+    panel = preparar_panel(datos, formato)
+    
+    def columna(nombre, alternativa=None):
+        if nombre in panel.columns:
+            valores = panel[nombre].to_numpy(dtype=np.float64)
+            faltan = np.isnan(valores)
+            if alternativa is not None and faltan.any():
+                valores = np.where(faltan, alternativa(), valores)
+            return valores
+        if alternativa is not None:
+            return alternativa()
+        raise KeyError(f"Falta la cuenta '{nombre}' para el Z-Score de Altman")
+    
+    capital_trabajo = columna('capital_trabajo', lambda: columna('activo_corriente')
+                              - columna('pasivo_corriente'))
+    capital = columna('valor_mercado_capital', lambda: columna('patrimonio_neto'))
+    at, pt = columna('activo_total'), columna('pasivo_total')
+    
+    X = np.column_stack([
+        _dividir(capital_trabajo, at, at != 0, np.nan),
+        _dividir(columna('utilidades_retenidas'), at, at != 0, np.nan),
+        _dividir(columna('resultado_operativo'), at, at != 0, np.nan),
+        _dividir(capital, pt, pt != 0, np.nan),
+        _dividir(columna('ventas'), at, at != 0, np.nan),
+    ])
+    
+    # Modelo de cada fila como código de fila de la tabla
+    nombres_modelos = MODELOS_ALTMAN.index
+    if isinstance(modelo, str):
+        codigos = np.full(len(panel), nombres_modelos.get_indexer([modelo])[0])
+    else:
+        if isinstance(modelo, pd.Series):
+            modelo = modelo.reindex(panel.index)
+        codigos = nombres_modelos.get_indexer(np.asarray(modelo, dtype=object))
+    if (codigos < 0).any():
+        raise ValueError("Modelo debe ser 'original', 'revisado' o 'emergentes'")
+    
+    # Z-Score: producto fila a fila de X por los coeficientes del modelo de
+    # cada fila (las variables con coeficiente nulo no intervienen)
+    coeficientes = MODELOS_ALTMAN[['x1', 'x2', 'x3', 'x4', 'x5']].to_numpy()[codigos]
+    z = (MODELOS_ALTMAN['constante'].to_numpy()[codigos]
+         + np.einsum('ij,ij->i', np.where(coeficientes != 0, X, 0.0), coeficientes))
+    
+    zona_gris = MODELOS_ALTMAN['zona_gris'].to_numpy()[codigos]
+    zona_segura = MODELOS_ALTMAN['zona_segura'].to_numpy()[codigos]
+    zona = np.select([z >= zona_segura, z >= zona_gris, z < zona_gris], [2, 1, 0], -1)
+    
+    return pd.DataFrame({
+        'z_score': z,
+        'modelo': pd.Categorical.from_codes(codigos, categories=nombres_modelos),
+        'clasificacion': pd.Categorical.from_codes(zona, categories=CLASIFICACIONES_ALTMAN),
+        'nivel_riesgo': pd.Categorical.from_codes(zona, categories=NIVELES_RIESGO_ALTMAN,
+                                                  ordered=True),
+        'x1_capital_trabajo': X[:, 0],
+        'x2_utilidades_retenidas': X[:, 1],
+        'x3_rentabilidad': X[:, 2],
+        'x4_estructura_capital': X[:, 3],
+        'x5_rotacion_ventas': X[:, 4],
+    }, index=panel.index)
+
 def crear_dashboard_ratios(ratios_dict: Dict[str, Dict[str, float]], 
                           empresa: str = "Empresa",
                           figsize: Tuple[int, int] = (15, 12)) -> None:
@@ -544,6 +1182,10 @@ def interpretar_ratios(ratios: Dict[str, float], categoria: str) -> List[str]:
     """
     Proporciona interpretaciones automáticas de los ratios calculados
     
+    Usa los mismos umbrales y textos que `interpretar_panel`, con búsqueda
+    binaria (`bisect`) sobre bordes de Python en lugar de NumPy. Un ratio
+    faltante (NaN) no genera interpretación.
+    
     Parameters:
     -----------
     ratios : Dict[str, float]
@@ -559,41 +1201,14 @@ def interpretar_ratios(ratios: Dict[str, float], categoria: str) -> List[str]:
     
     interpretaciones = []
     
-    if categoria == 'liquidez':
-        if 'liquidez_corriente' in ratios:
-            lc = ratios['liquidez_corriente']
-            if lc >= 2.0:
-                interpretaciones.append(f"Liquidez corriente excelente ({lc:.2f}). La empresa puede cubrir {lc:.1f} veces sus obligaciones de corto plazo.")
-            elif lc >= 1.5:
-                interpretaciones.append(f"Liquidez corriente buena ({lc:.2f}). Situación financiera estable a corto plazo.")
-            elif lc >= 1.0:
-                interpretaciones.append(f"Liquidez corriente aceptable ({lc:.2f}). Monitorear evolución de capital de trabajo.")
-            else:
-                interpretaciones.append(f"Liquidez corriente baja ({lc:.2f}). Posibles dificultades para cubrir obligaciones inmediatas.")
-    
-    elif categoria == 'rentabilidad':
-        if 'roe' in ratios:
-            roe = ratios['roe'] * 100
-            if roe >= 15:
-                interpretaciones.append(f"ROE excelente ({roe:.1f}%). Muy buena rentabilidad para los accionistas.")
-            elif roe >= 10:
-                interpretaciones.append(f"ROE bueno ({roe:.1f}%). Rentabilidad satisfactoria del patrimonio.")
-            elif roe >= 5:
-                interpretaciones.append(f"ROE moderado ({roe:.1f}%). Oportunidades de mejora en rentabilidad.")
-            else:
-                interpretaciones.append(f"ROE bajo ({roe:.1f}%). Necesario revisar estrategia de rentabilidad.")
-    
-    elif categoria == 'endeudamiento':
-        if 'endeudamiento_total' in ratios:
-            et = ratios['endeudamiento_total'] * 100
-            if et <= 30:
-                interpretaciones.append(f"Endeudamiento conservador ({et:.1f}%). Baja dependencia de financiamiento externo.")
-            elif et <= 50:
-                interpretaciones.append(f"Endeudamiento moderado ({et:.1f}%). Estructura financiera equilibrada.")
-            elif et <= 70:
-                interpretaciones.append(f"Endeudamiento alto ({et:.1f}%). Monitorear capacidad de pago.")
-            else:
-                interpretaciones.append(f"Endeudamiento muy alto ({et:.1f}%). Riesgo financiero elevado.")
+    for ratio in RATIOS_INTERPRETADOS.get(categoria, []):
+        if ratio in ratios:
+            valor = ratios[ratio]
+            if valor != valor:  # NaN
+                continue
+            bordes, ubicar, textos, escala = _BANDAS_ESCALARES[ratio]
+            codigo = ubicar(bordes, valor)
+            interpretaciones.append(textos[codigo].format(valor=valor * escala))
     
     return interpretaciones
 
@@ -634,6 +1249,245 @@ BENCHMARKS_INDUSTRIA = {
     'margen_neto': {'bajo': 0.03, 'bueno': 0.05, 'excelente': 0.10}
 }
 
+# ---------------------------------------------------------------------------
+# Bandas de benchmarks sobre paneles de ratios
+# ---------------------------------------------------------------------------
+
+# Ratios en los que un valor menor es mejor: el umbral pertenece a la banda
+# inferior (endeudamiento <= 30% es conservador)
+RATIOS_INVERSOS = {'endeudamiento_total'}
+
+# Nombre de cada banda y texto de interpretación. `escala` pasa el ratio a la
+# unidad en que se muestra (100 para porcentajes)
+INTERPRETACIONES_BENCHMARKS = {
+    'liquidez_corriente': {
+        'escala': 1,
+        'etiquetas': ['Baja', 'Aceptable', 'Buena', 'Excelente'],
+        'textos': [
+            "Liquidez corriente baja ({valor:.2f}). Posibles dificultades para cubrir obligaciones inmediatas.",
+            "Liquidez corriente aceptable ({valor:.2f}). Monitorear evolución de capital de trabajo.",
+            "Liquidez corriente buena ({valor:.2f}). Situación financiera estable a corto plazo.",
+            "Liquidez corriente excelente ({valor:.2f}). La empresa puede cubrir {valor:.1f} veces sus obligaciones de corto plazo.",
+        ],
+    },
+    'liquidez_acida': {
+        'escala': 1,
+        'etiquetas': ['Baja', 'Aceptable', 'Buena', 'Excelente'],
+        'textos': [
+            "Prueba ácida baja ({valor:.2f}). Dependencia de la venta de inventarios para pagar deudas de corto plazo.",
+            "Prueba ácida aceptable ({valor:.2f}). Cobertura justa sin contar inventarios.",
+            "Prueba ácida buena ({valor:.2f}). Los activos líquidos cubren las obligaciones inmediatas.",
+            "Prueba ácida excelente ({valor:.2f}). Holgada cobertura sin recurrir a inventarios.",
+        ],
+    },
+    'endeudamiento_total': {
+        'escala': 100,
+        'etiquetas': ['Conservador', 'Moderado', 'Alto', 'Muy alto'],
+        'textos': [
+            "Endeudamiento conservador ({valor:.1f}%). Baja dependencia de financiamiento externo.",
+            "Endeudamiento moderado ({valor:.1f}%). Estructura financiera equilibrada.",
+            "Endeudamiento alto ({valor:.1f}%). Monitorear capacidad de pago.",
+            "Endeudamiento muy alto ({valor:.1f}%). Riesgo financiero elevado.",
+        ],
+    },
+    'roe': {
+        'escala': 100,
+        'etiquetas': ['Bajo', 'Moderado', 'Bueno', 'Excelente'],
+        'textos': [
+            "ROE bajo ({valor:.1f}%). Necesario revisar estrategia de rentabilidad.",
+            "ROE moderado ({valor:.1f}%). Oportunidades de mejora en rentabilidad.",
+            "ROE bueno ({valor:.1f}%). Rentabilidad satisfactoria del patrimonio.",
+            "ROE excelente ({valor:.1f}%). Muy buena rentabilidad para los accionistas.",
+        ],
+    },
+    'roa': {
+        'escala': 100,
+        'etiquetas': ['Bajo', 'Moderado', 'Bueno', 'Excelente'],
+        'textos': [
+            "ROA bajo ({valor:.1f}%). Los activos generan poco resultado.",
+            "ROA moderado ({valor:.1f}%). Margen para mejorar el uso de los activos.",
+            "ROA bueno ({valor:.1f}%). Uso eficiente de los activos.",
+            "ROA excelente ({valor:.1f}%). Muy alta rentabilidad de los activos.",
+        ],
+    },
+    'margen_neto': {
+        'escala': 100,
+        'etiquetas': ['Bajo', 'Moderado', 'Bueno', 'Excelente'],
+        'textos': [
+            "Margen neto bajo ({valor:.1f}%). Revisar estructura de costos y precios.",
+            "Margen neto moderado ({valor:.1f}%). Rentabilidad de las ventas ajustada.",
+            "Margen neto bueno ({valor:.1f}%). Buena conversión de ventas en resultado.",
+            "Margen neto excelente ({valor:.1f}%). Muy alta rentabilidad sobre ventas.",
+        ],
+    },
+}
+
+# Ratios que comenta `interpretar_ratios` en cada categoría
+RATIOS_INTERPRETADOS = {
+    'liquidez': ['liquidez_corriente'],
+    'rentabilidad': ['roe'],
+    'endeudamiento': ['endeudamiento_total'],
+}
+
+def compilar_benchmarks(benchmarks: Dict[str, Dict[str, float]] = None) -> Dict[str, Dict]:
+    """
+    Compila umbrales de benchmarks en bordes ordenados por ratio
+    
+    Cada ratio queda con un arreglo de bordes crecientes: la banda de un valor
+    es la cantidad de bordes que superó, de modo que clasificar una columna
+    entera es un único `np.searchsorted`.
+    
+    Parameters:
+    -----------
+    benchmarks : Dict[str, Dict[str, float]]
+        Umbrales por ratio (por defecto BENCHMARKS_INDUSTRIA)
+    
+    Returns:
+    --------
+    Dict[str, Dict]
+        Por ratio: 'bordes', 'lado' (para searchsorted), 'etiquetas', 'textos'
+        y 'escala'
+    """
+    if benchmarks is None:
+        benchmarks = BENCHMARKS_INDUSTRIA
+    
+    compilados = {}
+    for ratio, umbrales in benchmarks.items():
+        bordes = np.sort(np.fromiter(umbrales.values(), dtype=float))
+        textos = INTERPRETACIONES_BENCHMARKS.get(ratio, {})
+        etiquetas = textos.get('etiquetas', [f"Banda {i}" for i in range(len(bordes) + 1)])
+        if len(etiquetas) != len(bordes) + 1:
+            raise ValueError(f"'{ratio}' tiene {len(bordes)} umbrales y {len(etiquetas)} etiquetas")
+        compilados[ratio] = {
+            'bordes': bordes,
+            # side='right' cuenta los bordes <= valor (valor >= umbral sube de banda);
+            # side='left' cuenta los bordes < valor (el umbral queda en la banda inferior)
+            'lado': 'left' if ratio in RATIOS_INVERSOS else 'right',
+            'etiquetas': etiquetas,
+            'textos': textos.get('textos'),
+            'escala': textos.get('escala', 1),
+        }
+    return compilados
+
+def codigos_banda(valores, banda: Dict) -> np.ndarray:
+    """
+    Código de banda (0 = banda inferior) de cada valor; -1 para valores faltantes
+    """
+    valores = np.asarray(valores, dtype=float)
+    codigos = np.searchsorted(banda['bordes'], valores, side=banda['lado']).astype(np.int8)
+    codigos[np.isnan(valores)] = -1
+    return codigos
+
+def _texto_banda(ratio: str, banda: Dict, codigo: int, valor: float) -> Optional[str]:
+    """Texto de interpretación de un único valor ya clasificado"""
+    if codigo < 0:
+        return None
+    if banda['textos'] is None:
+        return f"{ratio}: {banda['etiquetas'][codigo]} ({valor:.4g})"
+    return banda['textos'][codigo].format(valor=valor * banda['escala'])
+
+def _columnas_ratios(ratios: pd.DataFrame) -> Dict[str, str]:
+    """
+    Ubica cada ratio en las columnas del panel; acepta columnas simples o el
+    MultiIndex (familia, ratio) de `calcular_ratios_panel`
+    """
+    columnas = {}
+    for columna in ratios.columns:
+        nombre = columna[-1] if isinstance(columna, tuple) else columna
+        columnas.setdefault(nombre, columna)
+    return columnas
+
+# Benchmarks de la industria ya compilados
+BANDAS_INDUSTRIA = compilar_benchmarks(BENCHMARKS_INDUSTRIA)
+
+# Bandas de los ratios interpretados como objetos de Python para
+# `interpretar_ratios` (versión escalar): ratio -> (bordes, bisect equivalente
+# al `lado` de searchsorted, textos, escala)
+_BANDAS_ESCALARES = {
+    ratio: (tuple(float(b) for b in banda['bordes']),
+            bisect_left if banda['lado'] == 'left' else bisect_right,
+            banda['textos'], banda['escala'])
+    for ratio, banda in BANDAS_INDUSTRIA.items()
+    if any(ratio in ratios for ratios in RATIOS_INTERPRETADOS.values())
+}
+
+def clasificar_ratios_panel(ratios: pd.DataFrame, 
+                            bandas: Optional[Dict[str, Dict]] = None) -> pd.DataFrame:
+    """
+    Clasifica cada ratio del panel en su banda de benchmark
+    
+    Se hace un `np.searchsorted` por columna y el resultado se guarda como
+    categórico ordenado (códigos enteros más una lista de etiquetas), sin
+    generar un texto por fila.
+    
+    Parameters:
+    -----------
+    ratios : pd.DataFrame
+        Panel de ratios, por ejemplo el de `calcular_ratios_panel`
+    bandas : Dict[str, Dict]
+        Benchmarks compilados con `compilar_benchmarks` (por defecto los de la industria)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Una columna categórica por ratio con benchmark, mismo índice que `ratios`
+    """
+    if bandas is None:
+        bandas = BANDAS_INDUSTRIA
+    
+    columnas = _columnas_ratios(ratios)
+    clasificacion = {}
+    for ratio, banda in bandas.items():
+        if ratio not in columnas:
+            continue
+        codigos = codigos_banda(ratios[columnas[ratio]].to_numpy(), banda)
+        clasificacion[ratio] = pd.Categorical.from_codes(codigos, categories=banda['etiquetas'],
+                                                         ordered=True)
+    return pd.DataFrame(clasificacion, index=ratios.index)
+
+def interpretar_panel(ratios: pd.DataFrame, filas=None,
+                      bandas: Optional[Dict[str, Dict]] = None) -> pd.Series:
+    """
+    Textos de interpretación para las filas que se van a mostrar
+    
+    Las bandas se calculan sólo para las filas pedidas y los textos se arman
+    recién acá, de modo que un panel de millones de filas no genera millones
+    de cadenas.
+    
+    Parameters:
+    -----------
+    ratios : pd.DataFrame
+        Panel de ratios
+    filas : etiqueta, lista de etiquetas o slice, optional
+        Filas a interpretar (se seleccionan con `.loc`); por defecto todas
+    bandas : Dict[str, Dict]
+        Benchmarks compilados (por defecto los de la industria)
+    
+    Returns:
+    --------
+    pd.Series
+        Lista de interpretaciones por fila
+    """
+    if bandas is None:
+        bandas = BANDAS_INDUSTRIA
+    
+    if filas is not None:
+        ratios = ratios.loc[filas]
+        if isinstance(ratios, pd.Series):
+            ratios = ratios.to_frame().T
+    
+    columnas = _columnas_ratios(ratios)
+    textos = [[] for _ in range(len(ratios))]
+    for ratio, banda in bandas.items():
+        if ratio not in columnas:
+            continue
+        valores = ratios[columnas[ratio]].to_numpy(dtype=float)
+        for fila, (codigo, valor) in enumerate(zip(codigos_banda(valores, banda), valores)):
+            texto = _texto_banda(ratio, banda, codigo, valor)
+            if texto is not None:
+                textos[fila].append(texto)
+    return pd.Series(textos, index=ratios.index, name='interpretaciones')
+
 if __name__ == "__main__":
     print("Módulo de Análisis Financiero - UTN La Plata")
     print("Versión 1.0 - Julio 2025")
@@ -643,6 +1497,10 @@ if __name__ == "__main__":
     print("- calcular_ratios_endeudamiento()")
     print("- calcular_ratios_rentabilidad()")
     print("- analisis_dupont()")
+    print("- calcular_ratios_panel()")
     print("- z_score_altman()")
+    print("- z_score_altman_panel()")
     print("- crear_dashboard_ratios()")
     print("- interpretar_ratios()")
+    print("- clasificar_ratios_panel()")
+    print("- interpretar_panel()")
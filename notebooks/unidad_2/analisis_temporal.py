@@ -0,0 +1,348 @@
+"""
+Módulo de Análisis Temporal de Ratios - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo calcula, para todos los ratios (o cuentas) de todas las empresas
+de un panel, las métricas del análisis horizontal y de tendencias:
+
+- crecimiento: variación contra el período anterior (trimestral si el panel
+  es trimestral)
+- crecimiento_interanual: variación contra el mismo período del año anterior
+- cagr: tasa de crecimiento anual compuesta desde el primer dato de la empresa
+- media_movil y volatilidad_movil: media y desvío estándar de la ventana
+- pendiente: pendiente de la recta de tendencia (MCO) de la ventana, por período
+
+El panel se lleva a un arreglo (variables × empresas × períodos) y cada
+métrica se calcula en una sola pasada vectorizada. `EstadoTemporal` guarda
+en un buffer circular los últimos períodos de cada serie, de modo que un
+período nuevo actualiza las métricas sin volver a recorrer la historia.
+
+Las variaciones se miden sobre el valor absoluto de la base,
+(x_t - x_base) / |x_base|, para que el signo indique mejora o deterioro
+también cuando la base es negativa.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from analisis_financiero import INDICE_PANEL, preparar_panel, calcular_ratios_panel
+
+# Métricas calculadas para cada variable
+METRICAS_TEMPORALES = ['valor', 'crecimiento', 'crecimiento_interanual', 'cagr',
+                       'media_movil', 'volatilidad_movil', 'pendiente']
+
+def _variables_panel(datos, familias: Optional[List[str]], formato: str) -> pd.DataFrame:
+    """Panel ancho de las variables a analizar (ratios si se piden familias)"""
+    if familias is not None:
+        return calcular_ratios_panel(datos, familias, formato)
+    return preparar_panel(datos, formato)
+
+def _crecimiento(actual: np.ndarray, base: np.ndarray) -> np.ndarray:
+    """Variación relativa sobre |base|; NaN si la base es cero o falta"""
+    resultado = np.full(np.broadcast(actual, base).shape, np.nan)
+    np.divide(actual - base, np.abs(base), out=resultado, where=(base != 0) & np.isfinite(base))
+    return resultado
+
+def _cagr(actual: np.ndarray, inicial: np.ndarray, años: np.ndarray) -> np.ndarray:
+    """Crecimiento anual compuesto; NaN si algún extremo no es positivo"""
+    validos = (actual > 0) & (inicial > 0) & (años > 0)
+    resultado = np.full(actual.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.subtract(np.power(actual / inicial, 1 / años), 1, out=resultado, where=validos)
+    return resultado
+
+def _estadisticas_ventana(ventanas: np.ndarray):
+    """
+    Media, desvío estándar muestral y pendiente MCO sobre el último eje.
+    Las ventanas con algún dato faltante devuelven NaN.
+    """
+    largo = ventanas.shape[-1]
+    media = ventanas.mean(axis=-1)
+    volatilidad = ventanas.std(axis=-1, ddof=1) if largo > 1 else np.full(media.shape, np.nan)
+    
+    # Pendiente = Σ (k - k̄)(y_k - ȳ) / Σ (k - k̄)²; los pesos no dependen de los datos
+    k = np.arange(largo) - (largo - 1) / 2
+    pesos = k / (k @ k) if largo > 1 else np.full(1, np.nan)
+    pendiente = ventanas @ pesos
+    return media, volatilidad, pendiente
+
+def _columnas_metricas(variables: pd.Index) -> pd.MultiIndex:
+    """Columnas (variable..., metrica) del resultado"""
+    if isinstance(variables, pd.MultiIndex):
+        tuplas = [(*v, m) for v in variables for m in METRICAS_TEMPORALES]
+        return pd.MultiIndex.from_tuples(tuplas, names=list(variables.names) + ['metrica'])
+    return pd.MultiIndex.from_product([variables, METRICAS_TEMPORALES],
+                                      names=[variables.name or 'variable', 'metrica'])
+
+def _armar_resultado(metricas: dict, variables: pd.Index, indice: pd.Index) -> pd.DataFrame:
+    """
+    Une las métricas (cada una variables × filas) en un DataFrame con una
+    columna por (variable, metrica)
+    """
+    bloque = np.stack([metricas[m].reshape(len(variables), -1) for m in METRICAS_TEMPORALES],
+                      axis=1)
+    return pd.DataFrame(bloque.reshape(-1, bloque.shape[-1]).T, index=indice,
+                        columns=_columnas_metricas(variables))
+
+class _SerieDensa:
+    """Panel llevado a un arreglo denso (variables × empresas × períodos)"""
+    
+    def __init__(self, valores: np.ndarray, variables: pd.Index, empresas: pd.Index,
+                 periodos: pd.Index):
+        self.valores = valores
+        self.variables = variables
+        self.empresas = empresas
+        self.periodos = periodos
+    
+    @classmethod
+    def desde_panel(cls, panel: pd.DataFrame) -> '_SerieDensa':
+        codigos_empresa, empresas = pd.factorize(panel.index.get_level_values('empresa'))
+        codigos_periodo, periodos = pd.factorize(panel.index.get_level_values('periodo'), sort=True)
+        valores = np.full((panel.shape[1], len(empresas), len(periodos)), np.nan)
+        valores[:, codigos_empresa, codigos_periodo] = panel.to_numpy(dtype=float).T
+        return cls(valores, panel.columns, pd.Index(empresas, name='empresa'),
+                   pd.Index(periodos, name='periodo'))
+
+def analisis_temporal_panel(datos, ventana: int = 4, periodos_por_año: int = 4,
+                            familias: Optional[List[str]] = None,
+                            formato: str = 'auto') -> pd.DataFrame:
+    """
+    Métricas de crecimiento, tendencia y volatilidad de todas las variables
+    y empresas de un panel, en una sola pasada
+    
+    Parameters:
+    -----------
+    datos : pd.DataFrame o dict
+        Panel indexado por (empresa, periodo) (ver `preparar_panel`). Los
+        períodos deben ordenarse cronológicamente (p. ej. '2024Q1', '2024-03')
+    ventana : int
+        Períodos de la media, la volatilidad y la pendiente móviles
+    periodos_por_año : int
+        4 para datos trimestrales, 12 mensuales, 1 anuales
+    familias : List[str], optional
+        Si se indica, se calculan primero esos ratios con `calcular_ratios_panel`
+        y se analizan los ratios en lugar de las cuentas
+    formato : str
+        'auto', 'largo' o 'ancho'
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Indexado por (empresa, periodo), con columnas (variable, metrica)
+        (o (familia, ratio, metrica) para ratios)
+    
+    Ejemplo:
+    --------
+    >>> temporal = analisis_temporal_panel(estados, familias=['rentabilidad'])
+    >>> temporal['rentabilidad', 'roe', 'crecimiento_interanual'].unstack('periodo')
+    """
+    panel = _variables_panel(datos, familias, formato)
+    serie = _SerieDensa.desde_panel(panel)
+    valores = serie.valores
+    n_periodos = valores.shape[-1]
+    
+    anterior = np.full(valores.shape, np.nan)
+    anterior[..., 1:] = valores[..., :-1]
+    interanual = np.full(valores.shape, np.nan)
+    if periodos_por_año < n_periodos:
+        interanual[..., periodos_por_año:] = valores[..., :-periodos_por_año]
+    
+    # CAGR desde el primer dato de cada serie
+    presentes = ~np.isnan(valores)
+    primero = np.where(presentes.any(axis=-1), presentes.argmax(axis=-1), n_periodos)
+    inicial = np.take_along_axis(valores, np.minimum(primero, n_periodos - 1)[..., None], axis=-1)
+    años = (np.arange(n_periodos) - primero[..., None]) / periodos_por_año
+    
+    # Ventanas móviles que terminan en cada período (las primeras quedan incompletas -> NaN)
+    relleno = np.concatenate([np.full(valores.shape[:-1] + (ventana - 1,), np.nan), valores], axis=-1)
+    media, volatilidad, pendiente = _estadisticas_ventana(sliding_window_view(relleno, ventana, axis=-1))
+    
+    metricas = {
+        'valor': valores,
+        'crecimiento': _crecimiento(valores, anterior),
+        'crecimiento_interanual': _crecimiento(valores, interanual),
+        'cagr': _cagr(valores, inicial, años),
+        'media_movil': media,
+        'volatilidad_movil': volatilidad,
+        'pendiente': pendiente,
+    }
+    indice = pd.MultiIndex.from_product([serie.empresas, serie.periodos], names=INDICE_PANEL)
+    resultado = _armar_resultado(metricas, serie.variables, indice)
+    # Sólo las combinaciones (empresa, periodo) que existían en el panel
+    return resultado.loc[panel.index] if len(panel) < len(resultado) else resultado
+
+class EstadoTemporal:
+    """
+    Estado móvil de las métricas temporales para actualizar período a período
+    
+    Por cada (variable, empresa) guarda un buffer circular con los últimos
+    max(ventana, periodos_por_año + 1) valores, el primer valor observado y
+    el período en que apareció. Agregar un período cuesta lo mismo sin
+    importar cuánta historia haya, y el resultado coincide con el de
+    `analisis_temporal_panel` para ese período.
+    
+    Ejemplo:
+    --------
+    >>> estado = EstadoTemporal.desde_panel(historia, familias=['liquidez'])
+    >>> estado.agregar_periodo('2025Q1', estados_2025q1)
+    """
+    
+    def __init__(self, variables, ventana: int = 4, periodos_por_año: int = 4,
+                 familias: Optional[List[str]] = None):
+        self.variables = variables if isinstance(variables, pd.Index) else pd.Index(variables)
+        self.ventana = ventana
+        self.periodos_por_año = periodos_por_año
+        self.familias = familias
+        self._largo = max(ventana, periodos_por_año + 1, 2)
+        self._buffer = np.full((len(self.variables), 0, self._largo), np.nan)
+        self._inicial = np.full((len(self.variables), 0), np.nan)
+        self._primer_periodo = np.full((len(self.variables), 0), -1, dtype=np.int64)
+        self._empresas = pd.Index([], name='empresa')
+        self._posicion = 0
+        self._periodos = 0
+        self._ultimo_periodo = None
+    
+    @classmethod
+    def desde_panel(cls, datos, ventana: int = 4, periodos_por_año: int = 4,
+                    familias: Optional[List[str]] = None, formato: str = 'auto') -> 'EstadoTemporal':
+        """
+        Inicializa el estado con la historia de un panel, guardando sólo los
+        últimos períodos de cada serie
+        """
+        panel = _variables_panel(datos, familias, formato)
+        serie = _SerieDensa.desde_panel(panel)
+        estado = cls(serie.variables, ventana, periodos_por_año, familias)
+        
+        valores = serie.valores
+        n_periodos = valores.shape[-1]
+        ultimos = valores[..., -estado._largo:]
+        estado._buffer = np.full(valores.shape[:-1] + (estado._largo,), np.nan)
+        estado._buffer[..., estado._largo - ultimos.shape[-1]:] = ultimos
+        
+        presentes = ~np.isnan(valores)
+        tiene_datos = presentes.any(axis=-1)
+        primero = presentes.argmax(axis=-1)
+        estado._inicial = np.where(tiene_datos,
+                                   np.take_along_axis(valores, primero[..., None], axis=-1)[..., 0],
+                                   np.nan)
+        estado._primer_periodo = np.where(tiene_datos, primero, -1)
+        estado._empresas = serie.empresas
+        estado._periodos = n_periodos
+        estado._ultimo_periodo = serie.periodos[-1] if n_periodos else None
+        return estado
+    
+    def __repr__(self) -> str:
+        return (f"EstadoTemporal({len(self.variables)} variables, {len(self._empresas)} empresas, "
+                f"{self._periodos} períodos)")
+    
+    @property
+    def empresas(self) -> pd.Index:
+        return self._empresas
+    
+    def _agregar_empresas(self, nuevas: pd.Index):
+        """Suma filas vacías al estado para empresas que no estaban"""
+        n = len(nuevas)
+        self._buffer = np.concatenate(
+            [self._buffer, np.full((len(self.variables), n, self._largo), np.nan)], axis=1)
+        self._inicial = np.concatenate([self._inicial, np.full((len(self.variables), n), np.nan)], axis=1)
+        self._primer_periodo = np.concatenate(
+            [self._primer_periodo, np.full((len(self.variables), n), -1, dtype=np.int64)], axis=1)
+        self._empresas = self._empresas.append(nuevas)
+    
+    def agregar_periodo(self, periodo, datos, formato: str = 'ancho') -> pd.DataFrame:
+        """
+        Incorpora un período y devuelve sus métricas
+        
+        Parameters:
+        -----------
+        periodo : hashable
+            Período nuevo, posterior al último cargado
+        datos : pd.DataFrame
+            Cuentas (si el estado se creó con familias) o variables del
+            período, indexadas por empresa
+        formato : str
+            Formato de `datos` (ver `preparar_panel`)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Métricas del período indexadas por empresa, con las mismas
+            columnas que `analisis_temporal_panel`
+        """
+        if self._ultimo_periodo is not None and not periodo > self._ultimo_periodo:
+            raise ValueError(f"El período {periodo!r} no es posterior a {self._ultimo_periodo!r}")
+        
+        panel = _variables_panel(datos, self.familias, formato)
+        if isinstance(panel.index, pd.MultiIndex):
+            panel = panel.droplevel([n for n in panel.index.names if n != 'empresa'])
+        panel = panel.reindex(columns=self.variables)
+        
+        posiciones = self._empresas.get_indexer(panel.index)
+        if (posiciones < 0).any():
+            self._agregar_empresas(pd.Index(pd.unique(panel.index[posiciones < 0]), name='empresa'))
+            posiciones = self._empresas.get_indexer(panel.index)
+        
+        nuevos = np.full(self._inicial.shape, np.nan)
+        nuevos[:, posiciones] = panel.to_numpy(dtype=float).T
+        
+        # Escribir en el buffer circular sobre el valor más antiguo
+        self._buffer[..., self._posicion] = nuevos
+        self._posicion = (self._posicion + 1) % self._largo
+        t = self._periodos
+        self._periodos += 1
+        self._ultimo_periodo = periodo
+        
+        primeros = np.isnan(self._inicial) & ~np.isnan(nuevos)
+        self._inicial[primeros] = nuevos[primeros]
+        self._primer_periodo[primeros] = t
+        
+        # Buffer en orden cronológico: el último elemento es el período actual
+        orden = (self._posicion + np.arange(self._largo)) % self._largo
+        historia = self._buffer[..., orden]
+        años = np.where(self._primer_periodo >= 0, t - self._primer_periodo, 0) / self.periodos_por_año
+        media, volatilidad, pendiente = _estadisticas_ventana(historia[..., -self.ventana:])
+        
+        metricas = {
+            'valor': nuevos,
+            'crecimiento': _crecimiento(nuevos, historia[..., -2]),
+            'crecimiento_interanual': _crecimiento(nuevos, historia[..., -1 - self.periodos_por_año]),
+            'cagr': _cagr(nuevos, self._inicial, años),
+            'media_movil': media,
+            'volatilidad_movil': volatilidad,
+            'pendiente': pendiente,
+        }
+        return _armar_resultado(metricas, self.variables, self._empresas)
+
+
+if __name__ == "__main__":
+    import time
+    
+    print("=== TESTING MÓDULO ANÁLISIS TEMPORAL ===")
+    
+    rng = np.random.default_rng(0)
+    empresas = [f'EMP{i:04d}' for i in range(2000)]
+    periodos = [f'{a}Q{t}' for a in range(2019, 2025) for t in range(1, 5)]
+    n = len(empresas) * len(periodos)
+    campos = ['activo_corriente', 'pasivo_corriente', 'resultado_neto', 'resultado_operativo',
+              'ventas', 'activo_total', 'patrimonio_neto']
+    estados = pd.DataFrame({c: rng.uniform(100, 1000, n) for c in campos},
+                           index=pd.MultiIndex.from_product([empresas, periodos], names=INDICE_PANEL))
+    
+    inicio = time.perf_counter()
+    temporal = analisis_temporal_panel(estados, familias=['liquidez', 'rentabilidad'])
+    print(f"Pasada completa ({len(estados)} filas): {time.perf_counter() - inicio:.2f}s")
+    print(temporal['rentabilidad', 'roe'].xs('EMP0000', level='empresa').tail(4).round(4))
+    
+    historia = estados[estados.index.get_level_values('periodo') < '2024Q4']
+    estado = EstadoTemporal.desde_panel(historia, familias=['liquidez', 'rentabilidad'])
+    inicio = time.perf_counter()
+    ultimo = estado.agregar_periodo('2024Q4', estados.xs('2024Q4', level='periodo'))
+    print(f"\nActualización incremental de un período: {(time.perf_counter() - inicio) * 1000:.1f}ms")
+    completo = temporal.xs('2024Q4', level='periodo').loc[ultimo.index]
+    print(f"Coincide con la pasada completa: "
+          f"{np.allclose(ultimo.to_numpy(), completo.to_numpy(), equal_nan=True)}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,387 @@
+"""
+Módulo de Caché Columnar de Estados Financieros - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo guarda paneles de estados financieros ya normalizados en un
+formato columnar local: un archivo .npy por columna más un manifiesto JSON
+con el hash del archivo de origen. Al abrirlo, las columnas se cargan con
+`np.load(mmap_mode='r')`, de modo que un panel de millones de filas queda
+disponible en milisegundos y sólo se leen del disco las páginas de las
+columnas que realmente usa cada familia de ratios.
+
+Las claves (empresa, periodo) se guardan como códigos enteros más sus
+categorías, y los períodos se conservan como texto.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import INDICE_PANEL, CAMPOS_RATIOS, calcular_ratios_panel
+
+MANIFIESTO = 'manifiesto.json'
+VERSION_FORMATO = 1
+
+# Opciones de lectura con su valor por defecto, para que pasarlas explícitas o
+# no dé la misma clave. El tamaño de bloque no cambia el panel y no se guarda.
+_OPCIONES_POR_DEFECTO = {'formato': 'auto', 'hoja': None, 'alias': None}
+_OPCIONES_SIN_EFECTO = {'tamaño_bloque'}
+
+# Tamaño de lectura para calcular el hash del archivo de origen
+_BLOQUE_HASH = 1 << 20
+
+def hash_archivo(ruta) -> str:
+    """SHA-256 del contenido de un archivo, leído por bloques"""
+    digesto = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(_BLOQUE_HASH), b''):
+            digesto.update(bloque)
+    return digesto.hexdigest()
+
+def normalizar_opciones(opciones: Optional[Dict] = None) -> Dict:
+    """
+    Opciones de lectura en forma canónica (JSON con claves ordenadas), tal como
+    se guardan en el manifiesto y se comparan en `cache_vigente`
+    """
+    normalizadas = {**_OPCIONES_POR_DEFECTO, **(opciones or {})}
+    for clave in _OPCIONES_SIN_EFECTO:
+        normalizadas.pop(clave, None)
+    return json.loads(json.dumps(normalizadas, sort_keys=True, ensure_ascii=False, default=repr))
+
+def _datos_fuente(ruta, con_hash: bool = True) -> Dict:
+    estado = os.stat(ruta)
+    datos = {'ruta': str(Path(ruta).resolve()), 'tamaño': estado.st_size,
+             'modificado_ns': estado.st_mtime_ns}
+    if con_hash:
+        datos['sha256'] = hash_archivo(ruta)
+    return datos
+
+class _EscritorColumnar:
+    """
+    Escribe un panel por bloques: cada columna se vuelca a un archivo crudo y
+    al final se convierte en .npy, sin juntar el panel completo en memoria
+    """
+    
+    def __init__(self, carpeta: Path):
+        self.carpeta = carpeta
+        self.filas = 0
+        self.crudos = {}
+        self.categorias = {nivel: {} for nivel in INDICE_PANEL}
+    
+    def _crudo(self, nombre: str, dtype) -> object:
+        if nombre not in self.crudos:
+            archivo = open(self.carpeta / f'{nombre}.crudo', 'wb')
+            self.crudos[nombre] = (archivo, np.dtype(dtype))
+            if dtype == np.float64 and self.filas:
+                # Columna nueva: las filas anteriores no la tenían
+                archivo.write(np.full(self.filas, np.nan).tobytes())
+        return self.crudos[nombre][0]
+    
+    def agregar(self, panel: pd.DataFrame):
+        n = len(panel)
+        for nivel in INDICE_PANEL:
+            # Códigos locales del bloque traducidos a códigos globales
+            locales, unicos = pd.factorize(panel.index.get_level_values(nivel).astype(str))
+            mapa = self.categorias[nivel]
+            globales = np.array([mapa.setdefault(v, len(mapa)) for v in unicos], dtype=np.int32)
+            self._crudo(nivel, np.int32).write(globales[locales].tobytes())
+        
+        for columna in panel.columns:
+            valores = panel[columna].to_numpy(dtype=np.float64)
+            self._crudo(columna, np.float64).write(valores.tobytes())
+        faltantes = [c for c, (_, dtype) in self.crudos.items()
+                     if dtype == np.float64 and c not in panel.columns]
+        for columna in faltantes:
+            self.crudos[columna][0].write(np.full(n, np.nan).tobytes())
+        self.filas += n
+    
+    def cerrar(self, fuente: Optional[Dict], opciones: Optional[Dict] = None) -> Dict:
+        columnas = {}
+        for nombre, (archivo, dtype) in self.crudos.items():
+            archivo.close()
+            crudo = self.carpeta / f'{nombre}.crudo'
+            destino = np.lib.format.open_memmap(self.carpeta / f'{nombre}.npy', mode='w+',
+                                                dtype=dtype, shape=(self.filas,))
+            paso = max(1, (64 << 20) // dtype.itemsize)
+            for inicio in range(0, self.filas, paso):
+                cantidad = min(paso, self.filas - inicio)
+                destino[inicio:inicio + cantidad] = np.fromfile(
+                    crudo, dtype=dtype, count=cantidad, offset=inicio * dtype.itemsize)
+            destino.flush()
+            del destino
+            crudo.unlink()
+            if nombre not in INDICE_PANEL:
+                columnas[nombre] = {'archivo': f'{nombre}.npy', 'dtype': dtype.str}
+        
+        for nivel, mapa in self.categorias.items():
+            np.save(self.carpeta / f'{nivel}.categorias.npy',
+                    np.array(list(mapa), dtype=str) if mapa else np.array([], dtype='<U1'))
+        
+        manifiesto = {
+            'version': VERSION_FORMATO,
+            'filas': self.filas,
+            'indice': {nivel: {'codigos': f'{nivel}.npy',
+                               'categorias': f'{nivel}.categorias.npy'}
+                       for nivel in INDICE_PANEL},
+            'columnas': columnas,
+            'fuente': fuente,
+            'opciones': opciones,
+            'creado': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(self.carpeta / MANIFIESTO, 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+        return manifiesto
+
+def guardar_panel(paneles, carpeta, fuente=None, opciones: Optional[Dict] = None) -> 'PanelColumnar':
+    """
+    Guarda un panel (o una secuencia de bloques de panel) en formato columnar
+    
+    Parameters:
+    -----------
+    paneles : pd.DataFrame o iterable de pd.DataFrame
+        Paneles anchos indexados por (empresa, periodo), por ejemplo los
+        bloques de `ingesta_estados.leer_estados_por_bloques`
+    carpeta : str o Path
+        Carpeta de la caché (se reemplaza si ya existe)
+    fuente : str o Path, optional
+        Archivo de origen; su hash se guarda en el manifiesto
+    opciones : Dict, optional
+        Opciones de lectura con que se generó el panel; se guardan
+        normalizadas en el manifiesto (ver `normalizar_opciones`)
+    
+    Returns:
+    --------
+    PanelColumnar
+        El panel recién guardado, abierto en modo sólo lectura
+    """
+    carpeta = Path(carpeta)
+    if isinstance(paneles, pd.DataFrame):
+        paneles = [paneles]
+    datos_fuente = _datos_fuente(fuente) if fuente is not None else None
+    
+    # Se escribe en una carpeta temporal y se reemplaza al final, para no dejar
+    # una caché a medio escribir si el proceso se interrumpe
+    carpeta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = Path(tempfile.mkdtemp(prefix='.tmp_', dir=carpeta.parent))
+    try:
+        escritor = _EscritorColumnar(temporal)
+        for panel in paneles:
+            escritor.agregar(panel)
+        escritor.cerrar(datos_fuente, normalizar_opciones(opciones))
+        if carpeta.exists():
+            shutil.rmtree(carpeta)
+        temporal.rename(carpeta)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return abrir_panel(carpeta)
+
+class PanelColumnar:
+    """
+    Panel de estados financieros abierto desde la caché columnar
+    
+    Las columnas se mapean en memoria recién cuando se piden, y sólo se
+    leen del disco las páginas que se recorren.
+    
+    Ejemplo:
+    --------
+    >>> panel = abrir_panel('cache/estados_2024')
+    >>> panel['ventas'][:5]                         # np.memmap de sólo lectura
+    >>> panel.ratios(['liquidez'])                  # toca sólo 5 columnas
+    """
+    
+    def __init__(self, carpeta, manifiesto: Dict):
+        self.carpeta = Path(carpeta)
+        self.manifiesto = manifiesto
+        self._abiertas = {}
+    
+    def __len__(self) -> int:
+        return self.manifiesto['filas']
+    
+    def __repr__(self) -> str:
+        return f"PanelColumnar({len(self)} filas, {len(self.columnas)} cuentas, '{self.carpeta}')"
+    
+    def __contains__(self, columna: str) -> bool:
+        return columna in self.manifiesto['columnas']
+    
+    @property
+    def columnas(self) -> List[str]:
+        return list(self.manifiesto['columnas'])
+    
+    @property
+    def fuente(self) -> Optional[Dict]:
+        return self.manifiesto.get('fuente')
+    
+    def _mapear(self, archivo: str) -> np.ndarray:
+        if archivo not in self._abiertas:
+            self._abiertas[archivo] = np.load(self.carpeta / archivo, mmap_mode='r')
+        return self._abiertas[archivo]
+    
+    def __getitem__(self, columna: str) -> np.ndarray:
+        if columna not in self:
+            raise KeyError(f"La caché no tiene la cuenta '{columna}'")
+        return self._mapear(self.manifiesto['columnas'][columna]['archivo'])
+    
+    def indice(self) -> pd.MultiIndex:
+        """Índice (empresa, periodo) armado a partir de códigos y categorías"""
+        niveles, codigos = [], []
+        for nivel in INDICE_PANEL:
+            datos = self.manifiesto['indice'][nivel]
+            niveles.append(pd.Index(np.load(self.carpeta / datos['categorias'])))
+            codigos.append(self._mapear(datos['codigos']))
+        return pd.MultiIndex(levels=niveles, codes=codigos, names=INDICE_PANEL,
+                             verify_integrity=False)
+    
+    def a_dataframe(self, columnas: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Panel ancho con las cuentas pedidas (por defecto todas)
+        
+        Parameters:
+        -----------
+        columnas : List[str], optional
+            Cuentas a incluir; las que no están en la caché se omiten
+        """
+        columnas = self.columnas if columnas is None else [c for c in columnas if c in self]
+        return pd.DataFrame({c: self[c] for c in columnas}, index=self.indice())
+    
+    def ratios(self, familias: Optional[List[str]] = None, dias_año: int = 365) -> pd.DataFrame:
+        """
+        Calcula familias de ratios leyendo sólo las columnas que necesitan
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Mismo formato que `calcular_ratios_panel`
+        """
+        familias = list(CAMPOS_RATIOS) if familias is None else list(familias)
+        necesarias = []
+        for familia in familias:
+            necesarias += [c for c in CAMPOS_RATIOS[familia] if c not in necesarias]
+        return calcular_ratios_panel(self.a_dataframe(necesarias), familias, 'ancho', dias_año)
+
+def abrir_panel(carpeta) -> PanelColumnar:
+    """Abre una caché columnar (sólo lee el manifiesto)"""
+    carpeta = Path(carpeta)
+    with open(carpeta / MANIFIESTO, encoding='utf-8') as archivo:
+        manifiesto = json.load(archivo)
+    if manifiesto.get('version') != VERSION_FORMATO:
+        raise ValueError(f"Versión de caché no soportada: {manifiesto.get('version')}")
+    return PanelColumnar(carpeta, manifiesto)
+
+def cache_vigente(carpeta, fuente, verificar: str = 'rapido',
+                  opciones: Optional[Dict] = None) -> bool:
+    """
+    Indica si la caché corresponde al contenido actual del archivo de origen,
+    leído con las mismas opciones
+    
+    Parameters:
+    -----------
+    carpeta : str o Path
+        Carpeta de la caché
+    fuente : str o Path
+        Archivo de origen
+    verificar : str
+        'rapido': si tamaño y fecha de modificación coinciden se da por
+        vigente sin leer el archivo; si no, se compara el hash.
+        'hash': siempre se compara el hash del contenido.
+    opciones : Dict, optional
+        Opciones de lectura (las de `leer_con_cache`); si difieren de las
+        guardadas en el manifiesto la caché no está vigente
+    """
+    manifiesto = Path(carpeta) / MANIFIESTO
+    if not manifiesto.exists():
+        return False
+    with open(manifiesto, encoding='utf-8') as archivo:
+        contenido = json.load(archivo)
+    if contenido.get('opciones') != normalizar_opciones(opciones):
+        return False
+    guardada = contenido.get('fuente') or {}
+    if 'sha256' not in guardada:
+        return False
+    
+    actual = _datos_fuente(fuente, con_hash=False)
+    if (verificar == 'rapido' and actual['tamaño'] == guardada.get('tamaño')
+            and actual['modificado_ns'] == guardada.get('modificado_ns')):
+        return True
+    return hash_archivo(fuente) == guardada['sha256']
+
+def leer_con_cache(ruta, carpeta_cache=None, verificar: str = 'rapido',
+                   **opciones) -> PanelColumnar:
+    """
+    Abre el panel de un archivo de estados desde la caché, o lo procesa y la
+    crea si no existe o si el archivo cambió
+    
+    Parameters:
+    -----------
+    ruta : str o Path
+        Archivo .csv o .xlsx de estados financieros
+    carpeta_cache : str o Path, optional
+        Carpeta de la caché (por defecto '<archivo>.cache' junto al archivo)
+    verificar : str
+        'rapido' o 'hash' (ver `cache_vigente`)
+    **opciones
+        Se pasan a `ingesta_estados.leer_estados_por_bloques`; forman parte
+        de la clave de la caché junto con el archivo de origen
+    
+    Returns:
+    --------
+    PanelColumnar
+        Panel listo para consultar
+    
+    Ejemplo:
+    --------
+    >>> panel = leer_con_cache('estados_2024.csv', sep=';', decimal=',')
+    >>> ratios = panel.ratios(['liquidez', 'rentabilidad'])
+    """
+    from ingesta_estados import leer_estados_por_bloques
+    
+    ruta = Path(ruta)
+    carpeta_cache = Path(carpeta_cache) if carpeta_cache is not None else \
+        ruta.with_name(ruta.name + '.cache')
+    if cache_vigente(carpeta_cache, ruta, verificar, opciones):
+        return abrir_panel(carpeta_cache)
+    return guardar_panel(leer_estados_por_bloques(ruta, **opciones), carpeta_cache,
+                         fuente=ruta, opciones=opciones)
+
+if __name__ == "__main__":
+    import time
+    
+    print("=== TESTING MÓDULO CACHÉ COLUMNAR ===")
+    
+    rng = np.random.default_rng(0)
+    n = 200_000
+    campos = sorted(set(sum(CAMPOS_RATIOS.values(), [])))
+    estados = pd.DataFrame({c: rng.uniform(1, 1000, n) for c in campos})
+    estados['empresa'] = np.repeat([f'EMP{i:05d}' for i in range(n // 8)], 8)
+    estados['periodo'] = np.tile([f'{a}Q{t}' for a in (2023, 2024) for t in range(1, 5)], n // 8)
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / 'estados.csv'
+        estados.to_csv(ruta, index=False)
+        
+        inicio = time.perf_counter()
+        panel = leer_con_cache(ruta, tamaño_bloque=50_000)
+        print(f"Primera lectura (CSV + caché): {time.perf_counter() - inicio:.2f}s")
+        
+        inicio = time.perf_counter()
+        panel = leer_con_cache(ruta)
+        print(f"Apertura desde caché: {(time.perf_counter() - inicio) * 1000:.1f}ms -> {panel}")
+        
+        ratios = panel.ratios(['liquidez'])
+        directo = calcular_ratios_panel(estados, ['liquidez'])
+        print(f"Ratios iguales a los calculados en memoria: "
+              f"{np.allclose(ratios.to_numpy(), directo.to_numpy())}")
+        
+        cache = ruta.with_name(ruta.name + '.cache')
+        print(f"Vigente con las mismas opciones: {cache_vigente(cache, ruta, opciones={'formato': 'auto'})}, "
+              f"con decimal=',': {cache_vigente(cache, ruta, opciones={'decimal': ','})}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,361 @@
+"""
+Módulo de Dashboards por Lote - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo genera el dashboard de `crear_dashboard_ratios` para miles de
+empresas sin interfaz gráfica: usa directamente `Figure` y el backend Agg
+(sin pyplot ni `plt.show()`), arma la figura y sus artistas una sola vez por
+proceso y, para cada empresa, sólo actualiza las alturas de las barras, los
+sectores de la torta y los títulos antes de guardar.
+
+Los dashboards se guardan como PNG o SVG (un archivo por empresa) o como
+páginas de PDF (un archivo por lote). Con `procesos > 1` el trabajo se reparte
+en un pool de procesos con una cola acotada de lotes pendientes, de modo que
+la memoria no crece con la cantidad de empresas.
+
+La entrada es un panel de ratios como el de `calcular_ratios_panel` (o
+`PanelColumnar.ratios`), con columnas (familia, ratio).
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.layout_engine import TightLayoutEngine
+
+FORMATOS = ('png', 'svg', 'pdf')
+
+# Estilo con el que se arma la plantilla (el mismo que usan los notebooks)
+ESTILO = 'seaborn-v0_8'
+
+# Empresas por lote: cada lote es una tarea del pool y, en PDF, un archivo
+TAMAÑO_LOTE = 200
+
+# Nivel de compresión zlib de los PNG: 1 prioriza la velocidad (el 6 habitual
+# tarda varias veces más en codificar y reduce poco el tamaño de un gráfico)
+COMPRESION_PNG = 1
+
+# Colores de cada panel, como en `crear_dashboard_ratios`
+COLORES = {
+    'liquidez': ['skyblue', 'lightgreen', 'coral'],
+    'rentabilidad': ['gold', 'orange', 'darkturquoise'],
+    'actividad': ['mediumpurple', 'plum', 'thistle'],
+    'endeudamiento': ['lightcoral', 'lightblue'],
+}
+
+def ratios_dashboard(columnas: pd.Index) -> Dict[str, List[str]]:
+    """
+    Ratios que muestra cada panel del dashboard, con el mismo criterio que
+    `crear_dashboard_ratios`
+    
+    Parameters:
+    -----------
+    columnas : pd.MultiIndex
+        Columnas (familia, ratio) del panel de ratios
+    
+    Returns:
+    --------
+    Dict[str, List[str]]
+        Ratios por familia ('liquidez', 'rentabilidad', 'actividad',
+        'endeudamiento'); sólo las familias presentes
+    """
+    if not isinstance(columnas, pd.MultiIndex):
+        raise ValueError("Se espera un panel de ratios con columnas (familia, ratio)")
+    
+    por_familia = {}
+    for familia, ratio in columnas:
+        por_familia.setdefault(familia, []).append(ratio)
+    
+    seleccion = {}
+    if 'liquidez' in por_familia:
+        seleccion['liquidez'] = por_familia['liquidez']
+    if 'rentabilidad' in por_familia:
+        seleccion['rentabilidad'] = [r for r in por_familia['rentabilidad']
+                                     if 'margen' in r.lower() or 'ro' in r.lower()]
+    if 'actividad' in por_familia:
+        rotaciones = [r for r in por_familia['actividad'] if 'rotacion' in r]
+        if rotaciones:
+            seleccion['actividad'] = rotaciones
+    if {'endeudamiento_total', 'autonomia'}.issubset(por_familia.get('endeudamiento', [])):
+        seleccion['endeudamiento'] = ['endeudamiento_total', 'autonomia']
+    return seleccion
+
+def _limites(valores: np.ndarray, referencia: Optional[float] = None) -> Tuple[float, float]:
+    """Límites del eje y que incluyen el cero, la referencia y todas las barras"""
+    extremos = [0.0] + ([referencia] if referencia is not None else []) + list(valores)
+    inferior, superior = min(extremos), max(extremos)
+    margen = 0.05 * (superior - inferior) or 1.0
+    return inferior - (margen if inferior < 0 else 0.0), superior + margen
+
+class PlantillaDashboard:
+    """
+    Figura 2×2 del dashboard armada una sola vez y reutilizada
+    
+    `actualizar` cambia los datos de los artistas existentes (alturas de
+    barras, ángulos de la torta, textos) sin crear ejes nuevos, y `guardar`
+    la escribe con el canvas Agg.
+    
+    Ejemplo:
+    --------
+    >>> plantilla = PlantillaDashboard(ratios_dashboard(ratios.columns))
+    >>> plantilla.actualizar('YPF 2024', ratios.loc[('YPF', '2024')])
+    >>> plantilla.guardar('ypf_2024.png')
+    """
+    
+    def __init__(self, seleccion: Dict[str, List[str]], figsize: Tuple[int, int] = (15, 12),
+                 dpi: int = 100, compresion_png: int = COMPRESION_PNG):
+        self.seleccion = seleccion
+        self.compresion_png = compresion_png
+        with matplotlib.style.context(ESTILO):
+            self.figura = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.figura)
+            axes = self.figura.subplots(2, 2)
+            self.titulo = self.figura.suptitle('Dashboard Financiero', fontsize=16, fontweight='bold')
+            self.barras = {}
+            self.ejes = {'liquidez': axes[0, 0], 'rentabilidad': axes[0, 1],
+                         'actividad': axes[1, 0], 'endeudamiento': axes[1, 1]}
+            
+            if 'liquidez' in seleccion:
+                ax = axes[0, 0]
+                self.barras['liquidez'] = ax.bar(seleccion['liquidez'], np.zeros(len(seleccion['liquidez'])),
+                                                 color=COLORES['liquidez'])
+                ax.set_title('Ratios de Liquidez')
+                ax.set_ylabel('Ratio')
+                ax.tick_params(axis='x', rotation=45)
+                ax.axhline(y=1.0, color='red', linestyle='--', alpha=0.7, label='Mínimo recomendado')
+                ax.legend()
+            
+            if 'rentabilidad' in seleccion:
+                ax = axes[0, 1]
+                etiquetas = [r.upper() for r in seleccion['rentabilidad']]
+                self.barras['rentabilidad'] = ax.bar(etiquetas, np.zeros(len(etiquetas)),
+                                                     color=COLORES['rentabilidad'])
+                ax.set_title('Ratios de Rentabilidad (%)')
+                ax.set_ylabel('Porcentaje')
+                ax.tick_params(axis='x', rotation=45)
+            
+            if 'actividad' in seleccion:
+                ax = axes[1, 0]
+                self.barras['actividad'] = ax.bar(seleccion['actividad'],
+                                                  np.zeros(len(seleccion['actividad'])),
+                                                  color=COLORES['actividad'])
+                ax.set_title('Ratios de Actividad (Rotaciones)')
+                ax.set_ylabel('Veces por año')
+                ax.tick_params(axis='x', rotation=45)
+            
+            if 'endeudamiento' in seleccion:
+                ax = axes[1, 1]
+                self.sectores, self.etiquetas_torta, self.porcentajes = ax.pie(
+                    [0.5, 0.5], labels=['Financiamiento Externo', 'Financiamiento Propio'],
+                    colors=COLORES['endeudamiento'], autopct='%1.1f%%', startangle=90)
+                self.sin_datos = ax.text(0, 0, 'Sin datos', ha='center', va='center', visible=False)
+                ax.set_title('Estructura de Financiamiento')
+            
+            # El layout se calcula una sola vez (los ejes no cambian entre empresas)
+            # y la figura queda sin motor de layout, para que savefig no dibuje dos veces
+            TightLayoutEngine().execute(self.figura)
+    
+    def actualizar(self, titulo: str, valores):
+        """
+        Carga los ratios de una empresa en la plantilla
+        
+        Parameters:
+        -----------
+        titulo : str
+            Nombre de la empresa (y período) para el título
+        valores : pd.Series o mapeo
+            Ratios indexados por (familia, ratio)
+        """
+        self.titulo.set_text(f'Dashboard Financiero - {titulo}')
+        
+        for familia, barras in self.barras.items():
+            datos = np.array([valores[familia, r] for r in self.seleccion[familia]], dtype=float)
+            if familia == 'rentabilidad':
+                datos = datos * 100
+            datos = np.where(np.isfinite(datos), datos, 0.0)
+            for barra, altura in zip(barras, datos):
+                barra.set_height(altura)
+            self.ejes[familia].set_ylim(*_limites(datos, 1.0 if familia == 'liquidez' else None))
+        
+        if 'endeudamiento' in self.seleccion:
+            partes = np.array([valores['endeudamiento', r] for r in self.seleccion['endeudamiento']],
+                              dtype=float)
+            validos = np.isfinite(partes).all() and (partes >= 0).all() and partes.sum() > 0
+            for artista in (*self.sectores, *self.etiquetas_torta, *self.porcentajes):
+                artista.set_visible(validos)
+            self.sin_datos.set_visible(not validos)
+            if validos:
+                self._actualizar_torta(partes / partes.sum())
+    
+    def _actualizar_torta(self, fracciones: np.ndarray):
+        """Reubica sectores, etiquetas y porcentajes como lo haría `Axes.pie`"""
+        angulo = 90.0
+        for sector, etiqueta, porcentaje, fraccion in zip(self.sectores, self.etiquetas_torta,
+                                                          self.porcentajes, fracciones):
+            final = angulo + 360.0 * fraccion
+            sector.set_theta1(angulo)
+            sector.set_theta2(final)
+            medio = np.deg2rad((angulo + final) / 2)
+            x, y = np.cos(medio), np.sin(medio)
+            etiqueta.set_position((1.1 * x, 1.1 * y))
+            etiqueta.set_horizontalalignment('left' if x > 0 else 'right')
+            porcentaje.set_position((0.6 * x, 0.6 * y))
+            porcentaje.set_text(f'{fraccion * 100:.1f}%')
+            angulo = final
+    
+    def guardar(self, destino, formato: Optional[str] = None):
+        """
+        Guarda la figura en un archivo (PNG/SVG) o como página de un `PdfPages`
+        """
+        if isinstance(destino, PdfPages):
+            destino.savefig(self.figura)
+        elif (formato or Path(destino).suffix.lstrip('.')) == 'png':
+            self.figura.savefig(destino, format='png',
+                                pil_kwargs={'compress_level': self.compresion_png})
+        else:
+            self.figura.savefig(destino, format=formato)
+
+def _nombre_archivo(clave) -> str:
+    """Nombre de archivo seguro a partir de la clave (empresa, periodo)"""
+    partes = clave if isinstance(clave, tuple) else (clave,)
+    return re.sub(r'[^\w\-.]+', '_', '_'.join(str(p) for p in partes)).strip('_')
+
+def _dibujar_lote(plantilla: PlantillaDashboard, carpeta: Path, formato: str,
+                  numero: int, claves: List, valores: pd.DataFrame) -> List[Path]:
+    """Dibuja un lote de empresas con una plantilla ya armada"""
+    titulos = [' '.join(str(p) for p in c) if isinstance(c, tuple) else str(c) for c in claves]
+    if formato == 'pdf':
+        ruta = carpeta / f'dashboards_{numero:05d}.pdf'
+        with PdfPages(ruta) as pdf:
+            for titulo, (_, fila) in zip(titulos, valores.iterrows()):
+                plantilla.actualizar(titulo, fila)
+                plantilla.guardar(pdf)
+        return [ruta]
+    
+    rutas = []
+    for clave, titulo, (_, fila) in zip(claves, titulos, valores.iterrows()):
+        ruta = carpeta / f'{_nombre_archivo(clave)}.{formato}'
+        plantilla.actualizar(titulo, fila)
+        plantilla.guardar(ruta, formato)
+        rutas.append(ruta)
+    return rutas
+
+# Plantilla y destino de cada proceso trabajador (se arman una sola vez al iniciarlo)
+_CONTEXTO_TRABAJADOR = None
+
+def _iniciar_trabajador(seleccion, figsize, dpi, carpeta, formato):
+    global _CONTEXTO_TRABAJADOR
+    _CONTEXTO_TRABAJADOR = (PlantillaDashboard(seleccion, figsize, dpi), carpeta, formato)
+
+def _dibujar_lote_trabajador(tarea):
+    plantilla, carpeta, formato = _CONTEXTO_TRABAJADOR
+    return _dibujar_lote(plantilla, carpeta, formato, *tarea)
+
+def generar_dashboards(ratios: pd.DataFrame, carpeta, formato: str = 'png', procesos: int = 1,
+                       tamaño_lote: int = TAMAÑO_LOTE, max_pendientes: Optional[int] = None,
+                       figsize: Tuple[int, int] = (15, 12), dpi: int = 100) -> List[Path]:
+    """
+    Genera un dashboard por fila del panel de ratios, sin interfaz gráfica
+    
+    Parameters:
+    -----------
+    ratios : pd.DataFrame
+        Panel de ratios con columnas (familia, ratio), indexado por empresa o
+        por (empresa, periodo)
+    carpeta : str o Path
+        Carpeta de salida (se crea si no existe)
+    formato : str
+        'png' o 'svg' (un archivo por empresa) o 'pdf' (un archivo por lote,
+        una página por empresa)
+    procesos : int
+        Procesos en paralelo (1 = en el proceso actual)
+    tamaño_lote : int
+        Empresas por tarea
+    max_pendientes : int, optional
+        Lotes enviados al pool y todavía sin terminar (por defecto 2 por
+        proceso); acota la memoria de la cola
+    figsize : Tuple[int, int]
+        Tamaño de la figura
+    dpi : int
+        Resolución de los archivos PNG
+    
+    Returns:
+    --------
+    List[Path]
+        Archivos generados, en el orden del panel
+    
+    Ejemplo:
+    --------
+    >>> ratios = calcular_ratios_panel(estados)
+    >>> generar_dashboards(ratios, 'dashboards/2025-01', formato='pdf', procesos=8)
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"formato debe ser uno de {FORMATOS}")
+    carpeta = Path(carpeta)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    seleccion = ratios_dashboard(ratios.columns)
+    columnas = [(f, r) for f, nombres in seleccion.items() for r in nombres]
+    valores = ratios[columnas]
+    claves = valores.index.tolist()
+    
+    def lotes():
+        for numero, inicio in enumerate(range(0, len(valores), tamaño_lote)):
+            fin = inicio + tamaño_lote
+            yield numero, claves[inicio:fin], valores.iloc[inicio:fin]
+    
+    rutas = {}
+    if procesos == 1:
+        plantilla = PlantillaDashboard(seleccion, figsize, dpi)
+        for tarea in lotes():
+            rutas[tarea[0]] = _dibujar_lote(plantilla, carpeta, formato, *tarea)
+    else:
+        max_pendientes = max_pendientes or 2 * procesos
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(seleccion, figsize, dpi, carpeta, formato)) as ejecutor:
+            pendientes = {}
+            for tarea in lotes():
+                # Cola acotada: no enviar más lotes hasta que termine alguno
+                if len(pendientes) >= max_pendientes:
+                    listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        rutas[pendientes.pop(futuro)] = futuro.result()
+                pendientes[ejecutor.submit(_dibujar_lote_trabajador, tarea)] = tarea[0]
+            for futuro in list(pendientes):
+                rutas[pendientes.pop(futuro)] = futuro.result()
+    
+    return [ruta for numero in sorted(rutas) for ruta in rutas[numero]]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from analisis_financiero import CAMPOS_RATIOS, calcular_ratios_panel
+    
+    print("=== TESTING MÓDULO DASHBOARDS POR LOTE ===")
+    
+    rng = np.random.default_rng(0)
+    n = 100
+    campos = sorted(set(sum(CAMPOS_RATIOS.values(), [])))
+    estados = pd.DataFrame({c: rng.uniform(100, 1000, n) for c in campos})
+    estados['empresa'] = [f'EMP{i:04d}' for i in range(n)]
+    estados['periodo'] = '2025-01'
+    ratios = calcular_ratios_panel(estados)
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        inicio = time.perf_counter()
+        rutas = generar_dashboards(ratios.iloc[:20], carpeta, formato='png')
+        print(f"20 PNG con plantilla reutilizada: {time.perf_counter() - inicio:.2f}s")
+        
+        inicio = time.perf_counter()
+        rutas = generar_dashboards(ratios, carpeta, formato='pdf', procesos=2, tamaño_lote=25)
+        print(f"{n} páginas PDF en 2 procesos: {time.perf_counter() - inicio:.2f}s "
+              f"-> {len(rutas)} archivos")
+    
+    print("\n✅ Todos los tests completados exitosamente")
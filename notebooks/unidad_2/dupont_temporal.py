@@ -0,0 +1,290 @@
+"""
+Módulo de Series Temporales DuPont - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo mantiene la descomposición DuPont del ROE (margen neto × rotación
+de activos × multiplicador de capital) de muchas empresas a lo largo del
+tiempo. Los factores se guardan en arreglos de NumPy (empresa × período) con
+capacidad de reserva que se duplica al llenarse, de modo que agregar el cierre
+de un nuevo período calcula sólo esa columna y no recalcula la historia.
+
+La variación del ROE entre períodos consecutivos se atribuye a cada factor
+con la descomposición logarítmica LMDI, para todas las empresas a la vez:
+
+    ΔROE = Σ L(ROE_t, ROE_t-1) · ln(factor_t / factor_t-1)
+
+donde L(a, b) = (a - b) / (ln a - ln b) es la media logarítmica. Las
+contribuciones suman exactamente ΔROE. Cuando algún factor no es positivo
+(empresas con pérdidas) el logaritmo no está definido y se usa la
+descomposición de Shapley de los tres factores, que también es exacta.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import INDICE_PANEL, preparar_panel, dupont_panel
+
+# Factores del DuPont de 3 factores, en el orden en que se multiplican
+FACTORES_DUPONT = ['margen_neto', 'rotacion_activos', 'multiplicador_capital']
+
+# Variables guardadas por empresa y período
+_VARIABLES = FACTORES_DUPONT + ['roe']
+
+def _atribuir(anterior: np.ndarray, actual: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Atribución de la variación del ROE a cada factor
+    
+    Parameters:
+    -----------
+    anterior, actual : np.ndarray
+        Factores (3 × n) de los períodos anterior y actual
+    
+    Returns:
+    --------
+    Dict[str, np.ndarray]
+        ROE de ambos períodos, variación, contribución de cada factor y si se
+        usó la descomposición logarítmica
+    """
+    roe_anterior = anterior.prod(axis=0)
+    roe_actual = actual.prod(axis=0)
+    variacion = roe_actual - roe_anterior
+    
+    finitos = np.isfinite(anterior).all(axis=0) & np.isfinite(actual).all(axis=0)
+    logaritmica = finitos & (anterior > 0).all(axis=0) & (actual > 0).all(axis=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Media logarítmica; cuando el ROE no cambia su límite es el propio ROE
+        cociente_log = np.log(roe_actual / roe_anterior)
+        media_log = np.where(cociente_log != 0, variacion / cociente_log, roe_actual)
+        lmdi = media_log * np.log(actual / anterior)
+        
+        # Shapley: cada factor se valora con el promedio de todos los órdenes de sustitución
+        a0, b0, c0 = anterior
+        a1, b1, c1 = actual
+        shapley = np.stack([
+            (a1 - a0) * ((b0 * c0 + b1 * c1) / 3 + (b0 * c1 + b1 * c0) / 6),
+            (b1 - b0) * ((a0 * c0 + a1 * c1) / 3 + (a0 * c1 + a1 * c0) / 6),
+            (c1 - c0) * ((a0 * b0 + a1 * b1) / 3 + (a0 * b1 + a1 * b0) / 6),
+        ])
+    
+    contribuciones = np.where(logaritmica, lmdi, np.where(finitos, shapley, np.nan))
+    resultado = {'roe_anterior': roe_anterior, 'roe': roe_actual,
+                 'variacion_roe': np.where(finitos, variacion, np.nan)}
+    resultado.update(zip(FACTORES_DUPONT, contribuciones))
+    resultado['logaritmica'] = logaritmica
+    return resultado
+
+class SerieDupont:
+    """
+    Factores DuPont de muchas empresas a lo largo del tiempo
+    
+    Los datos viven en un arreglo (variables × empresas × períodos) con
+    capacidad de reserva en ambos ejes. Agregar un período escribe una
+    columna nueva y sólo duplica la capacidad cuando se llena, por lo que el
+    costo amortizado por período es proporcional a la cantidad de empresas
+    y no a la longitud de la historia.
+    
+    Ejemplo:
+    --------
+    >>> serie = SerieDupont.desde_panel(estados)
+    >>> serie.agregar_periodo('2025-06', cierre_junio)
+    >>> serie.atribucion_roe(ultimo=True)
+    """
+    
+    def __init__(self, capacidad_empresas: int = 64, capacidad_periodos: int = 16):
+        self._datos = np.full((len(_VARIABLES), max(capacidad_empresas, 1),
+                               max(capacidad_periodos, 1)), np.nan)
+        self._empresas: List = []
+        self._periodos: List = []
+        self._indice_empresas = pd.Index([])
+        self._posicion_periodos: Dict = {}
+    
+    @classmethod
+    def desde_panel(cls, datos, formato: str = 'auto') -> 'SerieDupont':
+        """
+        Crea la serie a partir de un panel completo (ver `preparar_panel`),
+        calculando los factores de todos los períodos en una sola pasada
+        """
+        panel = preparar_panel(datos, formato)
+        factores = dupont_panel(panel, 'ancho')
+        empresas = factores.index.get_level_values('empresa')
+        periodos = factores.index.get_level_values('periodo')
+        codigos_empresa, unicas = pd.factorize(empresas)
+        codigos_periodo, periodos_unicos = pd.factorize(periodos, sort=True)
+        
+        serie = cls(len(unicas), len(periodos_unicos))
+        serie._empresas = list(unicas)
+        serie._indice_empresas = pd.Index(serie._empresas)
+        serie._periodos = list(periodos_unicos)
+        serie._posicion_periodos = {p: i for i, p in enumerate(serie._periodos)}
+        for k, variable in enumerate(_VARIABLES):
+            serie._datos[k, codigos_empresa, codigos_periodo] = factores[variable].to_numpy()
+        return serie
+    
+    def __len__(self) -> int:
+        return len(self._periodos)
+    
+    def __repr__(self) -> str:
+        return f"SerieDupont({len(self._empresas)} empresas, {len(self._periodos)} períodos)"
+    
+    @property
+    def empresas(self) -> List:
+        return list(self._empresas)
+    
+    @property
+    def periodos(self) -> List:
+        return list(self._periodos)
+    
+    def _asegurar_capacidad(self, empresas: int, periodos: int):
+        """Duplica la capacidad del eje que se quedó corto"""
+        _, cap_empresas, cap_periodos = self._datos.shape
+        if empresas <= cap_empresas and periodos <= cap_periodos:
+            return
+        while cap_empresas < empresas:
+            cap_empresas *= 2
+        while cap_periodos < periodos:
+            cap_periodos *= 2
+        datos = np.full((len(_VARIABLES), cap_empresas, cap_periodos), np.nan)
+        datos[:, :len(self._empresas), :len(self._periodos)] = self._vista()
+        self._datos = datos
+    
+    def _vista(self) -> np.ndarray:
+        """Parte ocupada del arreglo (sin copiar)"""
+        return self._datos[:, :len(self._empresas), :len(self._periodos)]
+    
+    def agregar_periodo(self, periodo, estados, formato: str = 'ancho'):
+        """
+        Agrega (o reemplaza) el cierre de un período
+        
+        Parameters:
+        -----------
+        periodo : hashable
+            Período del cierre; debe ser posterior a los ya cargados, salvo
+            que se reemplace uno existente
+        estados : pd.DataFrame o dict
+            Estados del período con resultado_neto, ventas, activo_total y
+            patrimonio_neto, indexados por empresa (o con columna 'empresa').
+            Un dict {empresa: {cuenta: valor}} también es válido.
+        formato : str
+            'ancho' o 'largo' (columnas empresa, cuenta y valor)
+        """
+        if isinstance(estados, dict) and estados and all(isinstance(v, dict) for v in estados.values()):
+            estados = pd.DataFrame.from_dict(estados, orient='index').rename_axis('empresa')
+        if not isinstance(estados, pd.DataFrame):
+            estados = pd.DataFrame(dict(estados))
+        if formato == 'largo':
+            estados = estados.set_index(['empresa', 'cuenta'])['valor'].unstack('cuenta')
+        elif 'empresa' in estados.columns:
+            estados = estados.set_index('empresa')
+        estados = estados.drop(columns=[c for c in INDICE_PANEL if c in estados.columns])
+        factores = dupont_panel(estados, 'ancho')
+        
+        # Empresas nuevas se agregan al final del eje de empresas
+        posiciones = self._indice_empresas.get_indexer(factores.index)
+        nuevas = posiciones < 0
+        if nuevas.any():
+            agregadas = list(pd.unique(factores.index[nuevas]))
+            self._asegurar_capacidad(len(self._empresas) + len(agregadas), len(self._periodos))
+            self._empresas.extend(agregadas)
+            self._indice_empresas = pd.Index(self._empresas)
+            posiciones = self._indice_empresas.get_indexer(factores.index)
+        
+        columna = self._posicion_periodos.get(periodo)
+        if columna is None:
+            if self._periodos and not periodo > self._periodos[-1]:
+                raise ValueError(f"El período {periodo!r} es anterior al último cargado "
+                                 f"({self._periodos[-1]!r})")
+            self._asegurar_capacidad(len(self._empresas), len(self._periodos) + 1)
+            columna = len(self._periodos)
+            self._periodos.append(periodo)
+            self._posicion_periodos[periodo] = columna
+        else:
+            self._datos[:, :, columna] = np.nan
+        
+        for k, variable in enumerate(_VARIABLES):
+            self._datos[k, posiciones, columna] = factores[variable].to_numpy()
+    
+    def serie(self, variable: str = 'roe') -> pd.DataFrame:
+        """
+        Una variable ('roe' o un factor) como tabla empresa × período
+        """
+        if variable not in _VARIABLES:
+            raise ValueError(f"Variable desconocida: {variable}. Opciones: {_VARIABLES}")
+        return pd.DataFrame(self._vista()[_VARIABLES.index(variable)].copy(),
+                            index=pd.Index(self._empresas, name='empresa'),
+                            columns=pd.Index(self._periodos, name='periodo'))
+    
+    def factores(self) -> pd.DataFrame:
+        """
+        Factores y ROE de todas las empresas y períodos, indexados por
+        (empresa, periodo)
+        """
+        vista = self._vista()
+        indice = pd.MultiIndex.from_product([self._empresas, self._periodos], names=INDICE_PANEL)
+        return pd.DataFrame({v: vista[k].ravel() for k, v in enumerate(_VARIABLES)}, index=indice)
+    
+    def atribucion_roe(self, ultimo: bool = False) -> pd.DataFrame:
+        """
+        Atribución de la variación del ROE entre períodos consecutivos
+        
+        Parameters:
+        -----------
+        ultimo : bool
+            Si True, sólo la variación del último período cargado (lo que
+            se necesita tras cada cierre)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Indexado por (empresa, periodo), con roe_anterior, roe,
+            variacion_roe, la contribución de cada factor (suman
+            variacion_roe) y 'logaritmica' (False donde se usó Shapley)
+        """
+        if len(self._periodos) < 2:
+            raise ValueError("Se necesitan al menos dos períodos para atribuir variaciones")
+        
+        factores = self._vista()[:len(FACTORES_DUPONT)]
+        desde = len(self._periodos) - 1 if ultimo else 1
+        anterior = factores[:, :, desde - 1:-1]
+        actual = factores[:, :, desde:]
+        
+        resultado = _atribuir(anterior.reshape(len(FACTORES_DUPONT), -1),
+                              actual.reshape(len(FACTORES_DUPONT), -1))
+        indice = pd.MultiIndex.from_product([self._empresas, self._periodos[desde:]],
+                                            names=INDICE_PANEL)
+        return pd.DataFrame(resultado, index=indice)
+
+
+if __name__ == "__main__":
+    import time
+    
+    print("=== TESTING MÓDULO SERIES TEMPORALES DUPONT ===")
+    
+    rng = np.random.default_rng(0)
+    empresas = [f'EMP{i:04d}' for i in range(5000)]
+    periodos = [f'2024-{m:02d}' for m in range(1, 13)]
+    n = len(empresas) * len(periodos)
+    estados = pd.DataFrame({
+        'resultado_neto': rng.uniform(-20, 80, n),
+        'ventas': rng.uniform(500, 1500, n),
+        'activo_total': rng.uniform(1000, 3000, n),
+        'patrimonio_neto': rng.uniform(400, 1500, n),
+    }, index=pd.MultiIndex.from_product([empresas, periodos], names=INDICE_PANEL))
+    
+    serie = SerieDupont.desde_panel(estados)
+    print(serie)
+    
+    cierre = estados.xs('2024-12', level='periodo') * rng.uniform(0.9, 1.1, (len(empresas), 4))
+    inicio = time.perf_counter()
+    serie.agregar_periodo('2025-01', cierre)
+    atribucion = serie.atribucion_roe(ultimo=True)
+    print(f"Cierre mensual + atribución: {(time.perf_counter() - inicio) * 1000:.1f}ms")
+    print(atribucion.head().round(4))
+    
+    residuo = atribucion[FACTORES_DUPONT].sum(axis=1) - atribucion['variacion_roe']
+    print(f"\nMáximo residuo de la atribución: {residuo.abs().max():.2e}")
+    print(f"Filas con descomposición logarítmica: {atribucion['logaritmica'].mean():.1%}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,369 @@
+"""
+Módulo de Ingesta de Estados Financieros - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo lee archivos grandes de estados financieros (CSV de varios GB o
+planillas XLSX) por bloques, normaliza los nombres de las cuentas a los campos
+que usan las funciones de ratios y pasa cada bloque directamente al cálculo de
+ratios por panel. La memoria máxima depende del tamaño del bloque y no del
+tamaño del archivo.
+
+Se aceptan dos disposiciones de archivo:
+- Formato ancho: una fila por (empresa, periodo) y una columna por cuenta
+- Formato largo: columnas empresa, periodo, cuenta y valor. Las filas de una
+  misma (empresa, periodo) deben estar contiguas (archivo ordenado o agrupado
+  por empresa y período), como en los extractos contables habituales.
+"""
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import (INDICE_PANEL, CAMPOS_RATIOS, CAMPOS_OPCIONALES, FAMILIAS_RATIOS,
+                                 preparar_panel, calcular_ratios_panel)
+
+# Filas por bloque por defecto
+TAMAÑO_BLOQUE = 100_000
+
+# Nombres alternativos de cada campo (se comparan normalizados: minúsculas,
+# sin acentos y con '_' en lugar de espacios y signos)
+ALIAS_CUENTAS = {
+    'activo_corriente': ['activo corriente', 'total activo corriente', 'current assets',
+                         'total current assets'],
+    'pasivo_corriente': ['pasivo corriente', 'total pasivo corriente', 'current liabilities',
+                         'total current liabilities'],
+    'inventarios': ['inventario', 'bienes de cambio', 'existencias', 'inventories'],
+    'efectivo': ['efectivo y equivalentes', 'efectivo y equivalentes de efectivo',
+                 'caja y bancos', 'disponibilidades', 'cash', 'cash and equivalents'],
+    'inversiones_temporales': ['inversiones corrientes', 'inversiones de corto plazo',
+                               'short term investments'],
+    'cuentas_por_cobrar': ['cuentas por cobrar comerciales', 'creditos por ventas',
+                           'deudores por ventas', 'accounts receivable'],
+    'cuentas_por_pagar': ['cuentas por pagar comerciales', 'deudas comerciales', 'proveedores',
+                          'accounts payable'],
+    'ventas': ['ventas netas', 'ingresos por ventas', 'ingresos de actividades ordinarias',
+               'revenue', 'net sales'],
+    'costo_ventas': ['costo de ventas', 'costo de mercaderias vendidas',
+                     'costo de los bienes vendidos', 'cmv', 'cost of sales', 'cogs'],
+    'activo_total': ['total activo', 'total del activo', 'total assets'],
+    'activo_fijo': ['propiedades planta y equipo', 'bienes de uso', 'ppe',
+                    'property plant and equipment'],
+    'activo_operativo': ['activos operativos'],
+    'pasivo_total': ['total pasivo', 'total del pasivo', 'total liabilities'],
+    'pasivo_no_corriente': ['total pasivo no corriente', 'non current liabilities'],
+    'patrimonio_neto': ['total patrimonio neto', 'patrimonio', 'total equity', 'equity'],
+    'gastos_financieros': ['intereses', 'intereses pagados', 'costos financieros',
+                           'interest expense'],
+    'resultado_operativo': ['ebit', 'resultado operativo', 'utilidad operativa',
+                            'operating income'],
+    'resultado_neto': ['resultado del ejercicio', 'utilidad neta', 'ganancia neta',
+                       'net income'],
+    'utilidades_retenidas': ['resultados no asignados', 'resultados acumulados',
+                             'retained earnings'],
+    'capital_trabajo': ['capital de trabajo', 'working capital'],
+    'valor_mercado_capital': ['capitalizacion bursatil', 'valor de mercado del capital',
+                              'market cap'],
+}
+
+# Nombres alternativos de las columnas de identificación del formato largo
+ALIAS_COLUMNAS = {
+    'empresa': ['compania', 'razon social', 'emisora', 'company', 'ticker'],
+    'periodo': ['ejercicio', 'fecha', 'fecha de cierre', 'period'],
+    'cuenta': ['concepto', 'rubro', 'account'],
+    'valor': ['importe', 'monto', 'saldo', 'value', 'amount'],
+}
+
+def normalizar_nombre(nombre) -> str:
+    """
+    Normaliza un nombre de cuenta o columna: minúsculas, sin acentos y con
+    '_' en lugar de espacios y signos
+    
+    >>> normalizar_nombre('Propiedades, Planta y Equipo')
+    'propiedades_planta_y_equipo'
+    """
+    texto = unicodedata.normalize('NFKD', str(nombre)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+
+def _armar_mapa(alias: Dict[str, List[str]]) -> Dict[str, str]:
+    mapa = {}
+    for campo, nombres in alias.items():
+        for nombre in [campo] + list(nombres):
+            mapa[normalizar_nombre(nombre)] = campo
+    return mapa
+
+_MAPA_CUENTAS = _armar_mapa(ALIAS_CUENTAS)
+_MAPA_COLUMNAS = _armar_mapa(ALIAS_COLUMNAS)
+
+def normalizar_cuentas(nombres, alias: Optional[Dict[str, List[str]]] = None) -> pd.Series:
+    """
+    Traduce nombres de cuentas a los campos de las funciones de ratios
+    
+    Parameters:
+    -----------
+    nombres : array_like
+        Nombres de cuentas tal como vienen en el archivo
+    alias : Dict[str, List[str]], optional
+        Alias adicionales (campo -> nombres), que se suman a ALIAS_CUENTAS
+    
+    Returns:
+    --------
+    pd.Series
+        Campo normalizado de cada nombre (NaN si la cuenta no se reconoce)
+    """
+    mapa = _MAPA_CUENTAS if alias is None else {**_MAPA_CUENTAS, **_armar_mapa(alias)}
+    nombres = pd.Series(nombres)
+    # Se normaliza una vez cada nombre distinto y luego se mapea el bloque entero
+    unicos = pd.unique(nombres)
+    traduccion = {n: mapa.get(normalizar_nombre(n)) for n in unicos}
+    return nombres.map(traduccion)
+
+def _normalizar_columnas(bloque: pd.DataFrame, mapa: Dict[str, str]) -> pd.DataFrame:
+    """Renombra columnas de identificación y de cuentas a sus campos"""
+    renombres = {}
+    for columna in bloque.columns:
+        clave = normalizar_nombre(columna)
+        renombres[columna] = _MAPA_COLUMNAS.get(clave) or mapa.get(clave) or columna
+    return bloque.rename(columns=renombres)
+
+def _es_largo(columnas) -> bool:
+    return {'cuenta', 'valor'}.issubset(columnas)
+
+def _panel_de_bloque(bloque: pd.DataFrame, largo: bool,
+                     alias: Optional[Dict[str, List[str]]]) -> pd.DataFrame:
+    """Convierte un bloque ya renombrado en un panel ancho de campos conocidos"""
+    if largo:
+        cuentas = normalizar_cuentas(bloque['cuenta'].to_numpy(), alias)
+        bloque = pd.DataFrame({'empresa': bloque['empresa'].to_numpy(),
+                               'periodo': bloque['periodo'].to_numpy(),
+                               'cuenta': cuentas.to_numpy(),
+                               'valor': pd.to_numeric(bloque['valor'], errors='coerce').to_numpy()})
+        bloque = bloque.dropna(subset=['cuenta'])
+        # Si una cuenta se repite para la misma clave se conserva el último valor
+        bloque = bloque.drop_duplicates(INDICE_PANEL + ['cuenta'], keep='last')
+        return preparar_panel(bloque, 'largo')
+    
+    conocidas = [c for c in bloque.columns if c in ALIAS_CUENTAS or
+                 (alias is not None and c in alias)]
+    datos = bloque[INDICE_PANEL + conocidas].copy()
+    datos[conocidas] = datos[conocidas].apply(pd.to_numeric, errors='coerce')
+    return preparar_panel(datos, 'ancho')
+
+def _paneles(bloques: Iterator[pd.DataFrame], formato: str,
+             alias: Optional[Dict[str, List[str]]]) -> Iterator[pd.DataFrame]:
+    """
+    Normaliza una secuencia de bloques crudos. En formato largo, las filas de
+    la última (empresa, periodo) de cada bloque se retienen y se agregan al
+    bloque siguiente, porque pueden continuar en él
+    """
+    mapa = _MAPA_CUENTAS if alias is None else {**_MAPA_CUENTAS, **_armar_mapa(alias)}
+    pendiente = None
+    largo = None
+    for bloque in bloques:
+        bloque = _normalizar_columnas(bloque, mapa)
+        if largo is None:
+            largo = _es_largo(bloque.columns) if formato == 'auto' else formato == 'largo'
+            faltantes = [c for c in INDICE_PANEL if c not in bloque.columns]
+            if faltantes:
+                raise KeyError(f"El archivo no tiene las columnas {faltantes}")
+        if not largo:
+            if len(bloque):
+                yield _panel_de_bloque(bloque, False, alias)
+            continue
+        
+        if pendiente is not None:
+            bloque = pd.concat([pendiente, bloque], ignore_index=True)
+        if bloque.empty:
+            continue
+        ultima = (bloque['empresa'].to_numpy() == bloque['empresa'].iat[-1]) & \
+                 (bloque['periodo'].to_numpy() == bloque['periodo'].iat[-1])
+        pendiente = bloque[ultima]
+        completo = bloque[~ultima]
+        if len(completo):
+            yield _panel_de_bloque(completo, True, alias)
+    
+    if pendiente is not None and len(pendiente):
+        yield _panel_de_bloque(pendiente, True, alias)
+
+def _bloques_xlsx(ruta, hoja: Optional[str], tamaño_bloque: int) -> Iterator[pd.DataFrame]:
+    """Lee una hoja XLSX en modo sólo lectura, de a `tamaño_bloque` filas"""
+    from openpyxl import load_workbook
+    
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_activa = libro[hoja] if hoja is not None else libro.worksheets[0]
+        filas = hoja_activa.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        columnas = [c if c is not None else f'columna_{i}' for i, c in enumerate(encabezado)]
+        acumuladas = []
+        for fila in filas:
+            if all(v is None for v in fila):
+                continue
+            acumuladas.append(fila)
+            if len(acumuladas) >= tamaño_bloque:
+                yield pd.DataFrame(acumuladas, columns=columnas)
+                acumuladas = []
+        if acumuladas:
+            yield pd.DataFrame(acumuladas, columns=columnas)
+    finally:
+        libro.close()
+
+def leer_estados_por_bloques(ruta, tamaño_bloque: int = TAMAÑO_BLOQUE, formato: str = 'auto',
+                             hoja: Optional[str] = None,
+                             alias: Optional[Dict[str, List[str]]] = None,
+                             **opciones_csv) -> Iterator[pd.DataFrame]:
+    """
+    Lee un archivo de estados financieros por bloques y devuelve paneles
+    normalizados
+    
+    Parameters:
+    -----------
+    ruta : str o Path
+        Archivo .csv (o .txt) o .xlsx
+    tamaño_bloque : int
+        Filas del archivo por bloque
+    formato : str
+        'auto', 'largo' o 'ancho'
+    hoja : str, optional
+        Hoja a leer en archivos XLSX (por defecto la primera)
+    alias : Dict[str, List[str]], optional
+        Alias de cuentas adicionales (campo -> nombres)
+    **opciones_csv
+        Se pasan a `pd.read_csv` (ej: sep=';', decimal=',', thousands='.',
+        encoding='latin-1')
+    
+    Returns:
+    --------
+    Iterator[pd.DataFrame]
+        Paneles anchos indexados por (empresa, periodo) con los campos
+        reconocidos como columnas float64
+    """
+    ruta = Path(ruta)
+    if ruta.suffix.lower() in ('.xlsx', '.xlsm'):
+        bloques = _bloques_xlsx(ruta, hoja, tamaño_bloque)
+    else:
+        bloques = pd.read_csv(ruta, chunksize=tamaño_bloque, **opciones_csv)
+    return _paneles(bloques, formato, alias)
+
+def ratios_por_bloques(ruta, familias: Optional[List[str]] = None,
+                       tamaño_bloque: int = TAMAÑO_BLOQUE, formato: str = 'auto',
+                       dias_año: int = 365, **opciones) -> Iterator[pd.DataFrame]:
+    """
+    Calcula los ratios de un archivo bloque por bloque
+    
+    Las cuentas obligatorias de cada familia se verifican una sola vez contra
+    el primer bloque (en formato ancho, el encabezado del archivo). Después,
+    cada bloque se completa con NaN en las cuentas que no trae, porque en
+    formato largo un bloque puede no tener ninguna fila de alguna cuenta. Los
+    ratios que usan una cuenta faltante quedan en NaN (ver `_dividir`).
+    
+    Parameters:
+    -----------
+    ruta : str o Path
+        Archivo .csv o .xlsx
+    familias : List[str], optional
+        Familias de ratios (por defecto todas)
+    tamaño_bloque : int
+        Filas del archivo por bloque
+    formato : str
+        'auto', 'largo' o 'ancho'
+    dias_año : int
+        Días del año para los ratios de actividad
+    **opciones
+        hoja, alias y opciones de `pd.read_csv` (ver `leer_estados_por_bloques`)
+    
+    Returns:
+    --------
+    Iterator[pd.DataFrame]
+        Ratios de cada bloque con el formato de `calcular_ratios_panel`
+    
+    Ejemplo:
+    --------
+    >>> for ratios in ratios_por_bloques('estados_2024.csv', ['liquidez'], sep=';'):
+    ...     alertas = ratios[ratios['liquidez', 'liquidez_corriente'] < 1]
+    """
+    campos = list(dict.fromkeys(campo for familia in (familias or FAMILIAS_RATIOS)
+                                for campo in CAMPOS_RATIOS[familia]))
+    columnas = None
+    for panel in leer_estados_por_bloques(ruta, tamaño_bloque, formato, **opciones):
+        if columnas is None:
+            for familia in (familias or FAMILIAS_RATIOS):
+                faltantes = [c for c in CAMPOS_RATIOS[familia]
+                             if c not in panel.columns and c not in CAMPOS_OPCIONALES]
+                if faltantes:
+                    raise KeyError(f"Faltan cuentas para los ratios de {familia}: {faltantes}")
+            columnas = panel.columns.union(pd.Index(campos), sort=False)
+        yield calcular_ratios_panel(panel.reindex(columns=columnas), familias, 'ancho', dias_año)
+
+def calcular_ratios_archivo(ruta, destino=None, familias: Optional[List[str]] = None,
+                            tamaño_bloque: int = TAMAÑO_BLOQUE, formato: str = 'auto',
+                            **opciones):
+    """
+    Calcula los ratios de todo un archivo
+    
+    Parameters:
+    -----------
+    ruta : str o Path
+        Archivo .csv o .xlsx de estados financieros
+    destino : str o Path, optional
+        CSV donde escribir los ratios a medida que se calculan. Si se omite,
+        se devuelven todos en un DataFrame (que sí ocupa memoria proporcional
+        a la cantidad de estados)
+    familias : List[str], optional
+        Familias de ratios (por defecto todas)
+    tamaño_bloque : int
+        Filas del archivo por bloque
+    formato : str
+        'auto', 'largo' o 'ancho'
+    **opciones
+        hoja, alias, dias_año y opciones de `pd.read_csv`
+    
+    Returns:
+    --------
+    pd.DataFrame o int
+        Los ratios, o la cantidad de filas escritas en `destino`
+    """
+    bloques = ratios_por_bloques(ruta, familias, tamaño_bloque, formato, **opciones)
+    if destino is None:
+        resultados = list(bloques)
+        return pd.concat(resultados) if resultados else pd.DataFrame()
+    
+    filas = 0
+    for i, ratios in enumerate(bloques):
+        plano = ratios.copy()
+        plano.columns = [f'{familia}.{ratio}' for familia, ratio in plano.columns]
+        plano.to_csv(destino, mode='w' if i == 0 else 'a', header=i == 0)
+        filas += len(plano)
+    return filas
+
+if __name__ == "__main__":
+    import tempfile
+    
+    print("=== TESTING MÓDULO INGESTA DE ESTADOS ===")
+    
+    rng = np.random.default_rng(0)
+    cuentas = ['Activo Corriente', 'Pasivo Corriente', 'Bienes de Cambio', 'Caja y Bancos',
+               'Ventas Netas', 'Resultado del Ejercicio', 'Total Activo', 'Patrimonio']
+    empresas = np.repeat([f'EMP{i:03d}' for i in range(250)], 4 * len(cuentas))
+    periodos = np.tile(np.repeat(['2021', '2022', '2023', '2024'], len(cuentas)), 250)
+    largo = pd.DataFrame({'Empresa': empresas, 'Ejercicio': periodos,
+                          'Concepto': np.tile(cuentas, 1000),
+                          'Importe': rng.uniform(100, 1000, len(empresas)).round(2)})
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / 'estados.csv'
+        largo.to_csv(ruta, index=False)
+        
+        # Bloques chicos a propósito: las claves quedan partidas entre bloques
+        por_bloques = calcular_ratios_archivo(ruta, familias=['liquidez'], tamaño_bloque=777)
+        completo = calcular_ratios_archivo(ruta, familias=['liquidez'], tamaño_bloque=10**6)
+        print(f"Estados: {len(por_bloques)} | iguales por bloques y completo: "
+              f"{por_bloques.equals(completo)}")
+        print(por_bloques.head())
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,287 @@
+"""
+Módulo de Ranking entre Pares - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo compara cada empresa con las demás de su industria para todos los
+ratios de un panel (por ejemplo el de `calcular_ratios_panel`):
+
+- percentil de cada ratio dentro de la industria
+- z-score respecto de la media y el desvío de los pares
+- mejores y peores k empresas de cada industria, con `np.argpartition`
+  (sin ordenar la industria completa)
+- umbrales por industria (cuartiles) en el formato de BENCHMARKS_INDUSTRIA,
+  listos para `compilar_benchmarks` y `clasificar_ratios_panel`
+
+Las estadísticas de todas las industrias y ratios se calculan juntas: cada
+pasada (sumas y desvíos al cuadrado) es un único `np.bincount` sobre las
+celdas (industria, ratio) de todo el panel.
+Los valores infinitos (por ejemplo liquidez con pasivo corriente cero) no
+entran en medias, desvíos, percentiles ni rankings.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import RATIOS_INVERSOS
+
+# Cuantiles con los que se arman los umbrales por industria (3 umbrales -> 4 bandas)
+CUANTILES_BENCHMARK = (0.25, 0.50, 0.75)
+
+class RankingPares:
+    """
+    Percentiles, z-scores y rankings de un panel de ratios por industria
+    
+    Parameters:
+    -----------
+    ratios : pd.DataFrame
+        Panel de ratios (columnas simples o (familia, ratio)); una fila por
+        empresa o por (empresa, periodo)
+    industrias : pd.Series, array_like o str
+        Industria de cada fila: una Series indexada por empresa, un arreglo
+        alineado con las filas o el nombre de un nivel del índice. Las filas
+        sin industria quedan fuera de las comparaciones.
+    
+    Ejemplo:
+    --------
+    >>> ranking = RankingPares(calcular_ratios_panel(estados), sectores)
+    >>> ranking.percentiles['rentabilidad', 'roe']
+    >>> ranking.top('roe', k=10)
+    >>> ranking.perfil('YPF')
+    """
+    
+    def __init__(self, ratios: pd.DataFrame, industrias):
+        self.ratios = ratios
+        self.industrias = self._alinear_industrias(ratios, industrias)
+        codigos, self.categorias = pd.factorize(self.industrias)
+        self._codigos = codigos
+        self._valores = ratios.to_numpy(dtype=float)
+        
+        # Filas de cada industria contiguas: un solo ordenamiento para todos los rankings
+        validos = codigos >= 0
+        self._orden = np.flatnonzero(validos)[np.argsort(codigos[validos], kind='stable')]
+        self._limites = np.concatenate([[0], np.cumsum(np.bincount(codigos[validos],
+                                                                   minlength=len(self.categorias)))])
+        
+        self._calcular_estadisticas()
+        self._percentiles = None
+    
+    @staticmethod
+    def _alinear_industrias(ratios: pd.DataFrame, industrias) -> pd.Series:
+        """Industria de cada fila del panel"""
+        if isinstance(industrias, str):
+            return pd.Series(ratios.index.get_level_values(industrias), index=ratios.index,
+                             name='industria')
+        if isinstance(industrias, pd.Series) and not industrias.index.equals(ratios.index):
+            empresas = (ratios.index.get_level_values('empresa')
+                        if isinstance(ratios.index, pd.MultiIndex) else ratios.index)
+            return pd.Series(industrias.reindex(empresas).to_numpy(), index=ratios.index,
+                             name='industria')
+        return pd.Series(np.asarray(industrias), index=ratios.index, name='industria')
+    
+    def _calcular_estadisticas(self):
+        """Cantidad, media y desvío por (industria, ratio) con dos bincount"""
+        n_industrias, n_ratios = len(self.categorias), self._valores.shape[1]
+        usables = np.isfinite(self._valores) & (self._codigos >= 0)[:, None]
+        celdas = (self._codigos[:, None] * n_ratios + np.arange(n_ratios))[usables]
+        tamaño = n_industrias * n_ratios
+        
+        cantidad = np.bincount(celdas, minlength=tamaño).reshape(n_industrias, n_ratios)
+        suma = np.bincount(celdas, weights=self._valores[usables], minlength=tamaño)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            media = suma.reshape(n_industrias, n_ratios) / cantidad
+            # Segunda pasada sobre los desvíos (más estable que sumar cuadrados)
+            desvios = np.where(usables, self._valores - media[np.maximum(self._codigos, 0)], np.nan)
+            suma_cuadrados = np.bincount(celdas, weights=desvios[usables] ** 2, minlength=tamaño)
+            desvio = np.sqrt(suma_cuadrados.reshape(n_industrias, n_ratios) / (cantidad - 1))
+            z = desvios / desvio[np.maximum(self._codigos, 0)]
+        
+        self._cantidad, self._media, self._desvio = cantidad, media, desvio
+        self._z = np.where(np.isfinite(z), z, np.nan)
+    
+    def _tabla(self, valores: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(valores, index=self.ratios.index, columns=self.ratios.columns)
+    
+    def _estadistica(self, valores: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(valores, index=pd.Index(self.categorias, name='industria'),
+                            columns=self.ratios.columns)
+    
+    def _columna(self, ratio) -> int:
+        """Posición de un ratio, por nombre completo o sólo por el nombre del ratio"""
+        columnas = self.ratios.columns
+        if ratio in columnas and not isinstance(columnas, pd.MultiIndex):
+            return columnas.get_loc(ratio)
+        for j, columna in enumerate(columnas):
+            if columna == ratio or (isinstance(columna, tuple) and columna[-1] == ratio):
+                return j
+        raise KeyError(f"Ratio no encontrado en el panel: {ratio}")
+    
+    @property
+    def percentiles(self) -> pd.DataFrame:
+        """
+        Percentil (0-1] de cada ratio dentro de su industria, donde 1 es el
+        mejor valor con el mismo criterio que `top`: el más alto, salvo en los
+        ratios de RATIOS_INVERSOS, donde es el más bajo. Los empates reciben
+        el rango promedio y los valores no finitos quedan en NaN. Se calcula
+        la primera vez que se pide.
+        """
+        if self._percentiles is None:
+            signos = np.array([-1.0 if (c[-1] if isinstance(c, tuple) else c) in RATIOS_INVERSOS
+                               else 1.0 for c in self.ratios.columns])
+            finitos = np.where(np.isfinite(self._valores), self._valores * signos, np.nan)
+            orientados = pd.DataFrame(finitos, index=self.ratios.index, columns=self.ratios.columns)
+            self._percentiles = orientados.groupby(self.industrias.to_numpy(), sort=False).rank(pct=True)
+        return self._percentiles
+    
+    @property
+    def z_scores(self) -> pd.DataFrame:
+        """(valor - media de la industria) / desvío de la industria"""
+        return self._tabla(self._z)
+    
+    def estadisticas(self) -> Dict[str, pd.DataFrame]:
+        """Cantidad de pares, media y desvío por industria y ratio"""
+        return {'cantidad': self._estadistica(self._cantidad),
+                'media': self._estadistica(self._media),
+                'desvio': self._estadistica(self._desvio)}
+    
+    def top(self, ratio, k: int = 10, mejores: bool = True) -> pd.DataFrame:
+        """
+        Las k mejores (o peores) filas de cada industria para un ratio
+        
+        Cada industria se resuelve con `np.argpartition` y sólo se ordenan
+        los k elegidos. "Mejor" es el valor más alto, salvo en los ratios de
+        RATIOS_INVERSOS (endeudamiento), donde es el más bajo. Los valores no
+        finitos no se rankean.
+        
+        Parameters:
+        -----------
+        ratio : str o tuple
+            Nombre del ratio ('roe') o columna completa (('rentabilidad', 'roe'))
+        k : int
+            Cantidad por industria
+        mejores : bool
+            True para los k mejores, False para los k peores
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Indexado por (industria, posicion), con la clave de la fila
+            ('empresa' o 'empresa' y 'periodo'), el valor y el percentil
+        """
+        j = self._columna(ratio)
+        nombre = self.ratios.columns[j]
+        nombre = nombre[-1] if isinstance(nombre, tuple) else nombre
+        descendente = mejores != (nombre in RATIOS_INVERSOS)
+        
+        # Orden deseado = ascendente sobre `clave`; faltantes e infinitos van al final
+        columna = self._valores[self._orden, j]
+        clave = -columna if descendente else columna.copy()
+        clave[~np.isfinite(columna)] = np.inf
+        
+        filas, industrias, posiciones = [], [], []
+        for g in range(len(self.categorias)):
+            inicio, fin = self._limites[g], self._limites[g + 1]
+            tramo = clave[inicio:fin]
+            n = min(k, int(np.count_nonzero(np.isfinite(columna[inicio:fin]))))
+            if n == 0:
+                continue
+            elegidos = np.argpartition(tramo, n - 1)[:n] if n < len(tramo) else np.arange(len(tramo))
+            elegidos = elegidos[np.argsort(tramo[elegidos], kind='stable')][:n]
+            filas.append(self._orden[inicio + elegidos])
+            industrias.append(np.full(n, g))
+            posiciones.append(np.arange(1, n + 1))
+        
+        if not filas:
+            return pd.DataFrame(columns=['valor', 'percentil'])
+        filas = np.concatenate(filas)
+        indice = pd.MultiIndex.from_arrays([self.categorias[np.concatenate(industrias)],
+                                            np.concatenate(posiciones)],
+                                           names=['industria', 'posicion'])
+        resultado = self.ratios.index[filas].to_frame(index=False)
+        resultado.index = indice
+        resultado['valor'] = self._valores[filas, j]
+        resultado['percentil'] = self.percentiles.iloc[filas, j].to_numpy()
+        return resultado
+    
+    def perfil(self, clave) -> pd.DataFrame:
+        """
+        Posición de una fila (empresa o (empresa, periodo)) frente a sus pares,
+        ratio por ratio; pensado para dashboards y reportes individuales
+        """
+        fila = self.ratios.index.get_loc(clave)
+        if not isinstance(fila, (int, np.integer)):
+            raise KeyError(f"La clave {clave!r} no identifica una única fila; "
+                           f"use (empresa, periodo)")
+        g = self._codigos[fila]
+        sin_industria = np.full(len(self.ratios.columns), np.nan)
+        return pd.DataFrame({
+            'valor': self._valores[fila],
+            'percentil': self.percentiles.iloc[fila].to_numpy(),
+            'z_score': self._z[fila],
+            'media_pares': self._media[g] if g >= 0 else sin_industria,
+            'desvio_pares': self._desvio[g] if g >= 0 else sin_industria,
+            'cantidad_pares': self._cantidad[g] if g >= 0 else sin_industria,
+        }, index=self.ratios.columns)
+    
+    def benchmarks_industria(self, cuantiles=CUANTILES_BENCHMARK) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Umbrales de cada industria en el formato de BENCHMARKS_INDUSTRIA
+        
+        Returns:
+        --------
+        Dict[str, Dict[str, Dict[str, float]]]
+            {industria: {ratio: {'p25': ..., 'p50': ..., 'p75': ...}}}; cada
+            dict de industria se puede pasar a `compilar_benchmarks`
+        
+        Ejemplo:
+        --------
+        >>> umbrales = ranking.benchmarks_industria()
+        >>> bandas = compilar_benchmarks(umbrales['Energético'])
+        >>> clasificar_ratios_panel(ratios_energeticas, bandas)
+        """
+        finitos = self.ratios.where(np.isfinite(self._valores))
+        tabla = finitos.groupby(self.industrias.to_numpy(), sort=False).quantile(list(cuantiles))
+        
+        benchmarks = {}
+        for (industria, cuantil), fila in tabla.iterrows():
+            for columna, valor in fila.items():
+                ratio = columna[-1] if isinstance(columna, tuple) else columna
+                if np.isnan(valor):
+                    continue
+                umbrales = benchmarks.setdefault(industria, {}).setdefault(ratio, {})
+                umbrales[f'p{round(cuantil * 100):g}'] = float(valor)
+        # Sólo ratios con todos los umbrales (ratios repetidos en dos familias quedan una vez)
+        return {industria: {r: u for r, u in ratios.items() if len(u) == len(cuantiles)}
+                for industria, ratios in benchmarks.items()}
+
+
+if __name__ == "__main__":
+    import time
+    from analisis_financiero import CAMPOS_RATIOS, calcular_ratios_panel, compilar_benchmarks
+    
+    print("=== TESTING MÓDULO RANKING ENTRE PARES ===")
+    
+    rng = np.random.default_rng(0)
+    n = 100_000
+    campos = sorted(set(sum(CAMPOS_RATIOS.values(), [])))
+    estados = pd.DataFrame({c: rng.uniform(1, 1000, n) for c in campos})
+    estados['empresa'] = [f'EMP{i:06d}' for i in range(n)]
+    estados['periodo'] = '2024'
+    ratios = calcular_ratios_panel(estados)
+    sectores = pd.Series(rng.integers(0, 200, n), index=estados['empresa']).map('IND{:03d}'.format)
+    
+    inicio = time.perf_counter()
+    ranking = RankingPares(ratios, sectores)
+    print(f"Estadísticas de {n} empresas en 200 industrias: {time.perf_counter() - inicio:.2f}s")
+    
+    inicio = time.perf_counter()
+    mejores = ranking.top('roe', k=5)
+    print(f"Top 5 de ROE por industria: {(time.perf_counter() - inicio) * 1000:.1f}ms")
+    print(mejores.head(5))
+    
+    print(ranking.perfil(('EMP000000', '2024')).loc['rentabilidad'].round(3))
+    bandas = compilar_benchmarks(ranking.benchmarks_industria()['IND000'])
+    print(f"\nUmbrales ROE de IND000: {bandas['roe']['bordes'].round(3)}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
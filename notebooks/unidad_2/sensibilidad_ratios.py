@@ -0,0 +1,349 @@
+"""
+Módulo de Sensibilidad de Ratios - UTN La Plata
+Finanzas y Control Empresario
+
+Este módulo evalúa escenarios "qué pasa si" sobre grillas cartesianas
+completas de impulsores (drivers): margen × rotación × apalancamiento para el
+ROE del modelo DuPont, o ventas × costos × deuda alimentando las fórmulas de
+ratios de panel (`calcular_ratios_panel`).
+
+Cada punto de la grilla es una combinación de valores de los ejes. La grilla
+se recorre por bloques de puntos consecutivos (con `np.unravel_index`) y cada
+bloque se evalúa como aritmética de arreglos, de modo que la memoria de
+trabajo depende del tamaño del bloque y no de la cantidad de puntos. Sobre la
+grilla resultante se calculan gráficos tornado (rango de cada impulsor con el
+resto en su valor base) y curvas de equilibrio (valor de un impulsor que
+lleva un ratio a un objetivo, para cada combinación de los demás).
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import calcular_ratios_panel
+
+# Puntos de la grilla evaluados por bloque
+TAMAÑO_BLOQUE = 100_000
+
+# Tasa del impuesto a las ganancias de sociedades usada por defecto
+TASA_IMPUESTO = 0.35
+
+# Factores del modelo DuPont de 3 factores
+FACTORES_DUPONT = ['margen_neto', 'rotacion_activos', 'multiplicador_capital']
+
+def modelo_resultados(tasa_impuesto: float = TASA_IMPUESTO) -> Callable:
+    """
+    Modelo simple que recalcula las cuentas que dependen de los impulsores
+    
+    Todas las cuentas se mueven por diferencia contra la base, de modo que en
+    el punto base los ratios coinciden exactamente con los originales:
+    
+    - resultado_operativo: suma la variación de ventas y resta la de
+      costos_operativos
+    - gastos_financieros, pasivo_corriente y pasivo_no_corriente: se mueven
+      en proporción al pasivo_total (tasa implícita de la base)
+    - activo_total: suma las variaciones de pasivo_total y patrimonio_neto
+    - resultado_neto: suma la variación de (resultado_operativo -
+      gastos_financieros) × (1 - tasa_impuesto)
+    
+    Parameters:
+    -----------
+    tasa_impuesto : float
+        Tasa del impuesto a las ganancias
+    
+    Returns:
+    --------
+    Callable
+        derivar(cuentas, base, impulsores) que completa el dict de cuentas
+        de un bloque; no modifica las cuentas que son ejes de la grilla
+    """
+    def derivar(cuentas: Dict[str, np.ndarray], base: Dict[str, float], impulsores):
+        def variacion(cuenta):
+            return cuentas[cuenta] - base[cuenta] if cuenta in base else 0.0
+        
+        if 'resultado_operativo' in base and 'resultado_operativo' not in impulsores:
+            cuentas['resultado_operativo'] = (base['resultado_operativo'] + variacion('ventas')
+                                              - variacion('costos_operativos'))
+        
+        if base.get('pasivo_total') and 'pasivo_total' in impulsores:
+            escala = cuentas['pasivo_total'] / base['pasivo_total']
+            for cuenta in ('gastos_financieros', 'pasivo_corriente', 'pasivo_no_corriente'):
+                if cuenta in base and cuenta not in impulsores:
+                    cuentas[cuenta] = base[cuenta] * escala
+        
+        if 'activo_total' in base and 'activo_total' not in impulsores:
+            cuentas['activo_total'] = (base['activo_total'] + variacion('pasivo_total')
+                                       + variacion('patrimonio_neto'))
+        
+        if 'resultado_neto' in base and 'resultado_neto' not in impulsores:
+            antes_impuestos = variacion('resultado_operativo') - variacion('gastos_financieros')
+            cuentas['resultado_neto'] = base['resultado_neto'] + antes_impuestos * (1 - tasa_impuesto)
+    
+    return derivar
+
+class GrillaSensibilidad:
+    """
+    Resultado de evaluar ratios sobre una grilla cartesiana de impulsores
+    
+    Atributos:
+    ----------
+    ejes : Dict[str, np.ndarray]
+        Valores de cada eje, en el orden de las dimensiones
+    valores : Dict[str, np.ndarray]
+        Cada métrica como arreglo con una dimensión por eje
+    relativo : bool
+        Si los ejes son variaciones relativas sobre la base (0.10 = +10%)
+    """
+    
+    def __init__(self, ejes: Dict[str, np.ndarray], valores: Dict[str, np.ndarray],
+                 base: Dict[str, float], relativo: bool):
+        self.ejes = ejes
+        self.valores = valores
+        self.base = base
+        self.relativo = relativo
+    
+    def __repr__(self) -> str:
+        forma = ' × '.join(f'{n}[{len(v)}]' for n, v in self.ejes.items())
+        return f"GrillaSensibilidad({forma}, métricas={list(self.valores)})"
+    
+    @property
+    def forma(self):
+        return tuple(len(v) for v in self.ejes.values())
+    
+    def _indice_base(self, eje: str) -> int:
+        """Punto del eje más cercano a la situación base"""
+        referencia = 0.0 if self.relativo else self.base.get(eje, 0.0)
+        return int(np.argmin(np.abs(self.ejes[eje] - referencia)))
+    
+    def a_dataframe(self, metricas: Optional[List[str]] = None) -> pd.DataFrame:
+        """Grilla en formato largo (una fila por punto); para grillas chicas"""
+        metricas = list(self.valores) if metricas is None else metricas
+        indice = pd.MultiIndex.from_product(list(self.ejes.values()), names=list(self.ejes))
+        return pd.DataFrame({m: self.valores[m].ravel() for m in metricas}, index=indice)
+    
+    def tornado(self, metrica: str) -> pd.DataFrame:
+        """
+        Rango de la métrica al mover cada impulsor sobre todo su eje con los
+        demás en el punto base, ordenado de mayor a menor amplitud
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Por impulsor: valor_base, minimo, maximo, amplitud y los valores
+            del eje en que se alcanzan el mínimo y el máximo
+        """
+        valores = self.valores[metrica]
+        base = tuple(self._indice_base(e) for e in self.ejes)
+        filas = {}
+        for d, (eje, puntos) in enumerate(self.ejes.items()):
+            corte = list(base)
+            corte[d] = slice(None)
+            linea = valores[tuple(corte)]
+            finitos = np.where(np.isfinite(linea), linea, np.nan)
+            if np.isnan(finitos).all():
+                continue
+            i_min, i_max = np.nanargmin(finitos), np.nanargmax(finitos)
+            filas[eje] = {'valor_base': valores[base], 'minimo': finitos[i_min],
+                          'maximo': finitos[i_max], 'amplitud': finitos[i_max] - finitos[i_min],
+                          'eje_en_minimo': puntos[i_min], 'eje_en_maximo': puntos[i_max]}
+        tabla = pd.DataFrame.from_dict(filas, orient='index')
+        tabla.index.name = 'impulsor'
+        return tabla.sort_values('amplitud', ascending=False)
+    
+    def punto_equilibrio(self, metrica: str, eje: str, objetivo: float = 0.0) -> pd.Series:
+        """
+        Valor del eje `eje` en que la métrica alcanza `objetivo`, para cada
+        combinación de los demás ejes (interpolación lineal entre puntos de
+        la grilla; se toma el primer cruce). NaN si no hay cruce en el rango.
+        
+        Ejemplo:
+        --------
+        >>> # Variación de ventas que deja el resultado neto en cero, por costos y deuda
+        >>> grilla.punto_equilibrio('margen_neto', 'ventas').unstack()
+        """
+        d = list(self.ejes).index(eje)
+        f = np.moveaxis(self.valores[metrica], d, -1) - objetivo
+        puntos = self.ejes[eje]
+        
+        f0, f1 = f[..., :-1], f[..., 1:]
+        cruces = np.isfinite(f0) & np.isfinite(f1) & (f0 * f1 <= 0) & ((f0 != 0) | (f1 != 0))
+        hay_cruce = cruces.any(axis=-1)
+        i = cruces.argmax(axis=-1)[..., None]
+        a = np.take_along_axis(f0, i, axis=-1)[..., 0]
+        b = np.take_along_axis(f1, i, axis=-1)[..., 0]
+        x0, x1 = puntos[i[..., 0]], puntos[i[..., 0] + 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(a == 0, x0, x0 + (x1 - x0) * a / (a - b))
+        x = np.where(hay_cruce, x, np.nan)
+        
+        otros = [e for e in self.ejes if e != eje]
+        if not otros:
+            return pd.Series([float(x)], name=f'{eje}_equilibrio')
+        indice = pd.MultiIndex.from_product([self.ejes[e] for e in otros], names=otros)
+        return pd.Series(x.ravel(), index=indice, name=f'{eje}_equilibrio')
+
+def _evaluar_por_bloques(ejes: Dict[str, np.ndarray], evaluar: Callable, metricas: List[str],
+                         tamaño_bloque: int) -> Dict[str, np.ndarray]:
+    """
+    Recorre la grilla por bloques de puntos consecutivos; `evaluar` recibe
+    los valores de cada eje en el bloque (arreglos 1-D) y devuelve las métricas
+    """
+    forma = tuple(len(v) for v in ejes.values())
+    total = int(np.prod(forma))
+    salida = {m: np.empty(total) for m in metricas}
+    for inicio in range(0, total, tamaño_bloque):
+        fin = min(inicio + tamaño_bloque, total)
+        indices = np.unravel_index(np.arange(inicio, fin), forma)
+        puntos = {eje: valores[i] for (eje, valores), i in zip(ejes.items(), indices)}
+        resultado = evaluar(puntos)
+        for m in metricas:
+            salida[m][inicio:fin] = resultado[m]
+    return {m: v.reshape(forma) for m, v in salida.items()}
+
+def grilla_dupont(base: Dict[str, float], variaciones: Dict[str, np.ndarray],
+                  tamaño_bloque: int = TAMAÑO_BLOQUE) -> GrillaSensibilidad:
+    """
+    ROE sobre la grilla margen × rotación × multiplicador
+    
+    Parameters:
+    -----------
+    base : Dict[str, float]
+        Factores base (por ejemplo la salida de `analisis_dupont`)
+    variaciones : Dict[str, np.ndarray]
+        Variaciones relativas por factor (0.10 = +10%); los factores que no
+        se indican quedan en su valor base
+    tamaño_bloque : int
+        Puntos evaluados por bloque
+    
+    Returns:
+    --------
+    GrillaSensibilidad
+        Métricas 'roe' y 'variacion_roe' (diferencia contra el ROE base)
+    
+    Ejemplo:
+    --------
+    >>> pasos = np.linspace(-0.2, 0.2, 81)
+    >>> grilla = grilla_dupont(analisis_dupont(rn, ventas, at, pn),
+    ...                        dict.fromkeys(FACTORES_DUPONT, pasos))
+    >>> grilla.tornado('roe')
+    """
+    desconocidos = set(variaciones) - set(FACTORES_DUPONT)
+    if desconocidos:
+        raise ValueError(f"Factores desconocidos: {sorted(desconocidos)}. Opciones: {FACTORES_DUPONT}")
+    ejes = {f: np.asarray(variaciones[f], dtype=float) for f in FACTORES_DUPONT if f in variaciones}
+    roe_base = float(np.prod([base[f] for f in FACTORES_DUPONT]))
+    
+    def evaluar(puntos):
+        roe = np.full(len(next(iter(puntos.values()))), roe_base)
+        for variacion in puntos.values():
+            roe = roe * (1 + variacion)
+        return {'roe': roe, 'variacion_roe': roe - roe_base}
+    
+    valores = _evaluar_por_bloques(ejes, evaluar, ['roe', 'variacion_roe'], tamaño_bloque)
+    return GrillaSensibilidad(ejes, valores, dict(base), relativo=True)
+
+def grilla_sensibilidad(base: Dict[str, float], ejes: Dict[str, np.ndarray],
+                        familias: List[str] = ('rentabilidad', 'endeudamiento'),
+                        metricas: Optional[List[str]] = None, relativo: bool = True,
+                        derivar: Optional[Callable] = None,
+                        tamaño_bloque: int = TAMAÑO_BLOQUE) -> GrillaSensibilidad:
+    """
+    Ratios de panel sobre una grilla cartesiana de cuentas impulsoras
+    
+    Cada punto de la grilla es un estado financiero hipotético: las cuentas
+    de los ejes toman el valor del punto, el resto queda en la base y `derivar`
+    recalcula las cuentas dependientes (resultado operativo y neto, gastos
+    financieros, activo total). Cada bloque de puntos se pasa como un panel a
+    `calcular_ratios_panel`, con las mismas fórmulas que el resto del módulo.
+    
+    Parameters:
+    -----------
+    base : Dict[str, float]
+        Cuentas de la empresa en la situación actual
+    ejes : Dict[str, np.ndarray]
+        Valores de cada cuenta impulsora (p. ej. 'ventas', 'costos_operativos',
+        'pasivo_total')
+    familias : List[str]
+        Familias de ratios a calcular
+    metricas : List[str], optional
+        Ratios a conservar (por defecto todos los de las familias)
+    relativo : bool
+        Si True, los ejes son variaciones relativas sobre la base (0.10 = +10%);
+        si False, valores absolutos de la cuenta
+    derivar : Callable, optional
+        derivar(cuentas, base, impulsores) que completa las cuentas
+        dependientes (por defecto `modelo_resultados()`)
+    tamaño_bloque : int
+        Puntos evaluados por bloque (acota la memoria de trabajo)
+    
+    Returns:
+    --------
+    GrillaSensibilidad
+        Un arreglo por ratio con una dimensión por eje
+    
+    Ejemplo:
+    --------
+    >>> grilla = grilla_sensibilidad(
+    ...     estado, {'ventas': np.linspace(-0.3, 0.3, 121),
+    ...              'costos_operativos': np.linspace(-0.2, 0.2, 81),
+    ...              'pasivo_total': np.linspace(-0.5, 0.5, 41)})
+    >>> grilla.tornado('roe')
+    >>> grilla.punto_equilibrio('roe', 'ventas', objetivo=0.15)
+    """
+    base = {c: float(v) for c, v in base.items()}
+    if 'costos_operativos' in ejes and 'costos_operativos' not in base:
+        base['costos_operativos'] = base['ventas'] - base['resultado_operativo']
+    faltantes = set(ejes) - set(base) if relativo else set()
+    if faltantes:
+        raise KeyError(f"Las cuentas {sorted(faltantes)} no están en la base")
+    derivar = modelo_resultados() if derivar is None else derivar
+    ejes = {c: np.asarray(v, dtype=float) for c, v in ejes.items()}
+    
+    def evaluar(puntos):
+        n = len(next(iter(puntos.values())))
+        cuentas = {c: np.full(n, v) for c, v in base.items()}
+        for cuenta, valores in puntos.items():
+            cuentas[cuenta] = base[cuenta] * (1 + valores) if relativo else valores
+        derivar(cuentas, base, set(puntos))
+        ratios = calcular_ratios_panel(cuentas, list(familias), 'ancho')
+        ratios.columns = ratios.columns.get_level_values('ratio')
+        return ratios.loc[:, ~ratios.columns.duplicated()]
+    
+    if metricas is None:
+        muestra = evaluar({c: v[:1] for c, v in ejes.items()})
+        metricas = list(muestra.columns)
+    
+    valores = _evaluar_por_bloques(ejes, lambda p: {m: c.to_numpy() for m, c in evaluar(p).items()},
+                                   metricas, tamaño_bloque)
+    return GrillaSensibilidad(ejes, valores, base, relativo)
+
+
+if __name__ == "__main__":
+    import time
+    from analisis_financiero import analisis_dupont
+    
+    print("=== TESTING MÓDULO SENSIBILIDAD DE RATIOS ===")
+    
+    estado = {'ventas': 1000.0, 'resultado_operativo': 150.0, 'resultado_neto': 80.0,
+              'activo_total': 1200.0, 'patrimonio_neto': 500.0, 'pasivo_total': 700.0,
+              'pasivo_corriente': 300.0, 'pasivo_no_corriente': 400.0, 'gastos_financieros': 40.0}
+    
+    pasos = np.linspace(-0.2, 0.2, 81)
+    dupont = analisis_dupont(80.0, 1000.0, 1200.0, 500.0)
+    grilla = grilla_dupont(dupont, dict.fromkeys(FACTORES_DUPONT, pasos))
+    print(grilla)
+    print(grilla.tornado('roe').round(4))
+    
+    inicio = time.perf_counter()
+    grilla = grilla_sensibilidad(estado, {'ventas': np.linspace(-0.3, 0.3, 121),
+                                          'costos_operativos': np.linspace(-0.2, 0.2, 81),
+                                          'pasivo_total': np.linspace(-0.5, 0.5, 41)})
+    print(f"\n{grilla}\n{np.prod(grilla.forma)} puntos en {time.perf_counter() - inicio:.2f}s")
+    print(grilla.tornado('roe').round(4))
+    
+    equilibrio = grilla.punto_equilibrio('margen_neto', 'ventas')
+    print("\nVariación de ventas que anula el resultado neto (deuda actual):")
+    print(equilibrio.xs(0.0, level='pasivo_total').iloc[::20].round(4))
+    
+    print("\n✅ Todos los tests completados exitosamente")
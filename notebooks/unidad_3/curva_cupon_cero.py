@@ -0,0 +1,318 @@
+"""
+Módulo de Curva Cupón Cero
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo construye una curva de tasas cupón cero a partir de bonos
+cotizados (bootstrapping), la interpola (lineal en el logaritmo del factor
+de descuento o cúbica monótona) y valúa cualquier bono descontando cada flujo
+con el factor de descuento de su plazo.
+
+Los factores de descuento se precalculan sobre una grilla densa de plazos y se
+consultan con `np.searchsorted`, de modo que revaluar miles de bonos después
+de actualizar la curva cuesta una sola pasada de interpolación.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import PchipInterpolator
+from scipy.optimize import brentq
+
+from valuacion_bonos import metricas_bono
+
+
+METODOS_INTERPOLACION = ('lineal_log', 'cubica_monotona')
+
+# Paso por defecto de la grilla densa de plazos (un día, en años)
+PASO_GRILLA = 1 / 365
+
+
+def _interpolador(tiempos, log_factores, metodo):
+    """Devuelve una función t -> log(factor de descuento) sobre los nodos."""
+    if metodo == 'lineal_log':
+        return lambda t: np.interp(t, tiempos, log_factores)
+    if metodo == 'cubica_monotona':
+        return PchipInterpolator(tiempos, log_factores, extrapolate=True)
+    raise ValueError(f"Método debe ser uno de {METODOS_INTERPOLACION}")
+
+
+def flujos_planos(valor_nominal, tasa_cupon, años_vencimiento, frecuencia=1):
+    """
+    Empaqueta los flujos de muchos bonos bullet en arreglos planos.
+    
+    Parámetros:
+    -----------
+    valor_nominal, tasa_cupon, años_vencimiento, frecuencia : float o array_like
+        Características de los bonos (se combinan con broadcasting)
+    
+    Retorna:
+    --------
+    tuple
+        (bono, tiempos, montos): índice del bono de cada flujo, plazo en años
+        y monto del flujo
+    """
+    valor_nominal, tasa_cupon, años_vencimiento, frecuencia = (
+        a.ravel() for a in np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in
+              (valor_nominal, tasa_cupon, años_vencimiento, frecuencia))))
+    num_periodos = np.rint(años_vencimiento * frecuencia).astype(np.int64)
+    if np.any(num_periodos <= 0):
+        raise ValueError("Los períodos deben ser positivos")
+    
+    bono = np.repeat(np.arange(len(num_periodos)), num_periodos)
+    inicio = np.concatenate([[0], np.cumsum(num_periodos)[:-1]])
+    periodo = np.arange(len(bono)) - np.repeat(inicio, num_periodos) + 1
+    
+    tiempos = periodo / frecuencia[bono]
+    montos = (tasa_cupon * valor_nominal / frecuencia)[bono]
+    montos = montos + np.where(periodo == num_periodos[bono], valor_nominal[bono], 0.0)
+    return bono, tiempos, montos
+
+
+class CurvaCuponCero:
+    """
+    Curva de factores de descuento cupón cero.
+    
+    Los nodos (plazo, factor de descuento) se interpolan una vez sobre una
+    grilla densa de plazos; las consultas posteriores usan `searchsorted` e
+    interpolación lineal entre puntos de la grilla. Más allá del último nodo
+    se extrapola con la tasa forward del último tramo.
+    
+    Atributos:
+    ----------
+    tiempos : np.ndarray
+        Plazos de los nodos en años (incluye el nodo 0 con factor 1)
+    factores : np.ndarray
+        Factores de descuento de los nodos
+    metodo : str
+        'lineal_log' o 'cubica_monotona'
+    """
+    
+    def __init__(self, tiempos, factores, metodo='lineal_log', paso_grilla=PASO_GRILLA):
+        tiempos = np.asarray(tiempos, dtype=float)
+        factores = np.asarray(factores, dtype=float)
+        if np.any(factores <= 0):
+            raise ValueError("Los factores de descuento deben ser positivos")
+        if tiempos[0] != 0:
+            tiempos = np.concatenate([[0.0], tiempos])
+            factores = np.concatenate([[1.0], factores])
+        if np.any(np.diff(tiempos) <= 0):
+            raise ValueError("Los plazos de los nodos deben ser distintos y crecientes")
+        
+        self.tiempos = tiempos
+        self.factores = factores
+        self.metodo = metodo
+        
+        # Grilla densa de log-factores de descuento (incluye los nodos)
+        log_factores = _interpolador(tiempos, np.log(factores), metodo)
+        self._grilla = np.union1d(np.arange(0.0, tiempos[-1], paso_grilla), tiempos)
+        self._log_fd_grilla = np.asarray(log_factores(self._grilla), dtype=float)
+        self._forward_final = ((self._log_fd_grilla[-2] - self._log_fd_grilla[-1])
+                               / (self._grilla[-1] - self._grilla[-2]))
+    
+    def __repr__(self):
+        return (f"CurvaCuponCero({len(self.tiempos) - 1} nodos, hasta {self.tiempos[-1]:.2f} años, "
+                f"{self.metodo})")
+    
+    def log_factor_descuento(self, t):
+        """Logaritmo del factor de descuento para plazos t (en años)."""
+        t = np.asarray(t, dtype=float)
+        grilla, log_fd = self._grilla, self._log_fd_grilla
+        i = np.clip(np.searchsorted(grilla, t, side='right') - 1, 0, len(grilla) - 2)
+        peso = (t - grilla[i]) / (grilla[i + 1] - grilla[i])
+        resultado = log_fd[i] + peso * (log_fd[i + 1] - log_fd[i])
+        # Extrapolación con forward constante más allá del último nodo
+        return np.where(t > grilla[-1], log_fd[-1] - self._forward_final * (t - grilla[-1]),
+                        resultado)
+    
+    def factor_descuento(self, t):
+        """Factor de descuento para plazos t (en años)."""
+        return np.exp(self.log_factor_descuento(t))
+    
+    def tasa_cero(self, t, capitalizacion='efectiva'):
+        """
+        Tasa cupón cero para plazos t.
+        
+        Parámetros:
+        -----------
+        t : float o array_like
+            Plazos en años (mayores a cero)
+        capitalizacion : str
+            'efectiva' (anual) o 'continua'
+        """
+        t = np.asarray(t, dtype=float)
+        tasa_continua = -self.log_factor_descuento(t) / t
+        if capitalizacion == 'continua':
+            return tasa_continua
+        return np.expm1(tasa_continua)
+    
+    def tasa_forward(self, t1, t2):
+        """Tasa forward efectiva anual entre los plazos t1 y t2."""
+        t1 = np.asarray(t1, dtype=float)
+        t2 = np.asarray(t2, dtype=float)
+        diferencia = self.log_factor_descuento(t1) - self.log_factor_descuento(t2)
+        return np.expm1(diferencia / (t2 - t1))
+    
+    def precio_bonos(self, valor_nominal, tasa_cupon, años_vencimiento, frecuencia=1):
+        """
+        Precio de uno o muchos bonos bullet descontados con la curva.
+        
+        Todos los flujos de todos los bonos se evalúan en una sola consulta a
+        la grilla y se suman por bono con `np.bincount`.
+        
+        Retorna:
+        --------
+        np.ndarray
+            Precio de cada bono
+        """
+        bono, tiempos, montos = flujos_planos(valor_nominal, tasa_cupon,
+                                              años_vencimiento, frecuencia)
+        return np.bincount(bono, weights=montos * self.factor_descuento(tiempos),
+                           minlength=bono[-1] + 1 if len(bono) else 0)
+    
+    def precio_cartera(self, cartera):
+        """Precio de cada bono de una `CarteraBonos` descontado con la curva."""
+        return self.precio_bonos(cartera.valor_nominal, cartera.tasa_cupon,
+                                 cartera.años_vencimiento, cartera.frecuencia)
+    
+    def precio_cronogramas(self, cronogramas, fecha_valuacion):
+        """
+        Precio de instrumentos con flujos fechados (`CarteraCronogramas`),
+        descontando los flujos posteriores a `fecha_valuacion`.
+        """
+        fecha = np.datetime64(pd.Timestamp(fecha_valuacion), 'D')
+        tiempos = (cronogramas.fechas - fecha).astype(float) / 365.0
+        pendientes = tiempos > 0
+        valores = cronogramas.montos[pendientes] * self.factor_descuento(tiempos[pendientes])
+        return np.bincount(cronogramas.instrumento[pendientes], weights=valores,
+                           minlength=len(cronogramas))
+    
+    def a_dataframe(self):
+        """Nodos de la curva con factores de descuento y tasas cero."""
+        t = self.tiempos[1:]
+        return pd.DataFrame({'factor_descuento': self.factores[1:],
+                             'tasa_cero': self.tasa_cero(t)},
+                            index=pd.Index(t, name='plazo'))
+
+
+def bootstrap_curva(valor_nominal, tasa_cupon, años_vencimiento, frecuencia=1,
+                    precios=None, rendimientos=None, metodo='lineal_log',
+                    paso_grilla=PASO_GRILLA, tol=1e-10, max_pasadas=50):
+    """
+    Construye una curva cupón cero a partir de bonos cotizados (bootstrapping).
+    
+    Los bonos se ordenan por vencimiento y cada uno agrega un nodo en su fecha
+    de vencimiento: el factor de descuento de ese nodo es el que hace que el
+    valor actual de todos sus flujos, descontados con la curva interpolada,
+    iguale el precio observado. Con interpolación cúbica monótona cada nodo
+    modifica los tramos vecinos, por lo que se repiten pasadas hasta que todos
+    los bonos se revalúan a su precio.
+    
+    Parámetros:
+    -----------
+    valor_nominal, tasa_cupon, años_vencimiento, frecuencia : array_like
+        Características de los bonos de referencia (un vencimiento distinto por bono)
+    precios : array_like, optional
+        Precios de mercado de los bonos
+    rendimientos : array_like, optional
+        YTM de los bonos; si no se indican precios, se calculan con `metricas_bono`
+    metodo : str, default='lineal_log'
+        'lineal_log' (lineal en log del factor de descuento) o 'cubica_monotona'
+    paso_grilla : float
+        Paso de la grilla densa de plazos, en años
+    tol : float
+        Tolerancia relativa de precio en la revaluación de los bonos de entrada
+    max_pasadas : int
+        Máximo de pasadas para la interpolación cúbica; si se agotan sin
+        alcanzar `tol` se lanza RuntimeError
+    
+    Retorna:
+    --------
+    CurvaCuponCero
+        Curva con un nodo por bono de referencia
+    
+    Ejemplo:
+    --------
+    >>> curva = bootstrap_curva(100, [0.0, 0.04, 0.05, 0.06], [0.5, 2, 5, 10], 2,
+    ...                         rendimientos=[0.30, 0.27, 0.24, 0.22])
+    >>> curva.tasa_cero([1, 3, 7]).round(6)
+    array([0.299258, 0.267385, 0.233841])
+    """
+    if metodo not in METODOS_INTERPOLACION:
+        raise ValueError(f"Método debe ser uno de {METODOS_INTERPOLACION}")
+    valor_nominal, tasa_cupon, años_vencimiento, frecuencia = (
+        a.ravel() for a in np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in
+              (valor_nominal, tasa_cupon, años_vencimiento, frecuencia))))
+    if precios is None:
+        if rendimientos is None:
+            raise ValueError("Debe indicar precios o rendimientos")
+        precios = metricas_bono(valor_nominal, tasa_cupon, años_vencimiento,
+                                rendimientos, frecuencia).precio
+    precios = np.broadcast_to(np.asarray(precios, dtype=float), valor_nominal.shape)
+    
+    orden = np.argsort(años_vencimiento, kind='stable')
+    if np.any(np.diff(años_vencimiento[orden]) <= 0):
+        raise ValueError("Cada bono de referencia debe tener un vencimiento distinto")
+    
+    bono, tiempos_flujo, montos = flujos_planos(valor_nominal[orden], tasa_cupon[orden],
+                                                años_vencimiento[orden], frecuencia[orden])
+    precios = precios[orden]
+    nodos = np.concatenate([[0.0], años_vencimiento[orden]])
+    log_fd = np.zeros(len(nodos))
+    flujos_de = [np.flatnonzero(bono == k) for k in range(len(precios))]
+    
+    def error_precio(x, k, hasta):
+        log_fd[k + 1] = x
+        interpolar = _interpolador(nodos[:hasta + 1], log_fd[:hasta + 1], metodo)
+        flujos = flujos_de[k]
+        valor = np.sum(montos[flujos] * np.exp(interpolar(tiempos_flujo[flujos])))
+        return valor / precios[k] - 1
+    
+    def resolver_nodo(k, hasta):
+        # Intervalo inicial alrededor del nodo anterior, ampliado hasta encerrar la raíz
+        a, b = log_fd[k] - 5.0, log_fd[k] + 5.0
+        while error_precio(a, k, hasta) > 0:
+            a -= 5.0
+        while error_precio(b, k, hasta) < 0:
+            b += 5.0
+        log_fd[k + 1] = brentq(error_precio, a, b, args=(k, hasta), xtol=1e-14)
+    
+    # Primera pasada secuencial: cada nodo con los nodos ya conocidos
+    for k in range(len(precios)):
+        resolver_nodo(k, k + 1)
+    
+    # Pasadas adicionales con todos los nodos (sólo cambian con la cúbica)
+    def error_maximo():
+        return max(abs(error_precio(log_fd[k + 1], k, len(precios))) for k in range(len(precios)))
+    
+    if metodo == 'cubica_monotona':
+        for _ in range(max_pasadas):
+            if error_maximo() <= tol:
+                break
+            for k in range(len(precios)):
+                resolver_nodo(k, len(precios))
+        else:
+            error = error_maximo()
+            if error > tol:
+                raise RuntimeError(f"La curva cúbica no convergió en {max_pasadas} pasadas "
+                                   f"(error de precio {error:.2e} > tol={tol:g})")
+    
+    return CurvaCuponCero(nodos, np.exp(log_fd), metodo=metodo, paso_grilla=paso_grilla)
+
+
+if __name__ == "__main__":
+    print("=== TESTING MÓDULO CURVA CUPÓN CERO ===")
+    
+    curva = bootstrap_curva(100, [0.0, 0.04, 0.05, 0.06, 0.07], [0.5, 2, 5, 10, 20], 2,
+                            rendimientos=[0.30, 0.27, 0.24, 0.22, 0.20])
+    print(curva.a_dataframe().round(6))
+    
+    precios = curva.precio_bonos(100, [0.04, 0.05, 0.06], [2, 5, 10], 2)
+    print(f"Precios de referencia revaluados: {np.round(precios, 6)}")
+    
+    cubica = bootstrap_curva(100, [0.0, 0.04, 0.05, 0.06, 0.07], [0.5, 2, 5, 10, 20], 2,
+                             rendimientos=[0.30, 0.27, 0.24, 0.22, 0.20], metodo='cubica_monotona')
+    print(f"Tasas cero (cúbica) 1, 3 y 7 años: {np.round(cubica.tasa_cero([1, 3, 7]), 6)}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,225 @@
+"""
+Módulo de Duración por Tasas Clave
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo calcula duraciones por tasa clave (key-rate durations) y DV01 por
+tramo de plazo para una cartera completa de bonos a partir de una
+`CurvaCuponCero`.
+
+Cada tasa clave se desplaza con una función triangular centrada en su tenor
+(la primera y la última se extienden planas hacia los extremos), de modo que
+la suma de todos los desplazamientos es un shock paralelo. Como cada flujo cae
+entre dos tenores, sólo afecta a dos tramos: los factores de descuento sin
+desplazar se calculan una sola vez y las variaciones de precio de todos los
+bonos y tramos se acumulan en una sola pasada con `np.bincount`, sin
+revaluar la cartera K veces.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+
+from valuacion_bonos import CarteraBonos
+from flujos_fechados import CarteraCronogramas
+from curva_cupon_cero import flujos_planos
+from escenarios_tasas import TENORES_REFERENCIA
+
+
+# Desplazamiento por defecto de cada tasa clave (1 punto básico)
+BUMP_PB = 0.0001
+
+
+class ResultadoTasasClave(NamedTuple):
+    """
+    Sensibilidades de una cartera por tasa clave.
+    
+    tenores : tenores clave en años
+    precios : precio de cada bono con la curva sin desplazar
+    dv01 : matriz (bonos × tenores) con la pérdida de precio ante +1 pb en
+        cada tasa clave
+    duraciones : matriz (bonos × tenores) de duraciones por tasa clave; la
+        suma por fila es la duración frente a un shock paralelo de la curva
+    """
+    tenores: np.ndarray
+    precios: np.ndarray
+    dv01: np.ndarray
+    duraciones: np.ndarray
+    
+    def a_dataframe(self, medida='dv01', nombres=None):
+        """
+        Matriz de sensibilidades como DataFrame (bonos × tenores).
+        
+        Parámetros:
+        -----------
+        medida : str
+            'dv01' o 'duraciones'
+        nombres : list, optional
+            Nombre de cada bono
+        """
+        return pd.DataFrame(getattr(self, medida), index=nombres,
+                            columns=pd.Index(self.tenores, name='tenor'))
+    
+    def resumen(self, cantidades=None):
+        """
+        DV01 y duración por tasa clave de la cartera total.
+        
+        Parámetros:
+        -----------
+        cantidades : array_like, optional
+            Cantidad de cada bono (por defecto 1)
+        """
+        cantidades = (np.ones(len(self.precios)) if cantidades is None
+                      else np.asarray(cantidades, dtype=float))
+        dv01 = cantidades @ self.dv01
+        valor = cantidades @ self.precios
+        return pd.DataFrame({'dv01': dv01, 'duracion': dv01 / (valor * BUMP_PB)},
+                            index=pd.Index(self.tenores, name='tenor'))
+
+
+def pesos_tasas_clave(tiempos, tenores=TENORES_REFERENCIA):
+    """
+    Pesos triangulares de cada plazo sobre los dos tenores clave vecinos.
+    
+    Parámetros:
+    -----------
+    tiempos : array_like
+        Plazos en años
+    tenores : array_like
+        Tenores clave crecientes
+    
+    Retorna:
+    --------
+    tuple
+        (tramo, peso): índice del tenor inferior de cada plazo y peso sobre
+        ese tenor; el resto (1 - peso) corresponde al tenor tramo + 1. Antes
+        del primer tenor y después del último el peso completo queda en el
+        tenor del extremo.
+    """
+    tiempos = np.asarray(tiempos, dtype=float)
+    tenores = np.asarray(tenores, dtype=float)
+    if len(tenores) == 1:
+        return np.zeros(tiempos.shape, dtype=np.int64), np.ones(tiempos.shape)
+    
+    plazos = np.clip(tiempos, tenores[0], tenores[-1])
+    tramo = np.clip(np.searchsorted(tenores, plazos, side='right') - 1, 0, len(tenores) - 2)
+    peso = (tenores[tramo + 1] - plazos) / (tenores[tramo + 1] - tenores[tramo])
+    return tramo, peso
+
+
+def _flujos_instrumentos(instrumentos, fecha_valuacion):
+    """Índice de bono, plazo y monto de cada flujo pendiente."""
+    if isinstance(instrumentos, CarteraCronogramas):
+        if fecha_valuacion is None:
+            raise ValueError("Los cronogramas fechados requieren fecha_valuacion")
+        fecha = np.datetime64(pd.Timestamp(fecha_valuacion), 'D')
+        tiempos = (instrumentos.fechas - fecha).astype(float) / 365.0
+        pendientes = tiempos > 0
+        return (instrumentos.instrumento[pendientes], tiempos[pendientes],
+                instrumentos.montos[pendientes], len(instrumentos))
+    if isinstance(instrumentos, CarteraBonos):
+        bono, tiempos, montos = flujos_planos(instrumentos.valor_nominal, instrumentos.tasa_cupon,
+                                              instrumentos.años_vencimiento, instrumentos.frecuencia)
+        return bono, tiempos, montos, len(instrumentos)
+    raise TypeError("Se espera una CarteraBonos o una CarteraCronogramas")
+
+
+def duraciones_tasas_clave(curva, instrumentos, tenores=TENORES_REFERENCIA, bump=BUMP_PB,
+                           fecha_valuacion=None):
+    """
+    Duración por tasa clave y DV01 por tramo para toda la cartera.
+    
+    Cada tasa clave se desplaza ±`bump` (tasa cero continua) y la variación de
+    precio se obtiene por diferencia central. Para un flujo de monto m en el
+    plazo t con factor de descuento D(t), desplazar la tasa clave k cambia su
+    valor en m·D(t)·(exp(-bump·w_k(t)·t) - 1), y sólo los dos tenores vecinos
+    tienen peso w_k(t) distinto de cero.
+    
+    Parámetros:
+    -----------
+    curva : CurvaCuponCero
+        Curva de descuento
+    instrumentos : CarteraBonos o CarteraCronogramas
+        Bonos a analizar
+    tenores : array_like
+        Tenores clave en años (crecientes)
+    bump : float
+        Desplazamiento de cada tasa clave (como decimal)
+    fecha_valuacion : fecha, optional
+        Obligatoria para cronogramas fechados
+    
+    Retorna:
+    --------
+    ResultadoTasasClave
+        Precios, DV01 (por 1 pb) y duraciones, con matrices (bonos × tenores)
+    
+    Ejemplo:
+    --------
+    >>> curva = bootstrap_curva(100, [0.0, 0.04, 0.05, 0.055, 0.06], [1, 2, 5, 10, 30], 1,
+    ...                         rendimientos=[0.04, 0.045, 0.05, 0.055, 0.06])
+    >>> cartera = CarteraBonos()
+    >>> ids = cartera.agregar(1000, [0.05, 0.07, 0.06], [3, 7, 20], [2, 2, 1])
+    >>> krd = duraciones_tasas_clave(curva, cartera)
+    >>> krd.duraciones.sum(axis=1).round(3)
+    array([ 2.823,  5.713, 12.002])
+    >>> krd.resumen().round(3).loc[[3.0, 7.0, 20.0]]
+            dv01  duracion
+    tenor
+    3.0    0.325     1.041
+    7.0    0.601     1.923
+    20.0   0.818     2.617
+    """
+    tenores = np.asarray(tenores, dtype=float)
+    n_tenores = len(tenores)
+    bono, tiempos, montos, n_bonos = _flujos_instrumentos(instrumentos, fecha_valuacion)
+    
+    # Valor de cada flujo con la curva sin desplazar (se reutiliza en todos los tramos)
+    valores = montos * curva.factor_descuento(tiempos)
+    precios = np.bincount(bono, weights=valores, minlength=n_bonos)
+    
+    # Cada flujo aporta a lo sumo a dos tramos: el inferior con peso w y el superior con 1 - w
+    tramo, peso = pesos_tasas_clave(tiempos, tenores)
+    tramo_superior = np.minimum(tramo + 1, n_tenores - 1)
+    
+    def variacion(pesos):
+        # Diferencia central por flujo: [V(-bump) - V(+bump)] / 2
+        return valores * np.sinh(bump * pesos * tiempos)
+    
+    celdas = np.concatenate([bono * n_tenores + tramo, bono * n_tenores + tramo_superior])
+    aportes = np.concatenate([variacion(peso),
+                              np.where(tramo_superior > tramo, variacion(1 - peso), 0.0)])
+    sensibilidad = np.bincount(celdas, weights=aportes,
+                               minlength=n_bonos * n_tenores).reshape(n_bonos, n_tenores)
+    
+    # Reescalar a 1 pb y a duración (variación relativa por unidad de tasa)
+    dv01 = sensibilidad * (BUMP_PB / bump)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duraciones = sensibilidad / (precios[:, None] * bump)
+    return ResultadoTasasClave(tenores, precios, dv01, duraciones)
+
+
+if __name__ == "__main__":
+    from curva_cupon_cero import bootstrap_curva
+    
+    print("=== TESTING MÓDULO DURACIÓN POR TASAS CLAVE ===")
+    
+    curva = bootstrap_curva(100, [0.0, 0.04, 0.05, 0.055, 0.06], [1, 2, 5, 10, 30], 1,
+                            rendimientos=[0.04, 0.045, 0.05, 0.055, 0.06])
+    cartera = CarteraBonos()
+    cartera.agregar(1000, [0.05, 0.07, 0.06], [3, 7, 20], [2, 2, 1])
+    
+    krd = duraciones_tasas_clave(curva, cartera)
+    print(krd.a_dataframe('duraciones', ['3Y', '7Y', '20Y']).round(4))
+    print(krd.resumen().round(4))
+    
+    # La suma de las duraciones por tasa clave coincide con la duración paralela
+    bono, tiempos, montos = flujos_planos(cartera.valor_nominal, cartera.tasa_cupon,
+                                          cartera.años_vencimiento, cartera.frecuencia)
+    def valor(shock):
+        return np.bincount(bono, weights=montos * curva.factor_descuento(tiempos)
+                           * np.exp(-shock * tiempos))
+    paralela = (valor(-BUMP_PB) - valor(BUMP_PB)) / (2 * BUMP_PB * valor(0.0))
+    print(f"\nSuma KRD:          {krd.duraciones.sum(axis=1).round(6)}")
+    print(f"Duración paralela: {paralela.round(6)}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
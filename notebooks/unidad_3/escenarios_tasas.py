@@ -0,0 +1,294 @@
+"""
+Módulo de Escenarios de Tasas
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo revalúa una cartera de bonos bajo muchos escenarios de shock de
+tasas (paralelos, twist y butterfly) y arma el cubo (bonos × escenarios) de
+precios y resultados con una sola operación de NumPy por bloque de
+escenarios. También informa el error de la aproximación por duración y
+convexidad frente a la revaluación completa.
+
+Los escenarios se procesan por bloques para que la memoria quede acotada
+aunque el cubo completo no entre en RAM.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+
+
+# Tenores de referencia por defecto (años)
+TENORES_REFERENCIA = np.array([0.5, 1, 2, 3, 5, 7, 10, 20, 30], dtype=float)
+
+# Arreglos (bonos × escenarios) de 8 bytes vivos a la vez al revaluar un bloque:
+# los 4 campos del bloque anterior que todavía retiene quien itera, los 4 del
+# bloque nuevo más `delta`, y hasta 5 temporales del precio (rama de Taylor
+# incluida). El pico medido con tracemalloc es de ~13,2 arreglos.
+_ARREGLOS_POR_BLOQUE = 14
+
+
+class CuboEscenarios(NamedTuple):
+    """
+    Resultado de la revaluación de una cartera bajo escenarios de tasas.
+    
+    Todos los campos tienen forma (bonos × escenarios).
+    
+    precios : precio completo de cada bono en cada escenario
+    resultado : resultado (P&L) por revaluación completa
+    resultado_aproximado : P&L estimado con duración modificada y convexidad
+    error_aproximacion : resultado_aproximado - resultado
+    """
+    precios: np.ndarray
+    resultado: np.ndarray
+    resultado_aproximado: np.ndarray
+    error_aproximacion: np.ndarray
+
+
+def shock_paralelo(magnitudes, tenores=TENORES_REFERENCIA):
+    """
+    Shocks paralelos: la misma variación en todos los tenores.
+    
+    Parámetros:
+    -----------
+    magnitudes : array_like
+        Variación de tasa de cada escenario (como decimal, ej: 0.01 = +100 pb)
+    tenores : array_like
+        Tenores de referencia en años
+    
+    Retorna:
+    --------
+    np.ndarray
+        Matriz (escenarios × tenores) de variaciones de tasa
+    """
+    magnitudes = np.atleast_1d(np.asarray(magnitudes, dtype=float))
+    return np.repeat(magnitudes[:, None], len(tenores), axis=1)
+
+
+def shock_twist(magnitudes, tenores=TENORES_REFERENCIA, pivote=5.0):
+    """
+    Shocks de pendiente (twist): variación lineal en el tenor que vale cero en
+    el pivote, -m/2 en el tenor más corto y +m/2 en el más largo (para un
+    pivote centrado). Magnitudes positivas empinan la curva.
+    
+    Retorna:
+    --------
+    np.ndarray
+        Matriz (escenarios × tenores) de variaciones de tasa
+    """
+    tenores = np.asarray(tenores, dtype=float)
+    magnitudes = np.atleast_1d(np.asarray(magnitudes, dtype=float))
+    forma = (tenores - pivote) / (tenores[-1] - tenores[0])
+    return magnitudes[:, None] * forma[None, :]
+
+
+def shock_butterfly(magnitudes, tenores=TENORES_REFERENCIA, centro=5.0):
+    """
+    Shocks de curvatura (butterfly): las alas se mueven +m y el centro -m,
+    con variación lineal en el medio. Magnitudes positivas aumentan la
+    curvatura.
+    
+    Retorna:
+    --------
+    np.ndarray
+        Matriz (escenarios × tenores) de variaciones de tasa
+    """
+    tenores = np.asarray(tenores, dtype=float)
+    magnitudes = np.atleast_1d(np.asarray(magnitudes, dtype=float))
+    distancia = np.abs(tenores - centro)
+    forma = 2 * distancia / distancia.max() - 1
+    return magnitudes[:, None] * forma[None, :]
+
+
+def shocks_por_bono(shocks, tenores, plazos):
+    """
+    Interpola cada escenario de shock al plazo de cada bono.
+    
+    Los pesos de interpolación se calculan una sola vez para todos los
+    escenarios; fuera del rango de tenores se mantiene el shock del extremo.
+    
+    Parámetros:
+    -----------
+    shocks : np.ndarray
+        Matriz (escenarios × tenores)
+    tenores : array_like
+        Tenores de referencia (crecientes)
+    plazos : array_like
+        Plazo de cada bono en años
+    
+    Retorna:
+    --------
+    np.ndarray
+        Matriz (bonos × escenarios) de variaciones de tasa
+    """
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    tenores = np.asarray(tenores, dtype=float)
+    plazos = np.clip(np.asarray(plazos, dtype=float), tenores[0], tenores[-1])
+    
+    i = np.clip(np.searchsorted(tenores, plazos, side='right') - 1, 0, len(tenores) - 2)
+    peso = (plazos - tenores[i]) / (tenores[i + 1] - tenores[i])
+    return (shocks[:, i] * (1 - peso) + shocks[:, i + 1] * peso).T
+
+
+def _tamaño_bloque(n_bonos, n_escenarios, memoria_maxima_mb):
+    if memoria_maxima_mb is None:
+        return n_escenarios
+    bytes_por_escenario = max(n_bonos, 1) * 8 * _ARREGLOS_POR_BLOQUE
+    return int(max(1, min(n_escenarios, memoria_maxima_mb * 2**20 // bytes_por_escenario)))
+
+
+def iterar_escenarios(cartera, rendimientos, shocks, tenores=TENORES_REFERENCIA,
+                      tamaño_bloque=None, memoria_maxima_mb=None):
+    """
+    Revalúa la cartera por bloques de escenarios.
+    
+    Parámetros:
+    -----------
+    cartera : CarteraBonos
+        Cartera a revaluar
+    rendimientos : float o array_like
+        Rendimiento actual de cada bono
+    shocks : np.ndarray
+        Matriz (escenarios × tenores) de variaciones de tasa
+    tenores : array_like
+        Tenores de referencia de las columnas de `shocks`
+    tamaño_bloque : int, optional
+        Escenarios por bloque
+    memoria_maxima_mb : float, optional
+        Si no se indica `tamaño_bloque`, se elige para no superar esta memoria
+    
+    Retorna:
+    --------
+    generator
+        Tuplas (slice de escenarios, CuboEscenarios del bloque)
+    """
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    n_bonos, n_escenarios = len(cartera), shocks.shape[0]
+    if tamaño_bloque is None:
+        tamaño_bloque = _tamaño_bloque(n_bonos, n_escenarios, memoria_maxima_mb)
+    
+    rendimientos = np.broadcast_to(np.asarray(rendimientos, dtype=float), (n_bonos,))
+    base = cartera.metricas(rendimientos)
+    precio_base = base.precio[:, None]
+    duracion = base.duracion_modificada[:, None]
+    convex = base.convexidad[:, None]
+    
+    for inicio in range(0, n_escenarios, tamaño_bloque):
+        bloque = slice(inicio, min(inicio + tamaño_bloque, n_escenarios))
+        delta = shocks_por_bono(shocks[bloque], tenores, cartera.años_vencimiento)
+        
+        precios = cartera.precio((rendimientos[:, None] + delta).T).T
+        resultado = precios - precio_base
+        aproximado = precio_base * (-duracion * delta + 0.5 * convex * delta**2)
+        yield bloque, CuboEscenarios(precios, resultado, aproximado, aproximado - resultado)
+
+
+def cubo_escenarios(cartera, rendimientos, shocks, tenores=TENORES_REFERENCIA,
+                    tamaño_bloque=None, memoria_maxima_mb=None, salida=None):
+    """
+    Arma el cubo completo (bonos × escenarios) de precios y resultados.
+    
+    Parámetros:
+    -----------
+    cartera : CarteraBonos
+        Cartera a revaluar
+    rendimientos : float o array_like
+        Rendimiento actual de cada bono
+    shocks : np.ndarray
+        Matriz (escenarios × tenores) de variaciones de tasa
+    tenores : array_like
+        Tenores de referencia de las columnas de `shocks`
+    tamaño_bloque : int, optional
+        Escenarios por bloque
+    memoria_maxima_mb : float, optional
+        Memoria de trabajo máxima por bloque
+    salida : CuboEscenarios, optional
+        Arreglos preasignados (por ejemplo `np.memmap` en disco) de forma
+        (bonos × escenarios) donde escribir cada bloque
+    
+    Retorna:
+    --------
+    CuboEscenarios
+        Cubo con precios, resultados, resultados aproximados y error
+    
+    Ejemplo:
+    --------
+    >>> cartera = CarteraBonos()
+    >>> ids = cartera.agregar(1000, [0.05, 0.07, 0.06], [3, 7, 20], [2, 2, 1])
+    >>> shocks = np.vstack([shock_paralelo([-0.02, -0.01, 0.01, 0.02]),
+    ...                     shock_twist([-0.01, 0.01]), shock_butterfly([0.005])])
+    >>> cubo = cubo_escenarios(cartera, 0.08, shocks)
+    >>> cubo.resultado.round(2)
+    array([[  51.55,   25.35,  -24.53,  -48.26,   -1.69,    1.69,   10.54],
+           [ 109.3 ,   52.82,  -49.41,  -95.66,    3.47,   -3.45,   21.75],
+           [ 196.36,   90.42,  -77.49, -144.18,   44.21,  -40.88,   -8.29]])
+    """
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    if salida is None:
+        forma = (len(cartera), shocks.shape[0])
+        salida = CuboEscenarios(*(np.empty(forma) for _ in CuboEscenarios._fields))
+    
+    for bloque, parcial in iterar_escenarios(cartera, rendimientos, shocks, tenores,
+                                             tamaño_bloque, memoria_maxima_mb):
+        for destino, valores in zip(salida, parcial):
+            destino[:, bloque] = valores
+    return salida
+
+
+def resumen_escenarios(cartera, rendimientos, shocks, tenores=TENORES_REFERENCIA,
+                       cantidades=None, tamaño_bloque=None, memoria_maxima_mb=None,
+                       nombres=None):
+    """
+    Resultado total de la cartera por escenario, sin guardar el cubo completo.
+    
+    Parámetros:
+    -----------
+    cantidades : array_like, optional
+        Cantidad de cada bono en la cartera (por defecto 1)
+    nombres : list, optional
+        Nombre de cada escenario
+    
+    Retorna:
+    --------
+    pd.DataFrame
+        Por escenario: resultado completo, resultado aproximado, error total y
+        máximo error absoluto por bono
+    """
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=float))
+    n_escenarios = shocks.shape[0]
+    cantidades = (np.ones(len(cartera)) if cantidades is None
+                  else np.asarray(cantidades, dtype=float))
+    
+    total = np.empty(n_escenarios)
+    total_aproximado = np.empty(n_escenarios)
+    error_maximo = np.empty(n_escenarios)
+    for bloque, parcial in iterar_escenarios(cartera, rendimientos, shocks, tenores,
+                                             tamaño_bloque, memoria_maxima_mb):
+        total[bloque] = cantidades @ parcial.resultado
+        total_aproximado[bloque] = cantidades @ parcial.resultado_aproximado
+        error_maximo[bloque] = np.abs(parcial.error_aproximacion).max(axis=0, initial=0.0)
+    
+    return pd.DataFrame({'resultado': total,
+                         'resultado_aproximado': total_aproximado,
+                         'error_aproximacion': total_aproximado - total,
+                         'error_maximo_bono': error_maximo},
+                        index=pd.Index(nombres if nombres is not None else range(n_escenarios),
+                                       name='escenario'))
+
+
+if __name__ == "__main__":
+    from valuacion_bonos import CarteraBonos
+    
+    print("=== TESTING MÓDULO ESCENARIOS DE TASAS ===")
+    
+    cartera = CarteraBonos()
+    cartera.agregar(1000, [0.05, 0.08, 0.10], [2, 5, 20], [2, 2, 1])
+    shocks = np.vstack([shock_paralelo([-0.02, 0.02]), shock_twist([0.01]),
+                        shock_butterfly([0.005])])
+    
+    cubo = cubo_escenarios(cartera, 0.08, shocks, tamaño_bloque=3)
+    print(f"Forma del cubo: {cubo.resultado.shape}")
+    print(resumen_escenarios(cartera, 0.08, shocks,
+                             nombres=['-200pb', '+200pb', 'twist', 'butterfly']).round(4))
+    
+    print("\n✅ Todos los tests completados exitosamente")
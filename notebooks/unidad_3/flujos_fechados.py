@@ -0,0 +1,507 @@
+"""
+Módulo de Flujos Fechados
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo representa cronogramas de pagos con fechas reales (amortizaciones,
+primer cupón irregular, letras capitalizables) como los de LECAP, BONCER y
+BONAR, y calcula XNPV y XIRR sobre muchos instrumentos a la vez.
+
+Los cronogramas de largo variable se empaquetan en arreglos planos con un
+vector de desplazamientos (offsets), de modo que una curva soberana completa
+se valúa en una sola pasada vectorizada.
+"""
+
+import numpy as np
+import pandas as pd
+
+from valuacion_bonos import ResultadoYTM, _resolver_raiz_acotada
+
+
+# Convención de días para descontar (XNPV / XIRR): días reales / 365
+DIAS_AÑO = 365.0
+
+# Intervalo de búsqueda de la tasa efectiva anual en XIRR
+_TASA_MINIMA = -0.99
+_TASA_MAXIMA = 100.0
+
+
+def _como_fechas(fechas):
+    """Convierte fechas (str, datetime, Timestamp o secuencias) a datetime64[D]."""
+    if np.ndim(fechas) == 0:
+        return np.datetime64(pd.Timestamp(fechas), 'D')
+    return np.asarray(pd.to_datetime(fechas).values, dtype='datetime64[D]')
+
+
+def sumar_meses(fechas, meses):
+    """
+    Suma meses a fechas datetime64[D], limitando el día al fin de mes.
+    
+    Parámetros:
+    -----------
+    fechas : array_like de datetime64[D]
+        Fechas de partida
+    meses : int o array_like
+        Meses a sumar (pueden ser negativos)
+    
+    Retorna:
+    --------
+    np.ndarray
+        Fechas resultantes (datetime64[D])
+    """
+    fechas = np.asarray(fechas, dtype='datetime64[D]')
+    mes = fechas.astype('datetime64[M]')
+    dia = (fechas - mes.astype('datetime64[D]')).astype(int)
+    mes_destino = mes + np.asarray(meses)
+    dias_del_mes = ((mes_destino + 1).astype('datetime64[D]')
+                    - mes_destino.astype('datetime64[D]')).astype(int)
+    return mes_destino.astype('datetime64[D]') + np.minimum(dia, dias_del_mes - 1)
+
+
+def fraccion_año(inicio, fin, base='30/360'):
+    """
+    Fracción de año entre dos fechas según la base de cálculo.
+    
+    Parámetros:
+    -----------
+    inicio, fin : array_like de datetime64[D]
+        Fechas de inicio y fin del período
+    base : str
+        '30/360' (convención bond basis), 'act/365' o 'act/360'
+    
+    Retorna:
+    --------
+    np.ndarray
+        Fracción de año de cada período
+    """
+    inicio = np.asarray(inicio, dtype='datetime64[D]')
+    fin = np.asarray(fin, dtype='datetime64[D]')
+    if base == 'act/365':
+        return (fin - inicio).astype(float) / 365.0
+    if base == 'act/360':
+        return (fin - inicio).astype(float) / 360.0
+    if base != '30/360':
+        raise ValueError("La base debe ser '30/360', 'act/365' o 'act/360'")
+    
+    def partes(fechas):
+        año = fechas.astype('datetime64[Y]').astype(int) + 1970
+        mes = fechas.astype('datetime64[M]').astype(int) % 12 + 1
+        dia = (fechas - fechas.astype('datetime64[M]')).astype(int) + 1
+        return año, mes, dia
+    
+    a1, m1, d1 = partes(inicio)
+    a2, m2, d2 = partes(fin)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where(d1 == 30, np.minimum(d2, 30), d2)
+    return (360 * (a2 - a1) + 30 * (m2 - m1) + (d2 - d1)) / 360.0
+
+
+class CronogramaFlujos:
+    """
+    Cronograma de pagos de un instrumento con fechas reales.
+    
+    Atributos:
+    ----------
+    fechas : np.ndarray (datetime64[D])
+        Fechas de pago, ordenadas
+    montos : np.ndarray
+        Monto total de cada pago
+    interes : np.ndarray
+        Parte de interés de cada pago
+    amortizacion : np.ndarray
+        Parte de amortización de capital de cada pago
+    nombre : str
+        Identificación del instrumento (ej: 'AL30')
+    """
+    
+    __slots__ = ('fechas', 'montos', 'interes', 'amortizacion', 'nombre')
+    
+    def __init__(self, fechas, montos, interes=None, amortizacion=None, nombre=None):
+        fechas = np.atleast_1d(_como_fechas(fechas))
+        montos = np.atleast_1d(np.asarray(montos, dtype=float))
+        if fechas.shape != montos.shape:
+            raise ValueError("Las fechas y los montos deben tener el mismo largo")
+        orden = np.argsort(fechas, kind='stable')
+        self.fechas = fechas[orden]
+        self.montos = montos[orden]
+        self.interes = (np.zeros_like(self.montos) if interes is None
+                        else np.asarray(interes, dtype=float)[orden])
+        self.amortizacion = (self.montos - self.interes if amortizacion is None
+                             else np.asarray(amortizacion, dtype=float)[orden])
+        self.nombre = nombre
+    
+    def __len__(self):
+        return len(self.fechas)
+    
+    def __repr__(self):
+        return f"CronogramaFlujos({self.nombre!r}, {len(self)} pagos)"
+    
+    def a_dataframe(self):
+        """Devuelve el cronograma como DataFrame indexado por fecha."""
+        return pd.DataFrame({'interes': self.interes,
+                             'amortizacion': self.amortizacion,
+                             'flujo': self.montos},
+                            index=pd.DatetimeIndex(self.fechas, name='fecha'))
+    
+    def xnpv(self, tasa, fecha_valuacion=None):
+        """Valor actual de los flujos posteriores a `fecha_valuacion`."""
+        return CarteraCronogramas([self]).precio(tasa, fecha_valuacion)[0]
+    
+    def xirr(self, precio, fecha_valuacion):
+        """Tasa efectiva anual que iguala el valor actual de los flujos a `precio`."""
+        resultado = CarteraCronogramas([self]).tir(precio, fecha_valuacion)
+        return resultado.rendimiento[0] if resultado.convergido[0] else None
+
+
+def cronograma_bono(fecha_emision, fecha_vencimiento, tasa_cupon, frecuencia=2,
+                    valor_nominal=100.0, amortizaciones=None, fecha_primer_cupon=None,
+                    base='30/360', nombre=None):
+    """
+    Construye el cronograma de un bono con cupón fijo, amortizaciones y
+    primer cupón irregular.
+    
+    Las fechas de cupón se generan hacia atrás desde el vencimiento cada
+    12/frecuencia meses. El primer período va desde la emisión hasta el primer
+    cupón, por lo que puede ser corto o largo; los intereses de cada período se
+    calculan sobre el saldo residual con la base indicada.
+    
+    Parámetros:
+    -----------
+    fecha_emision : fecha
+        Fecha de emisión (inicio del devengamiento)
+    fecha_vencimiento : fecha
+        Fecha del último pago
+    tasa_cupon : float
+        Tasa de cupón anual sobre el saldo residual
+    frecuencia : int, default=2
+        Cupones por año
+    valor_nominal : float, default=100
+        Valor nominal original
+    amortizaciones : dict, optional
+        {fecha: fracción del nominal original}. Las fechas deben coincidir con
+        fechas de cupón y las fracciones sumar 1. Por defecto, bullet al vencimiento.
+    fecha_primer_cupon : fecha, optional
+        Fecha del primer cupón (si no coincide con la grilla regular, las
+        fechas anteriores a ella se descartan)
+    base : str, default='30/360'
+        Base de cálculo de intereses ('30/360', 'act/365', 'act/360')
+    nombre : str, optional
+        Identificación del instrumento
+    
+    Retorna:
+    --------
+    CronogramaFlujos
+        Cronograma con fechas, intereses, amortizaciones y flujos totales
+    
+    Ejemplo:
+    --------
+    >>> cronograma_bono('2020-09-04', '2030-07-09', 0.01, 2,
+    ...                 amortizaciones={'2024-07-09': 0.04, ...})
+    """
+    emision = _como_fechas(fecha_emision)
+    vencimiento = _como_fechas(fecha_vencimiento)
+    if vencimiento <= emision:
+        raise ValueError("El vencimiento debe ser posterior a la emisión")
+    if 12 % frecuencia != 0:
+        raise ValueError("La frecuencia debe dividir a 12 (1, 2, 3, 4, 6 o 12)")
+    
+    meses_periodo = 12 // frecuencia
+    meses_totales = ((vencimiento.astype('datetime64[M]') - emision.astype('datetime64[M]'))
+                     .astype(int))
+    pasos = np.arange(meses_totales // meses_periodo + 1, -1, -1)
+    fechas = sumar_meses(vencimiento, -pasos * meses_periodo)
+    fechas = fechas[fechas > emision]
+    if fecha_primer_cupon is not None:
+        fechas = fechas[fechas >= _como_fechas(fecha_primer_cupon)]
+        fechas = np.unique(np.concatenate([[_como_fechas(fecha_primer_cupon)], fechas]))
+    
+    # Fracción amortizada en cada fecha de pago
+    fraccion_amortizada = np.zeros(len(fechas))
+    if amortizaciones is None:
+        fraccion_amortizada[-1] = 1.0
+    else:
+        fechas_amort = _como_fechas(list(amortizaciones.keys()))
+        posiciones = np.searchsorted(fechas, fechas_amort)
+        if np.any(posiciones >= len(fechas)) or np.any(fechas[np.minimum(posiciones, len(fechas) - 1)] != fechas_amort):
+            raise ValueError("Las fechas de amortización deben coincidir con fechas de cupón")
+        np.add.at(fraccion_amortizada, posiciones, list(amortizaciones.values()))
+        if not np.isclose(fraccion_amortizada.sum(), 1.0):
+            raise ValueError("Las amortizaciones deben sumar el 100% del nominal")
+    
+    amortizacion = valor_nominal * fraccion_amortizada
+    saldo_inicio = valor_nominal - np.concatenate([[0.0], np.cumsum(amortizacion)[:-1]])
+    inicios = np.concatenate([[emision], fechas[:-1]])
+    interes = tasa_cupon * saldo_inicio * fraccion_año(inicios, fechas, base)
+    
+    return CronogramaFlujos(fechas, interes + amortizacion, interes, amortizacion, nombre)
+
+
+def cronograma_letra_capitalizable(fecha_emision, fecha_vencimiento, tem,
+                                   valor_nominal=100.0, nombre=None):
+    """
+    Cronograma de una letra capitalizable (tipo LECAP): un único pago al
+    vencimiento igual al nominal capitalizado mensualmente a la TEM.
+    
+    Parámetros:
+    -----------
+    fecha_emision, fecha_vencimiento : fecha
+        Fechas de emisión y vencimiento
+    tem : float
+        Tasa efectiva mensual de capitalización
+    valor_nominal : float, default=100
+        Valor nominal
+    nombre : str, optional
+        Identificación del instrumento
+    
+    Retorna:
+    --------
+    CronogramaFlujos
+        Cronograma con un solo pago
+    """
+    emision = _como_fechas(fecha_emision)
+    vencimiento = _como_fechas(fecha_vencimiento)
+    meses = fraccion_año(emision, vencimiento, '30/360') * 12
+    pago = valor_nominal * (1 + tem) ** meses
+    return CronogramaFlujos([vencimiento], [pago], [pago - valor_nominal],
+                            [valor_nominal], nombre)
+
+
+class CarteraCronogramas:
+    """
+    Conjunto de cronogramas empaquetados en arreglos planos.
+    
+    Los flujos de todos los instrumentos se guardan en `fechas` y `montos`
+    contiguos; el instrumento i ocupa las posiciones offsets[i]:offsets[i+1].
+    XNPV y XIRR se calculan sobre todos los instrumentos a la vez, sin bucles
+    de Python por instrumento.
+    
+    Ejemplo:
+    --------
+    >>> cartera = CarteraCronogramas([al30, gd35, s31m5])
+    >>> cartera.precio(np.array([0.25, 0.18, 0.40]), '2025-03-10')
+    """
+    
+    __slots__ = ('fechas', 'montos', 'offsets', 'instrumento', 'nombres')
+    
+    def __init__(self, cronogramas):
+        cronogramas = list(cronogramas)
+        largos = np.array([len(c) for c in cronogramas], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(largos)])
+        self.fechas = (np.concatenate([c.fechas for c in cronogramas]) if cronogramas
+                       else np.empty(0, dtype='datetime64[D]'))
+        self.montos = (np.concatenate([c.montos for c in cronogramas]) if cronogramas
+                       else np.empty(0))
+        self.instrumento = np.repeat(np.arange(len(cronogramas)), largos)
+        self.nombres = [c.nombre for c in cronogramas]
+    
+    @classmethod
+    def desde_arreglos(cls, fechas, montos, offsets, nombres=None):
+        """Crea la cartera directamente a partir de arreglos ya empaquetados."""
+        cartera = cls.__new__(cls)
+        cartera.fechas = np.asarray(fechas, dtype='datetime64[D]')
+        cartera.montos = np.asarray(montos, dtype=float)
+        cartera.offsets = np.asarray(offsets, dtype=np.int64)
+        largos = np.diff(cartera.offsets)
+        cartera.instrumento = np.repeat(np.arange(len(largos)), largos)
+        cartera.nombres = list(nombres) if nombres is not None else [None] * len(largos)
+        return cartera
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __repr__(self):
+        return f"CarteraCronogramas({len(self)} instrumentos, {len(self.montos)} flujos)"
+    
+    def _plazos(self, fecha_valuacion):
+        """Plazo en años de cada flujo y máscara de flujos pendientes."""
+        if fecha_valuacion is None:
+            base = self.fechas[self.offsets[:-1]][self.instrumento]
+            pendientes = np.ones(len(self.montos), dtype=bool)
+        else:
+            base = _como_fechas(fecha_valuacion)
+            pendientes = self.fechas > base
+        plazos = (self.fechas - base).astype(float) / DIAS_AÑO
+        return plazos, pendientes
+    
+    def _sumar_por_instrumento(self, valores, mascara):
+        return np.bincount(self.instrumento[mascara], weights=valores[mascara],
+                           minlength=len(self))
+    
+    def precio(self, tasas, fecha_valuacion=None):
+        """
+        XNPV de cada instrumento: suma de flujo / (1 + tasa)^(días / 365).
+        
+        Parámetros:
+        -----------
+        tasas : float o array_like
+            Tasa efectiva anual (un valor o uno por instrumento)
+        fecha_valuacion : fecha, optional
+            Si se indica, sólo se descuentan los flujos posteriores a esa fecha.
+            Si no, se descuenta a la fecha del primer flujo de cada instrumento
+            (convención XNPV de planilla de cálculo).
+        
+        Retorna:
+        --------
+        np.ndarray
+            Valor actual de cada instrumento
+        """
+        tasas = np.broadcast_to(np.asarray(tasas, dtype=float), (len(self),))
+        plazos, pendientes = self._plazos(fecha_valuacion)
+        valores = self.montos * (1 + tasas[self.instrumento]) ** -plazos
+        return self._sumar_por_instrumento(valores, pendientes)
+    
+    def tir(self, precios=0.0, fecha_valuacion=None, estimacion=0.1, tol=1e-10, max_iter=100):
+        """
+        XIRR de cada instrumento: tasa efectiva anual que iguala el XNPV al precio.
+        
+        Con `precios=0` y sin fecha de valuación es la XIRR clásica de una
+        serie de flujos que incluye la inversión inicial (negativa).
+        
+        Parámetros:
+        -----------
+        precios : float o array_like
+            Precio de cada instrumento (se resta a los flujos pendientes)
+        fecha_valuacion : fecha, optional
+            Fecha de liquidación
+        estimacion : float o array_like
+            Tasa inicial de la iteración
+        tol : float
+            Tolerancia
+        max_iter : int
+            Máximo de iteraciones
+        
+        Retorna:
+        --------
+        ResultadoYTM
+            Tasas (NaN donde no convergió), máscara de convergencia e iteraciones
+        """
+        m = len(self)
+        precios = np.broadcast_to(np.asarray(precios, dtype=float), (m,))
+        plazos, pendientes = self._plazos(fecha_valuacion)
+        instrumento = self.instrumento
+        escala = np.where(precios != 0, np.abs(precios),
+                          np.maximum(self._sumar_por_instrumento(np.abs(self.montos),
+                                                                 pendientes), 1.0))
+        
+        def ecuacion(tasas, indices):
+            activo = np.zeros(m, dtype=bool)
+            activo[indices] = True
+            mascara = pendientes & activo[instrumento]
+            tasa_flujo = np.zeros(m)
+            tasa_flujo[indices] = tasas
+            base = 1 + tasa_flujo[instrumento[mascara]]
+            t = plazos[mascara]
+            descontado = self.montos[mascara] * base ** -t
+            
+            def sumar(valores):
+                return np.bincount(instrumento[mascara], weights=valores, minlength=m)[indices]
+            
+            f = (sumar(descontado) - precios[indices]) / escala[indices]
+            f1 = sumar(-t * descontado / base) / escala[indices]
+            f2 = sumar(t * (t + 1) * descontado / base**2) / escala[indices]
+            return f, f1, f2
+        
+        tasas, convergido, iteraciones = _resolver_raiz_acotada(
+            ecuacion, np.broadcast_to(np.asarray(estimacion, dtype=float), (m,)),
+            np.full(m, _TASA_MINIMA), np.full(m, _TASA_MAXIMA), tol=tol, max_iter=max_iter)
+        return ResultadoYTM(tasas, convergido, iteraciones)
+    
+    def a_dataframe(self):
+        """Devuelve todos los flujos en formato largo (instrumento, fecha, flujo)."""
+        nombres = np.array([n if n is not None else i for i, n in enumerate(self.nombres)],
+                           dtype=object)
+        return pd.DataFrame({'instrumento': nombres[self.instrumento],
+                             'fecha': self.fechas,
+                             'flujo': self.montos})
+
+
+def xnpv(tasa, fechas, montos, offsets=None, fecha_valuacion=None):
+    """
+    Valor actual neto con fechas (XNPV) de uno o muchos instrumentos.
+    
+    Parámetros:
+    -----------
+    tasa : float o array_like
+        Tasa efectiva anual (una o una por instrumento)
+    fechas : array_like de fechas
+        Fechas de todos los flujos, empaquetadas
+    montos : array_like
+        Montos de todos los flujos, empaquetados
+    offsets : array_like, optional
+        Inicio de cada instrumento en los arreglos planos (largo m + 1). Si
+        se omite, se considera un único instrumento.
+    fecha_valuacion : fecha, optional
+        Fecha de descuento (por defecto, el primer flujo de cada instrumento)
+    
+    Retorna:
+    --------
+    float o np.ndarray
+        XNPV de cada instrumento
+    """
+    montos = np.asarray(montos, dtype=float)
+    unico = offsets is None
+    if unico:
+        offsets = [0, len(montos)]
+    cartera = CarteraCronogramas.desde_arreglos(_como_fechas(fechas), montos, offsets)
+    resultado = cartera.precio(tasa, fecha_valuacion)
+    return resultado[0] if unico else resultado
+
+
+def xirr(fechas, montos, offsets=None, estimacion=0.1, tol=1e-10, max_iter=100):
+    """
+    Tasa interna de retorno con fechas (XIRR) de uno o muchos instrumentos.
+    
+    Parámetros:
+    -----------
+    fechas : array_like de fechas
+        Fechas de todos los flujos, empaquetadas
+    montos : array_like
+        Montos de todos los flujos (la inversión inicial con signo negativo)
+    offsets : array_like, optional
+        Inicio de cada instrumento en los arreglos planos (largo m + 1). Si
+        se omite, se considera un único instrumento.
+    estimacion : float, default=0.1
+        Tasa inicial de la iteración
+    
+    Retorna:
+    --------
+    float, None o ResultadoYTM
+        Para un único instrumento, la tasa (o None si no converge); para
+        varios, el resultado completo con máscara de convergencia
+    
+    Ejemplo:
+    --------
+    >>> round(xirr(['2024-01-01', '2024-07-01', '2025-01-01'], [-100, 5, 105]), 6)
+    0.10222
+    """
+    montos = np.asarray(montos, dtype=float)
+    unico = offsets is None
+    if unico:
+        offsets = [0, len(montos)]
+    cartera = CarteraCronogramas.desde_arreglos(_como_fechas(fechas), montos, offsets)
+    resultado = cartera.tir(0.0, None, estimacion, tol, max_iter)
+    if unico:
+        return resultado.rendimiento[0] if resultado.convergido[0] else None
+    return resultado
+
+
+if __name__ == "__main__":
+    print("=== TESTING MÓDULO FLUJOS FECHADOS ===")
+    
+    # Bono amortizable con primer cupón corto
+    bono = cronograma_bono('2020-09-04', '2030-07-09', 0.01, 2,
+                           amortizaciones={'2024-07-09': 0.04,
+                                           **{f'{a}-{m}-09': 0.08
+                                              for a in range(2025, 2030) for m in ('01', '07')},
+                                           '2030-01-09': 0.08, '2030-07-09': 0.08},
+                           nombre='AL30')
+    letra = cronograma_letra_capitalizable('2024-10-31', '2025-05-30', 0.039, nombre='S30Y5')
+    cartera = CarteraCronogramas([bono, letra])
+    
+    precios = cartera.precio([0.20, 0.35], '2025-03-10')
+    tires = cartera.tir(precios, '2025-03-10')
+    print(f"Precios: {np.round(precios, 4)}")
+    print(f"TIR: {np.round(tires.rendimiento, 6)}")
+    print(f"XIRR simple: {xirr(['2024-01-01', '2024-07-01', '2025-01-01'], [-100, 5, 105]):.6f}")
+    
+    print("\n✅ Todos los tests completados exitosamente")
@@ -0,0 +1,481 @@
+"""
+Módulo de Simulación de Tasa Corta
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Este módulo simula trayectorias de la tasa corta con los modelos de Vasicek y
+Cox-Ingersoll-Ross (CIR) y valúa bonos y cronogramas de pagos por Monte Carlo,
+descontando cada flujo con exp(-∫ r dt) a lo largo de cada trayectoria.
+
+Las trayectorias se generan por lotes: cada lote se valúa y se acumula en un
+estimador de media y varianza, de modo que se pueden correr 10^7 caminos sin
+guardarlos en memoria. Los lotes pueden repartirse entre procesos; cada lote
+tiene su propia semilla derivada con `np.random.SeedSequence`, por lo que el
+resultado es reproducible y no depende de la cantidad de procesos.
+
+El núcleo de generación usa numba si está instalado y, si no, una versión
+equivalente en NumPy que consume los mismos números aleatorios.
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from valuacion_bonos import Bono, CarteraBonos
+from flujos_fechados import CronogramaFlujos, CarteraCronogramas
+from curva_cupon_cero import flujos_planos
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+
+# Códigos de modelo usados por los núcleos de simulación
+_VASICEK = 0
+_CIR = 1
+
+# Pasos de tiempo cuyos normales se generan juntos dentro de un lote
+_PASOS_POR_BLOQUE = 256
+
+
+class ModeloVasicek(NamedTuple):
+    """
+    Modelo de Vasicek: dr = kappa (theta - r) dt + sigma dW.
+    
+    kappa : velocidad de reversión a la media
+    theta : tasa de largo plazo
+    sigma : volatilidad de la tasa
+    r0 : tasa corta inicial
+    """
+    kappa: float
+    theta: float
+    sigma: float
+    r0: float
+    
+    def _coeficientes(self, dt):
+        # Discretización exacta: r' = a r + b + c Z
+        a = np.exp(-self.kappa * dt)
+        b = self.theta * (1 - a)
+        if self.kappa == 0:
+            c = self.sigma * np.sqrt(dt)
+        else:
+            c = self.sigma * np.sqrt(-np.expm1(-2 * self.kappa * dt) / (2 * self.kappa))
+        return _VASICEK, a, b, c
+    
+    def factor_descuento(self, t):
+        """Precio analítico del bono cupón cero que paga 1 en t."""
+        t = np.asarray(t, dtype=float)
+        k, theta, sigma = self.kappa, self.theta, self.sigma
+        if k == 0:
+            return np.exp(-self.r0 * t + sigma**2 * t**3 / 6)
+        B = -np.expm1(-k * t) / k
+        A = (theta - sigma**2 / (2 * k**2)) * (B - t) - sigma**2 * B**2 / (4 * k)
+        return np.exp(A - B * self.r0)
+
+
+class ModeloCIR(NamedTuple):
+    """
+    Modelo de Cox-Ingersoll-Ross: dr = kappa (theta - r) dt + sigma sqrt(r) dW.
+    
+    Se discretiza con Euler de truncamiento completo: la tasa simulada puede
+    quedar negativa, pero en la deriva, la volatilidad y el descuento se usa
+    max(r, 0). Conviene que se cumpla la condición de Feller
+    2 kappa theta >= sigma^2.
+    """
+    kappa: float
+    theta: float
+    sigma: float
+    r0: float
+    
+    def _coeficientes(self, dt):
+        # Euler: r' = r + a (theta - r+) ... expresado como r + b - a r+ + c sqrt(r+) Z
+        return _CIR, self.kappa * dt, self.kappa * self.theta * dt, self.sigma * np.sqrt(dt)
+    
+    def factor_descuento(self, t):
+        """Precio analítico del bono cupón cero que paga 1 en t."""
+        t = np.asarray(t, dtype=float)
+        k, theta, sigma = self.kappa, self.theta, self.sigma
+        h = np.sqrt(k**2 + 2 * sigma**2)
+        e = np.expm1(h * t)
+        denominador = 2 * h + (k + h) * e
+        B = 2 * e / denominador
+        A = (2 * k * theta / sigma**2) * np.log(2 * h * np.exp((k + h) * t / 2) / denominador)
+        return np.exp(A - B * self.r0)
+
+
+class ResultadoMonteCarlo(NamedTuple):
+    """
+    Precio estimado por Monte Carlo de cada instrumento.
+    
+    precio : media de los valores descontados por trayectoria
+    error_estandar : desvío de la media (desvío muestral / sqrt(n))
+    caminos : cantidad de trayectorias simuladas
+    """
+    precio: np.ndarray
+    error_estandar: np.ndarray
+    caminos: int
+    
+    def a_dataframe(self, nombres=None):
+        """Tabla con precio, error estándar e intervalo de confianza del 95%."""
+        return pd.DataFrame({'precio': self.precio,
+                             'error_estandar': self.error_estandar,
+                             'ic_inferior': self.precio - 1.96 * self.error_estandar,
+                             'ic_superior': self.precio + 1.96 * self.error_estandar},
+                            index=nombres)
+
+
+class EstimadorMonteCarlo:
+    """
+    Acumula media y varianza de los precios por trayectoria sin guardarlos.
+    
+    Cada lote se resume en (n, media, M2) y se combina con la fórmula de Chan
+    para varianzas en paralelo, que es estable aunque se acumulen muchos lotes.
+    """
+    
+    __slots__ = ('n', 'media', 'm2')
+    
+    def __init__(self, n_instrumentos):
+        self.n = 0
+        self.media = np.zeros(n_instrumentos)
+        self.m2 = np.zeros(n_instrumentos)
+    
+    def agregar(self, muestras):
+        """Incorpora una matriz (trayectorias × instrumentos) de precios."""
+        muestras = np.asarray(muestras, dtype=float)
+        media = muestras.mean(axis=0)
+        m2 = ((muestras - media) ** 2).sum(axis=0)
+        self.combinar((len(muestras), media, m2))
+    
+    def combinar(self, otro):
+        """Combina con otro estimador o con una tupla (n, media, M2)."""
+        n_b, media_b, m2_b = (otro.n, otro.media, otro.m2) if isinstance(otro, EstimadorMonteCarlo) else otro
+        if n_b == 0:
+            return
+        n = self.n + n_b
+        delta = media_b - self.media
+        self.media = self.media + delta * (n_b / n)
+        self.m2 = self.m2 + m2_b + delta**2 * (self.n * n_b / n)
+        self.n = n
+    
+    def estado(self):
+        return self.n, self.media, self.m2
+    
+    def resultado(self, muestras_por_camino=1):
+        """
+        Precio y error estándar acumulados.
+        
+        Con variables antitéticas cada muestra promedia `muestras_por_camino`
+        trayectorias; el error estándar se calcula sobre las muestras.
+        """
+        varianza = self.m2 / max(self.n - 1, 1)
+        return ResultadoMonteCarlo(self.media, np.sqrt(varianza / max(self.n, 1)),
+                                   self.n * muestras_por_camino)
+
+
+def _avanzar_numpy(tasas, integral, normales, paso_inicial, columna, salida,
+                   codigo, a, b, c, dt):
+    """Avanza todas las trayectorias un bloque de pasos (versión NumPy)."""
+    for s in range(normales.shape[1]):
+        z = normales[:, s]
+        if codigo == _VASICEK:
+            nuevas = a * tasas + b + c * z
+            integral += 0.5 * (tasas + nuevas) * dt
+        else:
+            positivas = np.maximum(tasas, 0.0)
+            nuevas = tasas + b - a * positivas + c * np.sqrt(positivas) * z
+            integral += 0.5 * (positivas + np.maximum(nuevas, 0.0)) * dt
+        tasas[:] = nuevas
+        col = columna[paso_inicial + s + 1]
+        if col >= 0:
+            salida[:, col] = integral
+
+
+if NUMBA_DISPONIBLE:
+    @njit(cache=True)
+    def _avanzar_numba(tasas, integral, normales, paso_inicial, columna, salida,
+                       codigo, a, b, c, dt):
+        """Avanza todas las trayectorias un bloque de pasos (versión numba)."""
+        for i in range(normales.shape[0]):
+            r = tasas[i]
+            acumulado = integral[i]
+            for s in range(normales.shape[1]):
+                z = normales[i, s]
+                if codigo == 0:
+                    nueva = a * r + b + c * z
+                    acumulado += 0.5 * (r + nueva) * dt
+                else:
+                    positiva = max(r, 0.0)
+                    nueva = r + b - a * positiva + c * np.sqrt(positiva) * z
+                    acumulado += 0.5 * (positiva + max(nueva, 0.0)) * dt
+                r = nueva
+                col = columna[paso_inicial + s + 1]
+                if col >= 0:
+                    salida[i, col] = acumulado
+            tasas[i] = r
+            integral[i] = acumulado
+
+
+class _Contexto(NamedTuple):
+    """Datos compartidos por todos los lotes de una simulación."""
+    coeficientes: tuple
+    r0: float
+    dt: float
+    n_pasos: int
+    columna: np.ndarray
+    n_nodos: int
+    nodo_inferior: np.ndarray
+    nodo_superior: np.ndarray
+    peso: np.ndarray
+    montos: np.ndarray
+    motor: str
+    antiteticas: bool
+
+
+def _preparar_flujos(instrumentos, fecha_valuacion):
+    """
+    Lleva todos los instrumentos a arreglos planos (instrumento, tiempo, monto).
+    
+    Acepta Bono, CronogramaFlujos, CarteraBonos, CarteraCronogramas o una
+    lista con cualquiera de ellos. Los cronogramas se miden en años
+    (días / 365) desde `fecha_valuacion` y sólo cuentan los flujos posteriores.
+    """
+    if isinstance(instrumentos, (Bono, CronogramaFlujos, CarteraBonos, CarteraCronogramas)):
+        instrumentos = [instrumentos]
+    
+    indices, tiempos, montos = [], [], []
+    total = 0
+    for instrumento in instrumentos:
+        if isinstance(instrumento, Bono):
+            flujos = instrumento.flujos()
+            indice = np.zeros(len(flujos.tiempos), dtype=np.int64)
+            t, m, cantidad = flujos.tiempos, flujos.montos, 1
+        elif isinstance(instrumento, CarteraBonos):
+            indice, t, m = flujos_planos(instrumento.valor_nominal, instrumento.tasa_cupon,
+                                         instrumento.años_vencimiento, instrumento.frecuencia)
+            cantidad = len(instrumento)
+        elif isinstance(instrumento, (CronogramaFlujos, CarteraCronogramas)):
+            if isinstance(instrumento, CronogramaFlujos):
+                instrumento = CarteraCronogramas([instrumento])
+            plazos, pendientes = instrumento._plazos(fecha_valuacion)
+            indice = instrumento.instrumento[pendientes]
+            t, m = plazos[pendientes], instrumento.montos[pendientes]
+            cantidad = len(instrumento)
+        else:
+            raise TypeError(f"Instrumento no soportado: {type(instrumento).__name__}")
+        indices.append(np.asarray(indice) + total)
+        tiempos.append(np.asarray(t, dtype=float))
+        montos.append(np.asarray(m, dtype=float))
+        total += cantidad
+    
+    return (np.concatenate(indices), np.concatenate(tiempos), np.concatenate(montos), total)
+
+
+def _armar_contexto(modelo, instrumentos, fecha_valuacion, pasos_por_año, motor, antiteticas):
+    indice, tiempos, montos, n_instrumentos = _preparar_flujos(instrumentos, fecha_valuacion)
+    if np.any(tiempos < 0):
+        raise ValueError("Los flujos deben ser posteriores a la fecha de valuación")
+    
+    # Cada tiempo de pago distinto se interpola entre dos pasos de la grilla
+    dt = 1.0 / pasos_por_año
+    tiempos_unicos, posicion = np.unique(tiempos, return_inverse=True)
+    paso = tiempos_unicos / dt
+    inferior = np.floor(paso + 1e-9).astype(np.int64)
+    peso = np.clip(paso - inferior, 0.0, 1.0)
+    superior = inferior + (peso > 0)
+    n_pasos = int(superior.max()) if len(superior) else 0
+    
+    nodos = np.unique(np.concatenate([inferior, superior]))
+    columna = np.full(n_pasos + 1, -1, dtype=np.int64)
+    columna[nodos] = np.arange(len(nodos))
+    
+    # Matriz (tiempos únicos × instrumentos) con el monto a pagar en cada tiempo
+    matriz = np.zeros((len(tiempos_unicos), n_instrumentos))
+    np.add.at(matriz, (posicion.ravel(), indice), montos)
+    
+    if motor == 'auto':
+        motor = 'numba' if NUMBA_DISPONIBLE else 'numpy'
+    elif motor == 'numba' and not NUMBA_DISPONIBLE:
+        raise ValueError("numba no está instalado; usar motor='numpy'")
+    elif motor not in ('numba', 'numpy'):
+        raise ValueError("motor debe ser 'auto', 'numba' o 'numpy'")
+    
+    return _Contexto(modelo._coeficientes(dt), float(modelo.r0), dt, n_pasos, columna,
+                     len(nodos), columna[inferior], columna[superior], peso, matriz,
+                     motor, bool(antiteticas))
+
+
+def _simular_lote(contexto, semilla, caminos):
+    """Simula un lote de trayectorias y devuelve su resumen (n, media, M2)."""
+    rng = np.random.default_rng(semilla)
+    mitad = (caminos + 1) // 2 if contexto.antiteticas else caminos
+    total = 2 * mitad if contexto.antiteticas else caminos
+    avanzar = _avanzar_numba if contexto.motor == 'numba' else _avanzar_numpy
+    codigo, a, b, c = contexto.coeficientes
+    
+    tasas = np.full(total, contexto.r0)
+    integral = np.zeros(total)
+    salida = np.zeros((total, contexto.n_nodos))
+    for inicio in range(0, contexto.n_pasos, _PASOS_POR_BLOQUE):
+        pasos = min(_PASOS_POR_BLOQUE, contexto.n_pasos - inicio)
+        normales = rng.standard_normal((mitad, pasos))
+        if contexto.antiteticas:
+            normales = np.concatenate([normales, -normales])
+        avanzar(tasas, integral, normales, inicio, contexto.columna, salida,
+                codigo, a, b, c, contexto.dt)
+    
+    # ∫ r dt en cada tiempo de pago, factor de descuento y valor por trayectoria
+    peso = contexto.peso
+    integral_flujos = (salida[:, contexto.nodo_inferior] * (1 - peso)
+                       + salida[:, contexto.nodo_superior] * peso)
+    valores = np.exp(-integral_flujos) @ contexto.montos
+    if contexto.antiteticas:
+        valores = 0.5 * (valores[:mitad] + valores[mitad:])
+    
+    estimador = EstimadorMonteCarlo(valores.shape[1])
+    estimador.agregar(valores)
+    return estimador.estado()
+
+
+# Contexto de cada proceso trabajador (se envía una sola vez al iniciarlo)
+_CONTEXTO_TRABAJADOR = None
+
+
+def _iniciar_trabajador(contexto):
+    global _CONTEXTO_TRABAJADOR
+    _CONTEXTO_TRABAJADOR = contexto
+
+
+def _simular_lote_trabajador(tarea):
+    semilla, caminos = tarea
+    return _simular_lote(_CONTEXTO_TRABAJADOR, semilla, caminos)
+
+
+def simular_precios(modelo, instrumentos, caminos=100_000, fecha_valuacion=None,
+                    pasos_por_año=52, tamaño_lote=10_000, semilla=None, procesos=1,
+                    motor='auto', antiteticas=False):
+    """
+    Valúa bonos y cronogramas por Monte Carlo sobre trayectorias de tasa corta.
+    
+    Parámetros:
+    -----------
+    modelo : ModeloVasicek o ModeloCIR
+        Dinámica de la tasa corta (anual, capitalización continua)
+    instrumentos : Bono, CarteraBonos, CronogramaFlujos, CarteraCronogramas o lista
+        Instrumentos a valuar; el resultado tiene un precio por instrumento en
+        el orden dado (una CarteraBonos o CarteraCronogramas aporta uno por bono)
+    caminos : int
+        Cantidad total de trayectorias; con `antiteticas` se simulan de a
+        pares, así que un valor impar se redondea al par siguiente
+    fecha_valuacion : fecha, optional
+        Fecha desde la que se miden los cronogramas fechados
+    pasos_por_año : int
+        Pasos de simulación por año; los tiempos de pago fuera de la grilla se
+        interpolan linealmente en ∫ r dt
+    tamaño_lote : int
+        Trayectorias por lote (acota la memoria: cada lote se valúa y descarta)
+    semilla : int o np.random.SeedSequence, optional
+        Semilla de la simulación; cada lote usa una semilla hija propia
+    procesos : int
+        Procesos en paralelo (1 = en el proceso actual)
+    motor : str
+        'auto', 'numba' o 'numpy'; ambos consumen los mismos números aleatorios
+    antiteticas : bool
+        Si es True se usan variables antitéticas (Z y -Z)
+    
+    Retorna:
+    --------
+    ResultadoMonteCarlo
+        Precio, error estándar y cantidad de trayectorias simuladas
+    
+    Ejemplo:
+    --------
+    >>> modelo = ModeloVasicek(kappa=0.3, theta=0.06, sigma=0.01, r0=0.05)
+    >>> res = simular_precios(modelo, [Bono(1000, 0.06, 5, 2)], caminos=200_000, semilla=1)
+    >>> res.precio.round(2), res.error_estandar.round(2)
+    (array([1020.58]), array([0.08]))
+    """
+    contexto = _armar_contexto(modelo, instrumentos, fecha_valuacion, pasos_por_año,
+                               motor, antiteticas)
+    # Con antitéticas los lotes se reparten de a pares de trayectorias (Z, -Z)
+    por_unidad = 2 if antiteticas else 1
+    unidades = -(-caminos // por_unidad)
+    n_lotes = max(1, -(-unidades // max(1, tamaño_lote // por_unidad)))
+    tamaños = np.full(n_lotes, unidades // n_lotes)
+    tamaños[:unidades % n_lotes] += 1
+    tamaños *= por_unidad
+    
+    semilla = semilla if isinstance(semilla, np.random.SeedSequence) else np.random.SeedSequence(semilla)
+    tareas = list(zip(semilla.spawn(n_lotes), tamaños.tolist()))
+    
+    # Los lotes se combinan siempre en el mismo orden: el resultado no depende
+    # de la cantidad de procesos
+    estimador = EstimadorMonteCarlo(contexto.montos.shape[1])
+    if procesos == 1:
+        for semilla_lote, n in tareas:
+            estimador.combinar(_simular_lote(contexto, semilla_lote, n))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(contexto,)) as ejecutor:
+            tamaño_envio = max(1, n_lotes // (4 * procesos))
+            for estado in ejecutor.map(_simular_lote_trabajador, tareas,
+                                       chunksize=tamaño_envio):
+                estimador.combinar(estado)
+    
+    return estimador.resultado(2 if antiteticas else 1)
+
+
+def simular_tasas(modelo, horizonte, caminos=1000, pasos_por_año=52, semilla=None,
+                  motor='auto'):
+    """
+    Genera trayectorias completas de la tasa corta (para gráficos y análisis).
+    
+    Retorna:
+    --------
+    pd.DataFrame
+        Una columna por trayectoria, indexada por tiempo en años
+    """
+    dt = 1.0 / pasos_por_año
+    n_pasos = int(round(horizonte * pasos_por_año))
+    if motor == 'auto':
+        motor = 'numba' if NUMBA_DISPONIBLE else 'numpy'
+    avanzar = _avanzar_numba if motor == 'numba' else _avanzar_numpy
+    codigo, a, b, c = modelo._coeficientes(dt)
+    
+    rng = np.random.default_rng(semilla)
+    tasas = np.full(caminos, float(modelo.r0))
+    trayectorias = np.empty((n_pasos + 1, caminos))
+    trayectorias[0] = tasas
+    columna = np.full(2, -1, dtype=np.int64)
+    sin_nodos = np.empty((caminos, 0))
+    for paso in range(n_pasos):
+        avanzar(tasas, np.zeros(caminos), rng.standard_normal((caminos, 1)), 0,
+                columna, sin_nodos, codigo, a, b, c, dt)
+        trayectorias[paso + 1] = tasas
+    
+    return pd.DataFrame(trayectorias, index=pd.Index(np.arange(n_pasos + 1) * dt, name='t'))
+
+
+if __name__ == "__main__":
+    import time
+    
+    print("=== TESTING MÓDULO SIMULACIÓN DE TASA CORTA ===")
+    
+    vasicek = ModeloVasicek(kappa=0.3, theta=0.06, sigma=0.01, r0=0.05)
+    cir = ModeloCIR(kappa=0.5, theta=0.06, sigma=0.05, r0=0.05)
+    cero = Bono(1, 0.0, 5, 1)
+    
+    for modelo in (vasicek, cir):
+        res = simular_precios(modelo, cero, caminos=100_000, pasos_por_año=52, semilla=7)
+        print(f"{type(modelo).__name__}: MC = {res.precio[0]:.5f} ± {res.error_estandar[0]:.5f}"
+              f" | analítico = {modelo.factor_descuento(5):.5f}")
+    
+    bonos = [Bono(1000, 0.06, 5, 2), Bono(1000, 0.08, 10, 1)]
+    inicio = time.perf_counter()
+    res = simular_precios(vasicek, bonos, caminos=200_000, semilla=1, antiteticas=True)
+    print(f"\n{res.caminos} caminos en {time.perf_counter() - inicio:.2f}s")
+    print(res.a_dataframe(['5Y 6%', '10Y 8%']).round(4))
+    
+    print("\n✅ Todos los tests completados exitosamente")
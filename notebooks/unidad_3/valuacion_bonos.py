@@ -10,13 +10,79 @@ Autor: Prof. Esp. en Finanzas Cuantitativas
 Fecha: 2025
 """
 
+import math
 import numpy as np
 import pandas as pd
-from scipy.optimize import fsolve
+from functools import lru_cache
+from typing import NamedTuple
 import warnings
 warnings.filterwarnings('ignore')
 
 
+class FlujosBono(NamedTuple):
+    """Cronograma de pagos de un bono: tiempos en años y montos."""
+    tiempos: np.ndarray
+    montos: np.ndarray
+
+
+# Tamaño por defecto de la caché de factores de descuento
+TAMAÑO_CACHE_DESCUENTO = 1024
+
+
+@lru_cache(maxsize=TAMAÑO_CACHE_DESCUENTO)
+def factores_descuento(rendimiento_periodo, num_periodos):
+    """
+    Vector de factores de descuento (1 + y)^-t para t = 1..n.
+    
+    Los resultados se guardan en una caché LRU acotada, compartida por todos
+    los bonos, indexada por (rendimiento por período, cantidad de períodos).
+    Los arreglos devueltos son de sólo lectura.
+    
+    Parámetros:
+    -----------
+    rendimiento_periodo : float
+        Rendimiento por período
+    num_periodos : int
+        Cantidad de períodos
+    
+    Retorna:
+    --------
+    np.ndarray
+        Factores de descuento de los períodos 1..n
+    """
+    factores = (1 + rendimiento_periodo) ** -np.arange(1, num_periodos + 1, dtype=float)
+    factores.flags.writeable = False
+    return factores
+
+
+def configurar_cache_descuento(tamaño_maximo):
+    """
+    Cambia el tamaño máximo de la caché de factores de descuento.
+    
+    La caché se vacía y sus estadísticas vuelven a cero.
+    """
+    global factores_descuento
+    factores_descuento = lru_cache(maxsize=tamaño_maximo)(factores_descuento.__wrapped__)
+
+
+def estadisticas_cache_descuento():
+    """
+    Devuelve las estadísticas de uso de la caché de factores de descuento.
+    
+    Retorna:
+    --------
+    dict
+        aciertos, fallos, tasa_aciertos, tamaño actual y tamaño_maximo
+    """
+    info = factores_descuento.cache_info()
+    consultas = info.hits + info.misses
+    return {'aciertos': info.hits,
+            'fallos': info.misses,
+            'tasa_aciertos': info.hits / consultas if consultas else 0.0,
+            'tamaño': info.currsize,
+            'tamaño_maximo': info.maxsize}
+
+
 class Bono:
     """
     Clase para representar y analizar bonos.
@@ -31,13 +97,72 @@ class Bono:
         Años hasta el vencimiento
     frecuencia : int
         Frecuencia de pagos por año (1=anual, 2=semestral, etc.)
+    
+    Para carteras de muchos bonos usar `CarteraBonos`, que guarda los datos
+    por columnas y calcula sobre todos los bonos a la vez.
     """
     
+    __slots__ = ('valor_nominal', 'tasa_cupon', 'años_vencimiento', 'frecuencia', '_flujos')
+    
     def __init__(self, valor_nominal, tasa_cupon, años_vencimiento, frecuencia=1):
         self.valor_nominal = valor_nominal
         self.tasa_cupon = tasa_cupon
         self.años_vencimiento = años_vencimiento
         self.frecuencia = frecuencia
+    
+    def __setattr__(self, nombre, valor):
+        # Cualquier cambio en las características invalida el cronograma guardado
+        object.__setattr__(self, nombre, valor)
+        if nombre != '_flujos':
+            object.__setattr__(self, '_flujos', None)
+    
+    @property
+    def num_periodos(self):
+        """Cantidad de pagos hasta el vencimiento."""
+        return int(round(self.años_vencimiento * self.frecuencia))
+    
+    def flujos(self):
+        """
+        Cronograma de pagos del bono, construido una sola vez y guardado.
+        
+        Retorna:
+        --------
+        FlujosBono
+            Tiempos de pago en años y montos de cada flujo (arreglos de sólo lectura)
+        """
+        if self._flujos is None:
+            num_periodos = self.num_periodos
+            if not np.isclose(num_periodos, self.años_vencimiento * self.frecuencia):
+                raise ValueError("El plazo debe corresponder a una cantidad entera de pagos")
+            tiempos = np.arange(1, num_periodos + 1) / self.frecuencia
+            montos = np.full(num_periodos, self.tasa_cupon * self.valor_nominal / self.frecuencia)
+            montos[-1] += self.valor_nominal
+            tiempos.flags.writeable = False
+            montos.flags.writeable = False
+            self._flujos = FlujosBono(tiempos, montos)
+        return self._flujos
+    
+    def valor_actual_flujos(self, rendimiento):
+        """
+        Valor actual de cada flujo del bono a un rendimiento dado.
+        
+        Usa el cronograma guardado del bono y los factores de descuento de la
+        caché compartida, por lo que evaluar varias veces el mismo bono (o bonos
+        con igual frecuencia y plazo) al mismo rendimiento no recalcula (1 + r)^t.
+        """
+        flujos = self.flujos()
+        factores = factores_descuento(rendimiento / self.frecuencia, len(flujos.montos))
+        return flujos.montos * factores
+    
+    def tabla_flujos(self, rendimiento):
+        """Devuelve el cronograma con factores de descuento y valores actuales."""
+        flujos = self.flujos()
+        factores = factores_descuento(rendimiento / self.frecuencia, len(flujos.montos))
+        return pd.DataFrame({'tiempo': flujos.tiempos,
+                             'flujo': flujos.montos,
+                             'factor_descuento': factores,
+                             'valor_actual': flujos.montos * factores},
+                            index=pd.RangeIndex(1, len(factores) + 1, name='periodo'))
         
     def precio(self, rendimiento):
         """Calcula el precio del bono dado un rendimiento."""
@@ -64,6 +189,11 @@ class Bono:
         """Calcula la convexidad."""
         return convexidad(self.valor_nominal, self.tasa_cupon,
                          self.años_vencimiento, rendimiento, self.frecuencia)
+    
+    def metricas(self, rendimiento):
+        """Calcula precio, duraciones y convexidad en una sola pasada."""
+        return metricas_bono(self.valor_nominal, self.tasa_cupon,
+                             self.años_vencimiento, rendimiento, self.frecuencia)
 
 
 def precio_bono(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
@@ -95,10 +225,10 @@ def precio_bono(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
     """
     if periodos <= 0:
         raise ValueError("Los períodos deben ser positivos")
-    if rendimiento < 0:
-        raise ValueError("El rendimiento no puede ser negativo")
     if frecuencia <= 0:
         raise ValueError("La frecuencia debe ser positiva")
+    if rendimiento / frecuencia <= -1:
+        raise ValueError("El rendimiento por período debe ser mayor a -100%")
     
     # Ajustar parámetros por frecuencia
     cupon_periodo = (tasa_cupon * valor_nominal) / frecuencia
@@ -122,6 +252,7 @@ def rendimiento_al_vencimiento(precio_mercado, valor_nominal, tasa_cupon, period
     """
     Calcula el rendimiento al vencimiento (YTM) de un bono.
     Utiliza método numérico para encontrar la tasa que iguala el precio calculado al precio de mercado.
+    Para muchos bonos a la vez usar `rendimiento_al_vencimiento_lote`.
     
     Parámetros:
     -----------
@@ -139,32 +270,25 @@ def rendimiento_al_vencimiento(precio_mercado, valor_nominal, tasa_cupon, period
     Retorna:
     --------
     float
-        Rendimiento al vencimiento anualizado
+        Rendimiento al vencimiento anualizado (puede ser negativo), o None si
+        no existe un rendimiento que iguale el precio de mercado
     
     Ejemplo:
     --------
     >>> rendimiento_al_vencimiento(950, 1000, 0.08, 5)
     0.0906
     """
-    def ecuacion_precio(ytm):
-        return precio_bono(valor_nominal, tasa_cupon, periodos, ytm, frecuencia) - precio_mercado
+    if (isinstance(precio_mercado, _ESCALARES) and isinstance(valor_nominal, _ESCALARES)
+            and isinstance(tasa_cupon, _ESCALARES) and isinstance(periodos, _ESCALARES)
+            and isinstance(frecuencia, _ESCALARES)):
+        return _rendimiento_escalar(float(precio_mercado), float(valor_nominal),
+                                    float(tasa_cupon), float(periodos), float(frecuencia))
     
-    try:
-        # Estimación inicial del YTM basada en la fórmula aproximada
-        ytm_inicial = (tasa_cupon * valor_nominal + (valor_nominal - precio_mercado) / periodos) / \
-                     ((valor_nominal + precio_mercado) / 2)
-        
-        # Resolver la ecuación numéricamente
-        ytm = fsolve(ecuacion_precio, ytm_inicial)[0]
-        
-        # Verificar que la solución es válida
-        if ytm < 0:
-            raise ValueError("YTM negativo encontrado")
-            
-        return ytm
-    except Exception as e:
-        print(f"Error calculando YTM: {e}")
+    resultado = rendimiento_al_vencimiento_lote(precio_mercado, valor_nominal, tasa_cupon,
+                                                periodos, frecuencia)
+    if not resultado.convergido:
         return None
+    return float(resultado.rendimiento)
 
 
 def duracion_macaulay(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
@@ -191,25 +315,8 @@ def duracion_macaulay(valor_nominal, tasa_cupon, periodos, rendimiento, frecuenc
     float
         Duración de Macaulay en años
     """
-    cupon_periodo = (tasa_cupon * valor_nominal) / frecuencia
-    rendimiento_periodo = rendimiento / frecuencia
-    num_periodos = periodos * frecuencia
-    
-    precio = precio_bono(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia)
-    
-    suma_ponderada = 0
-    
-    # Calcular la suma ponderada de los tiempos de los flujos
-    for t in range(1, num_periodos + 1):
-        if t < num_periodos:
-            flujo = cupon_periodo
-        else:
-            flujo = cupon_periodo + valor_nominal  # Último período incluye principal
-        
-        vp_flujo = flujo / (1 + rendimiento_periodo)**t
-        suma_ponderada += (t / frecuencia) * vp_flujo  # Convertir períodos a años
-    
-    return suma_ponderada / precio
+    return metricas_bono(valor_nominal, tasa_cupon, periodos, rendimiento,
+                         frecuencia).duracion_macaulay
 
 
 def duracion_modificada(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
@@ -237,8 +344,8 @@ def duracion_modificada(valor_nominal, tasa_cupon, periodos, rendimiento, frecue
     float
         Duración modificada
     """
-    d_mac = duracion_macaulay(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia)
-    return d_mac / (1 + rendimiento/frecuencia)
+    return metricas_bono(valor_nominal, tasa_cupon, periodos, rendimiento,
+                         frecuencia).duracion_modificada
 
 
 def convexidad(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
@@ -266,23 +373,699 @@ def convexidad(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
     float
         Convexidad del bono
     """
+    return metricas_bono(valor_nominal, tasa_cupon, periodos, rendimiento,
+                         frecuencia).convexidad
+
+
+class MetricasBono(NamedTuple):
+    """
+    Resultado de `metricas_bono`: precio y medidas de riesgo de tasa.
+    
+    Cada campo es un float o un arreglo con la forma resultante del
+    broadcasting de los argumentos.
+    """
+    precio: np.ndarray
+    duracion_macaulay: np.ndarray
+    duracion_modificada: np.ndarray
+    convexidad: np.ndarray
+
+
+# Por debajo de este valor de |n * y| las fórmulas cerradas pierden precisión
+# por cancelación y se usa el desarrollo de Taylor alrededor de y = 0.
+_UMBRAL_TAYLOR = 1e-2
+_TERMINOS_TAYLOR = 8
+
+# Tipos que toman el camino escalar (floats de Python, sin NumPy)
+_ESCALARES = (int, float, np.integer, np.floating)
+
+# Mayor exponente que admite math.exp sin desbordar
+_LOG_MAXIMO = math.log(np.finfo(float).max)
+
+# Intervalo de búsqueda del rendimiento por período en el cálculo del YTM
+_RENDIMIENTO_PERIODO_MINIMO = -0.99
+_RENDIMIENTO_PERIODO_MAXIMO = 100.0
+
+
+def _precio_por_periodo(valor_nominal, cupon_periodo, num_periodos, rendimiento_periodo):
+    """
+    Sólo el precio P = C·A + VN·v de `_precio_y_derivadas`, con los mismos
+    valores pero sin armar A', A'' ni sus desarrollos de Taylor.
+    """
+    n = num_periodos
+    y = rendimiento_periodo
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_v = -n * np.log1p(y)
+        v = np.exp(log_v)
+        a = -np.expm1(log_v) / np.where(y == 0, 1.0, y)
+    del log_v
+
+    cerca_de_cero = np.abs(n * y) < _UMBRAL_TAYLOR
+    if np.any(cerca_de_cero):
+        a_taylor = np.zeros_like(a)
+        g = n * np.ones_like(y)
+        for k in range(_TERMINOS_TAYLOR):
+            a_taylor = a_taylor + (-1) ** k * g * y**k
+            g = g * (n + k + 1) / (k + 2)
+        a = np.where(cerca_de_cero, a_taylor, a)
+
+    return cupon_periodo * a + valor_nominal * v
+
+
+def _precio_y_derivadas(valor_nominal, cupon_periodo, num_periodos, rendimiento_periodo):
+    """
+    Precio de un bono y sus dos primeras derivadas respecto del rendimiento
+    por período, en forma cerrada y vectorizada.
+    
+    Con v = (1 + y)^-n y A(y) = (1 - v) / y el factor de anualidad:
+    
+        P   = C·A   + VN·v
+        P'  = C·A'  - VN·n·v / (1 + y)
+        P'' = C·A'' + VN·n·(n + 1)·v / (1 + y)^2
+    
+    donde A' = (n·v / (1 + y) - A) / y  y  A'' = (-n·(n + 1)·v / (1 + y)^2 - 2·A') / y.
+    Cerca de y = 0 se usa el desarrollo de Taylor de A, A' y A''.
+    
+    Retorna:
+    --------
+    tuple
+        (P, P', P'') con la forma del broadcasting de los argumentos
+    """
+    n = num_periodos
+    y = rendimiento_periodo
+    base = 1 + y
+    
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        v = np.exp(-n * np.log1p(y))
+        
+        # Fórmulas cerradas (se descartan donde |n·y| es pequeño)
+        y_seguro = np.where(y == 0, 1.0, y)
+        a = -np.expm1(-n * np.log1p(y)) / y_seguro
+        a1 = (n * v / base - a) / y_seguro
+        a2 = (-n * (n + 1) * v / base**2 - 2 * a1) / y_seguro
+    
+    # Desarrollo de Taylor alrededor de y = 0, sólo si algún elemento lo necesita:
+    # A(y) = sum_k (-y)^k · G_k  con  G_k = C(n + k, k + 1)
+    cerca_de_cero = np.abs(n * y) < _UMBRAL_TAYLOR
+    if np.any(cerca_de_cero):
+        a_taylor = np.zeros_like(a)
+        a1_taylor = np.zeros_like(a)
+        a2_taylor = np.zeros_like(a)
+        g = n * np.ones_like(y)
+        for k in range(_TERMINOS_TAYLOR):
+            signo = (-1) ** k
+            a_taylor = a_taylor + signo * g * y**k
+            if k >= 1:
+                a1_taylor = a1_taylor + signo * k * g * y**(k - 1)
+            if k >= 2:
+                a2_taylor = a2_taylor + signo * k * (k - 1) * g * y**(k - 2)
+            g = g * (n + k + 1) / (k + 2)
+        a = np.where(cerca_de_cero, a_taylor, a)
+        a1 = np.where(cerca_de_cero, a1_taylor, a1)
+        a2 = np.where(cerca_de_cero, a2_taylor, a2)
+    
+    precio = cupon_periodo * a + valor_nominal * v
+    d_precio = cupon_periodo * a1 - valor_nominal * n * v / base
+    d2_precio = cupon_periodo * a2 + valor_nominal * n * (n + 1) * v / base**2
+    return precio, d_precio, d2_precio
+
+
+def _precio_y_derivadas_escalar(valor_nominal, cupon_periodo, num_periodos, rendimiento_periodo):
+    """
+    `_precio_y_derivadas` para un único bono con floats de Python y el módulo
+    `math`: mismas fórmulas cerradas y mismo desarrollo de Taylor.
+    """
+    n = num_periodos
+    y = rendimiento_periodo
+    base = 1 + y
+    log_v = -n * math.log1p(y)
+    
+    if abs(n * y) < _UMBRAL_TAYLOR:
+        v = math.exp(log_v)
+        a = a1 = a2 = 0.0
+        g = n
+        for k in range(_TERMINOS_TAYLOR):
+            signo = (-1) ** k
+            a += signo * g * y**k
+            if k >= 1:
+                a1 += signo * k * g * y**(k - 1)
+            if k >= 2:
+                a2 += signo * k * (k - 1) * g * y**(k - 2)
+            g = g * (n + k + 1) / (k + 2)
+    else:
+        if log_v < _LOG_MAXIMO:
+            v = math.exp(log_v)
+            a = -math.expm1(log_v) / y
+        else:
+            # Rendimiento muy negativo: v y A desbordan (como np.exp en la versión vectorial)
+            v = a = math.inf
+        a1 = (n * v / base - a) / y
+        a2 = (-n * (n + 1) * v / base**2 - 2 * a1) / y
+    
+    precio = cupon_periodo * a + valor_nominal * v
+    d_precio = cupon_periodo * a1 - valor_nominal * n * v / base
+    d2_precio = cupon_periodo * a2 + valor_nominal * n * (n + 1) * v / base**2
+    return precio, d_precio, d2_precio
+
+
+def _metricas_escalares(valor_nominal, cupon_periodo, num_periodos, frecuencia, rendimiento):
+    """
+    `_metricas_por_periodo` para un único bono, con floats de Python.
+    """
+    rendimiento_periodo = rendimiento / frecuencia
+    if rendimiento_periodo <= -1:
+        raise ValueError("El rendimiento por período debe ser mayor a -100%")
+    
+    precio, d_precio, d2_precio = _precio_y_derivadas_escalar(
+        valor_nominal, cupon_periodo, num_periodos, rendimiento_periodo)
+    
+    duracion_mod = -d_precio / (precio * frecuencia)
+    return MetricasBono(precio, duracion_mod * (1 + rendimiento_periodo), duracion_mod,
+                        d2_precio / (precio * frecuencia**2))
+
+
+def metricas_bono(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia=1):
+    """
+    Calcula en una sola pasada el precio, la duración de Macaulay, la duración
+    modificada y la convexidad de uno o muchos bonos.
+    
+    Usa las derivadas analíticas del precio (fórmula cerrada de la anualidad),
+    sin recorrer los flujos período a período, por lo que el costo no depende
+    del plazo del bono. Todos los argumentos aceptan escalares o arreglos y se
+    combinan con broadcasting: por ejemplo, `rendimiento[:, None]` contra
+    arreglos de bonos produce una grilla (rendimientos × bonos). Si todos los
+    argumentos son escalares, el cálculo se hace con floats de Python.
+    
+    Parámetros:
+    -----------
+    valor_nominal : float o array_like
+        Valor nominal del bono
+    tasa_cupon : float o array_like
+        Tasa de cupón anual
+    periodos : float o array_like
+        Años hasta el vencimiento
+    rendimiento : float o array_like
+        Rendimiento anual del bono
+    frecuencia : int o array_like, default=1
+        Frecuencia de pagos por año
+    
+    Retorna:
+    --------
+    MetricasBono
+        Tupla con los campos precio, duracion_macaulay (años),
+        duracion_modificada y convexidad
+    
+    Ejemplo:
+    --------
+    >>> m = metricas_bono(1000, 0.08, 5, np.array([0.08, 0.10]), 2)
+    >>> m.precio
+    array([1000.  ,  922.78])
+    """
+    if (isinstance(valor_nominal, _ESCALARES) and isinstance(tasa_cupon, _ESCALARES)
+            and isinstance(periodos, _ESCALARES) and isinstance(rendimiento, _ESCALARES)
+            and isinstance(frecuencia, _ESCALARES)):
+        if periodos <= 0:
+            raise ValueError("Los períodos deben ser positivos")
+        if frecuencia <= 0:
+            raise ValueError("La frecuencia debe ser positiva")
+        return _metricas_escalares(float(valor_nominal), tasa_cupon * valor_nominal / frecuencia,
+                                   float(periodos * frecuencia), float(frecuencia),
+                                   float(rendimiento))
+    
+    valor_nominal = np.asarray(valor_nominal, dtype=float)
+    tasa_cupon = np.asarray(tasa_cupon, dtype=float)
+    periodos = np.asarray(periodos, dtype=float)
+    rendimiento = np.asarray(rendimiento, dtype=float)
+    frecuencia = np.asarray(frecuencia, dtype=float)
+    
+    if np.any(periodos <= 0):
+        raise ValueError("Los períodos deben ser positivos")
+    if np.any(frecuencia <= 0):
+        raise ValueError("La frecuencia debe ser positiva")
+    
     cupon_periodo = (tasa_cupon * valor_nominal) / frecuencia
+    num_periodos = periodos * frecuencia
+    
+    return _metricas_por_periodo(valor_nominal, cupon_periodo, num_periodos,
+                                 frecuencia, rendimiento)
+
+
+def _metricas_por_periodo(valor_nominal, cupon_periodo, num_periodos, frecuencia, rendimiento):
+    """
+    Núcleo de `metricas_bono` a partir de los valores ya expresados por período.
+    """
     rendimiento_periodo = rendimiento / frecuencia
+    if np.any(rendimiento_periodo <= -1):
+        raise ValueError("El rendimiento por período debe ser mayor a -100%")
+    
+    precio, d_precio, d2_precio = _precio_y_derivadas(
+        valor_nominal, cupon_periodo, num_periodos, rendimiento_periodo)
+    
+    duracion_mod = -d_precio / (precio * frecuencia)
+    duracion_mac = duracion_mod * (1 + rendimiento_periodo)
+    convex = d2_precio / (precio * frecuencia**2)
+    
+    return MetricasBono(precio, duracion_mac, duracion_mod, convex)
+
+
+class ResultadoYTM(NamedTuple):
+    """
+    Resultado de `rendimiento_al_vencimiento_lote`.
+    
+    rendimiento : rendimiento al vencimiento anualizado (NaN donde no convergió)
+    convergido : máscara booleana de convergencia por elemento
+    iteraciones : iteraciones utilizadas por cada elemento
+    """
+    rendimiento: np.ndarray
+    convergido: np.ndarray
+    iteraciones: np.ndarray
+
+
+def _resolver_raiz_acotada(funcion, x0, inferior, superior, tol=1e-10, max_iter=50):
+    """
+    Resuelve muchas ecuaciones f_i(x_i) = 0 a la vez con iteraciones de Halley
+    protegidas por un intervalo que encierra la raíz.
+    
+    En cada iteración se intenta el paso de Halley (o de Newton si el de Halley
+    no es válido); si el paso cae fuera del intervalo vigente se reemplaza por
+    una bisección. El intervalo se achica con el signo de f en cada iterado, de
+    modo que la convergencia está garantizada cuando f cambia de signo entre
+    los extremos.
+    
+    Parámetros:
+    -----------
+    funcion : callable
+        funcion(x, indices) -> (f, f', f'') evaluada sólo en los elementos
+        `indices` (arreglo de enteros), con x del mismo largo que `indices`
+    x0, inferior, superior : np.ndarray
+        Estimación inicial y extremos del intervalo para cada ecuación
+    tol : float
+        Tolerancia sobre |f| y sobre el tamaño del paso
+    max_iter : int
+        Máximo de iteraciones
+    
+    Retorna:
+    --------
+    tuple
+        (x, convergido, iteraciones); x es NaN donde no hay cambio de signo
+        entre los extremos o no se alcanzó la tolerancia
+    """
+    x = np.array(x0, dtype=float)
+    inferior = np.array(inferior, dtype=float)
+    superior = np.array(superior, dtype=float)
+    convergido = np.zeros(x.shape, dtype=bool)
+    iteraciones = np.zeros(x.shape, dtype=int)
+    
+    todos = np.arange(x.size)
+    with np.errstate(all='ignore'):
+        f_inferior = funcion(inferior, todos)[0]
+        f_superior = funcion(superior, todos)[0]
+    signo_inferior = np.sign(f_inferior)
+    acotado = signo_inferior * np.sign(f_superior) < 0
+    
+    x = np.clip(x, inferior, superior)
+    activos = np.flatnonzero(acotado)
+    
+    for _ in range(max_iter):
+        if activos.size == 0:
+            break
+        xa, lo, hi = x[activos], inferior[activos], superior[activos]
+        with np.errstate(all='ignore'):
+            f, f1, f2 = funcion(xa, activos)
+            
+            # Achicar el intervalo con el signo de f en el iterado actual
+            mismo_signo = np.sign(f) == signo_inferior[activos]
+            lo = np.where(mismo_signo, xa, lo)
+            hi = np.where(mismo_signo, hi, xa)
+            
+            # Paso de Halley, con Newton como alternativa
+            paso_newton = f / f1
+            paso = paso_newton / (1 - paso_newton * f2 / (2 * f1))
+            paso = np.where(np.isfinite(paso), paso, paso_newton)
+            x_nuevo = xa - paso
+            
+            fuera = ~np.isfinite(x_nuevo) | (x_nuevo <= lo) | (x_nuevo >= hi)
+            x_nuevo = np.where(fuera, 0.5 * (lo + hi), x_nuevo)
+            
+            listo = (np.abs(f) <= tol) | (np.abs(x_nuevo - xa) <= tol * (1 + np.abs(xa)))
+        
+        x[activos] = np.where(listo & (np.abs(f) <= tol), xa, x_nuevo)
+        inferior[activos], superior[activos] = lo, hi
+        iteraciones[activos] += 1
+        convergido[activos] = listo
+        activos = activos[~listo]
+    
+    x[~convergido] = np.nan
+    return x, convergido, iteraciones
+
+
+def rendimiento_al_vencimiento_lote(precio_mercado, valor_nominal, tasa_cupon, periodos,
+                                    frecuencia=1, tol=1e-10, max_iter=50):
+    """
+    Calcula el rendimiento al vencimiento (YTM) de muchos bonos a la vez.
+    
+    Resuelve todas las ecuaciones precio(y) = precio_mercado en simultáneo con
+    iteraciones de Halley vectorizadas, usando las derivadas analíticas del
+    precio y un intervalo de respaldo (bisección) que garantiza la
+    convergencia. Admite rendimientos negativos (mayores a -100% por período).
+    
+    Parámetros:
+    -----------
+    precio_mercado : float o array_like
+        Precio actual de cada bono
+    valor_nominal : float o array_like
+        Valor nominal
+    tasa_cupon : float o array_like
+        Tasa de cupón anual
+    periodos : float o array_like
+        Años hasta el vencimiento
+    frecuencia : int o array_like, default=1
+        Frecuencia de pagos por año
+    tol : float, default=1e-10
+        Tolerancia relativa sobre el precio
+    max_iter : int, default=50
+        Máximo de iteraciones
+    
+    Retorna:
+    --------
+    ResultadoYTM
+        Rendimientos anualizados (NaN donde no convergió), máscara de
+        convergencia e iteraciones por elemento, con la forma del
+        broadcasting de los argumentos
+    
+    Ejemplo:
+    --------
+    >>> r = rendimiento_al_vencimiento_lote([950, 1000, 1100], 1000, 0.08, 5)
+    >>> r.rendimiento.round(5)
+    array([0.09295, 0.08   , 0.05649])
+    """
+    arreglos = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                     (precio_mercado, valor_nominal, tasa_cupon,
+                                      periodos, frecuencia)))
+    forma = arreglos[0].shape
+    precio_mercado, valor_nominal, tasa_cupon, periodos, frecuencia = (
+        a.ravel() for a in arreglos)
+    
+    if np.any(periodos <= 0):
+        raise ValueError("Los períodos deben ser positivos")
+    if np.any(frecuencia <= 0):
+        raise ValueError("La frecuencia debe ser positiva")
+    
+    cupon_periodo = (tasa_cupon * valor_nominal) / frecuencia
     num_periodos = periodos * frecuencia
     
-    precio = precio_bono(valor_nominal, tasa_cupon, periodos, rendimiento, frecuencia)
+    def ecuacion_precio(y, indices):
+        precio, d_precio, d2_precio = _precio_y_derivadas(
+            valor_nominal[indices], cupon_periodo[indices], num_periodos[indices], y)
+        escala = precio_mercado[indices]
+        return ((precio - escala) / escala, d_precio / escala, d2_precio / escala)
     
-    suma_convexidad = 0
+    # Estimación inicial con la fórmula aproximada del YTM, por período
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ytm_inicial = (tasa_cupon * valor_nominal + (valor_nominal - precio_mercado) / periodos) / \
+                      ((valor_nominal + precio_mercado) / 2)
+    y_inicial = np.where(np.isfinite(ytm_inicial), ytm_inicial / frecuencia, 0.0)
     
-    for t in range(1, num_periodos + 1):
-        if t < num_periodos:
-            flujo = cupon_periodo
+    y, convergido, iteraciones = _resolver_raiz_acotada(
+        ecuacion_precio, y_inicial,
+        np.full(y_inicial.shape, _RENDIMIENTO_PERIODO_MINIMO),
+        np.full(y_inicial.shape, _RENDIMIENTO_PERIODO_MAXIMO),
+        tol=tol, max_iter=max_iter)
+    
+    return ResultadoYTM((y * frecuencia).reshape(forma), convergido.reshape(forma),
+                        iteraciones.reshape(forma))
+
+
+
+def _rendimiento_escalar(precio_mercado, valor_nominal, tasa_cupon, periodos, frecuencia,
+                         tol=1e-10, max_iter=50):
+    """
+    `rendimiento_al_vencimiento_lote` para un único bono con floats de Python:
+    mismo intervalo de respaldo, misma estimación inicial y misma tolerancia,
+    con la iteración de Halley de `_resolver_raiz_acotada` escrita en escalar.
+    
+    Retorna:
+    --------
+    float o None
+        Rendimiento anualizado, o None si no hay cambio de signo en el
+        intervalo o no se alcanzó la tolerancia
+    """
+    if periodos <= 0:
+        raise ValueError("Los períodos deben ser positivos")
+    if frecuencia <= 0:
+        raise ValueError("La frecuencia debe ser positiva")
+    if not precio_mercado > 0:
+        return None
+    
+    cupon_periodo = (tasa_cupon * valor_nominal) / frecuencia
+    num_periodos = periodos * frecuencia
+    
+    def ecuacion_precio(y):
+        precio, d_precio, d2_precio = _precio_y_derivadas_escalar(
+            valor_nominal, cupon_periodo, num_periodos, y)
+        return ((precio - precio_mercado) / precio_mercado, d_precio / precio_mercado,
+                d2_precio / precio_mercado)
+    
+    lo, hi = _RENDIMIENTO_PERIODO_MINIMO, _RENDIMIENTO_PERIODO_MAXIMO
+    f_inferior = ecuacion_precio(lo)[0]
+    if not f_inferior * ecuacion_precio(hi)[0] < 0:
+        return None
+    
+    ytm_inicial = (tasa_cupon * valor_nominal + (valor_nominal - precio_mercado) / periodos) / \
+                  ((valor_nominal + precio_mercado) / 2)
+    x = min(max(ytm_inicial / frecuencia, lo), hi)
+    
+    for _ in range(max_iter):
+        f, f1, f2 = ecuacion_precio(x)
+        if (f > 0) == (f_inferior > 0):
+            lo = x
         else:
-            flujo = cupon_periodo + valor_nominal
+            hi = x
+        
+        # Paso de Halley, con Newton como alternativa
+        paso_newton = f / f1 if f1 else math.nan
+        denominador = 1 - paso_newton * f2 / (2 * f1) if f1 else math.nan
+        paso = paso_newton / denominador if denominador else paso_newton
+        if not math.isfinite(paso):
+            paso = paso_newton
+        x_nuevo = x - paso
+        if not math.isfinite(x_nuevo) or x_nuevo <= lo or x_nuevo >= hi:
+            x_nuevo = 0.5 * (lo + hi)
+        
+        if abs(f) <= tol:
+            return x * frecuencia
+        if abs(x_nuevo - x) <= tol * (1 + abs(x)):
+            return x_nuevo * frecuencia
+        x = x_nuevo
+    return None
+
+class CarteraBonos:
+    """
+    Cartera de bonos almacenada por columnas (estructura de arreglos).
+    
+    Cada atributo de los bonos se guarda en un arreglo contiguo de NumPy, junto
+    con los valores derivados por período (cupón, cantidad de períodos), de modo
+    que el precio, el YTM, la duración y la convexidad de toda la cartera se
+    calculan con una sola llamada vectorizada. Los bonos pueden tener distinta
+    frecuencia y plazo.
+    
+    Las altas se agregan al final con capacidad que crece por duplicación (costo
+    amortizado constante) y las bajas compactan los arreglos sin recorrerlos en
+    Python. Cada posición recibe un identificador entero estable.
+    
+    Ejemplo:
+    --------
+    >>> cartera = CarteraBonos()
+    >>> ids = cartera.agregar([1000, 1000], [0.05, 0.08], [3, 10], [1, 2])
+    >>> cartera.precio(0.07)
+    array([ 947.51, 1071.06])
+    """
+    
+    __slots__ = ('_n', '_proximo_id', '_ids', '_valor_nominal', '_tasa_cupon',
+                 '_años_vencimiento', '_frecuencia', '_cupon_periodo', '_num_periodos')
+    
+    _COLUMNAS = ('_valor_nominal', '_tasa_cupon', '_años_vencimiento', '_frecuencia',
+                 '_cupon_periodo', '_num_periodos')
+    
+    def __init__(self, capacidad=64):
+        self._n = 0
+        self._proximo_id = 0
+        self._ids = np.empty(capacidad, dtype=np.int64)
+        for columna in self._COLUMNAS:
+            setattr(self, columna, np.empty(capacidad, dtype=float))
+    
+    @classmethod
+    def desde_bonos(cls, bonos):
+        """Crea una cartera a partir de una secuencia de objetos `Bono`."""
+        bonos = list(bonos)
+        cartera = cls(capacidad=max(len(bonos), 1))
+        cartera.agregar([b.valor_nominal for b in bonos], [b.tasa_cupon for b in bonos],
+                        [b.años_vencimiento for b in bonos], [b.frecuencia for b in bonos])
+        return cartera
+    
+    def __len__(self):
+        return self._n
+    
+    def __repr__(self):
+        return f"CarteraBonos({self._n} bonos)"
+    
+    def _asegurar_capacidad(self, requerida):
+        capacidad = len(self._ids)
+        if requerida <= capacidad:
+            return
+        nueva = max(requerida, 2 * capacidad)
+        for columna in ('_ids',) + self._COLUMNAS:
+            viejo = getattr(self, columna)
+            nuevo = np.empty(nueva, dtype=viejo.dtype)
+            nuevo[:self._n] = viejo[:self._n]
+            setattr(self, columna, nuevo)
+    
+    def agregar(self, valor_nominal, tasa_cupon, años_vencimiento, frecuencia=1):
+        """
+        Agrega uno o varios bonos a la cartera.
+        
+        Parámetros:
+        -----------
+        valor_nominal, tasa_cupon, años_vencimiento, frecuencia : float o array_like
+            Características de los bonos (se combinan con broadcasting)
+        
+        Retorna:
+        --------
+        np.ndarray
+            Identificadores asignados a los bonos agregados
+        """
+        valor_nominal, tasa_cupon, años_vencimiento, frecuencia = (
+            a.ravel() for a in np.broadcast_arrays(
+                *(np.asarray(a, dtype=float) for a in
+                  (valor_nominal, tasa_cupon, años_vencimiento, frecuencia))))
+        
+        if np.any(años_vencimiento <= 0):
+            raise ValueError("Los períodos deben ser positivos")
+        if np.any(frecuencia <= 0):
+            raise ValueError("La frecuencia debe ser positiva")
+        
+        cantidad = len(valor_nominal)
+        self._asegurar_capacidad(self._n + cantidad)
+        nuevos = slice(self._n, self._n + cantidad)
+        
+        ids = np.arange(self._proximo_id, self._proximo_id + cantidad, dtype=np.int64)
+        self._ids[nuevos] = ids
+        self._valor_nominal[nuevos] = valor_nominal
+        self._tasa_cupon[nuevos] = tasa_cupon
+        self._años_vencimiento[nuevos] = años_vencimiento
+        self._frecuencia[nuevos] = frecuencia
+        self._cupon_periodo[nuevos] = (tasa_cupon * valor_nominal) / frecuencia
+        self._num_periodos[nuevos] = años_vencimiento * frecuencia
+        
+        self._n += cantidad
+        self._proximo_id += cantidad
+        return ids
+    
+    def agregar_bono(self, bono):
+        """Agrega un objeto `Bono` y devuelve su identificador."""
+        return int(self.agregar(bono.valor_nominal, bono.tasa_cupon,
+                                bono.años_vencimiento, bono.frecuencia)[0])
+    
+    def eliminar(self, ids):
+        """
+        Elimina de la cartera los bonos con los identificadores indicados.
+        
+        Retorna:
+        --------
+        int
+            Cantidad de bonos eliminados
+        """
+        conservar = ~np.isin(self._ids[:self._n], np.asarray(ids, dtype=np.int64))
+        restantes = int(conservar.sum())
+        eliminados = self._n - restantes
+        if eliminados:
+            for columna in ('_ids',) + self._COLUMNAS:
+                arreglo = getattr(self, columna)
+                arreglo[:restantes] = arreglo[:self._n][conservar]
+            self._n = restantes
+        return eliminados
+    
+    @property
+    def ids(self):
+        return self._ids[:self._n]
+    
+    @property
+    def valor_nominal(self):
+        return self._valor_nominal[:self._n]
+    
+    @property
+    def tasa_cupon(self):
+        return self._tasa_cupon[:self._n]
+    
+    @property
+    def años_vencimiento(self):
+        return self._años_vencimiento[:self._n]
+    
+    @property
+    def frecuencia(self):
+        return self._frecuencia[:self._n]
+    
+    def metricas(self, rendimiento):
+        """
+        Precio, duraciones y convexidad de todos los bonos de la cartera.
+        
+        Parámetros:
+        -----------
+        rendimiento : float o array_like
+            Rendimiento anual: un escalar, un valor por bono (largo n) o una
+            grilla de forma (k, n) para evaluar k escenarios a la vez
         
-        suma_convexidad += (flujo * t * (t + 1)) / (1 + rendimiento_periodo)**(t + 2)
+        Retorna:
+        --------
+        MetricasBono
+            Campos con la forma del broadcasting de `rendimiento` contra (n,)
+        """
+        n = self._n
+        return _metricas_por_periodo(self._valor_nominal[:n], self._cupon_periodo[:n],
+                                     self._num_periodos[:n], self._frecuencia[:n],
+                                     np.asarray(rendimiento, dtype=float))
+    
+    def precio(self, rendimiento):
+        """Precio de cada bono de la cartera (sin calcular las derivadas)."""
+        n = self._n
+        rendimiento_periodo = np.asarray(rendimiento, dtype=float) / self._frecuencia[:n]
+        if np.any(rendimiento_periodo <= -1):
+            raise ValueError("El rendimiento por período debe ser mayor a -100%")
+        return _precio_por_periodo(self._valor_nominal[:n], self._cupon_periodo[:n],
+                                   self._num_periodos[:n], rendimiento_periodo)
+    
+    def duracion_modificada(self, rendimiento):
+        """Duración modificada de cada bono de la cartera."""
+        return self.metricas(rendimiento).duracion_modificada
     
-    return suma_convexidad / (precio * frecuencia**2)
+    def convexidad(self, rendimiento):
+        """Convexidad de cada bono de la cartera."""
+        return self.metricas(rendimiento).convexidad
+    
+    def ytm(self, precios_mercado, tol=1e-10, max_iter=50):
+        """
+        Rendimiento al vencimiento de cada bono dado su precio de mercado.
+        
+        Retorna:
+        --------
+        ResultadoYTM
+            Rendimientos, máscara de convergencia e iteraciones por bono
+        """
+        return rendimiento_al_vencimiento_lote(precios_mercado, self.valor_nominal,
+                                               self.tasa_cupon, self.años_vencimiento,
+                                               self.frecuencia, tol=tol, max_iter=max_iter)
+    
+    def a_dataframe(self):
+        """Devuelve la cartera como DataFrame indexado por identificador."""
+        return pd.DataFrame({'valor_nominal': self.valor_nominal,
+                             'tasa_cupon': self.tasa_cupon,
+                             'años_vencimiento': self.años_vencimiento,
+                             'frecuencia': self.frecuencia},
+                            index=pd.Index(self.ids, name='id'))
+
+
+# Nombre alternativo en inglés
+BondBook = CarteraBonos
 
 
 # Ejemplo de uso y testing
@@ -304,4 +1087,8 @@ if __name__ == "__main__":
     print(f"Precio (clase): ${precio_obj:.2f}")
     print(f"Duración modificada: {duracion:.4f}")
     
+    # Test cartera por columnas
+    cartera = CarteraBonos.desde_bonos([mi_bono, Bono(1000, 0.05, 10, 1)])
+    print(f"Precios cartera: {np.round(cartera.precio(0.10), 2)}")
+    
     print("\n✅ Todos los tests completados exitosamente")
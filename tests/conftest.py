@@ -0,0 +1,18 @@
+"""
+Configuración de las pruebas
+Universidad Tecnológica Nacional - Facultad Regional La Plata
+Finanzas y Control Empresario - Ingeniería Industrial
+
+Agrega las carpetas de cada unidad al path para importar sus módulos.
+"""
+
+import sys
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+
+RAIZ = Path(__file__).resolve().parent.parent
+for unidad in ('unidad_1', 'unidad_2', 'unidad_3'):
+    sys.path.insert(0, str(RAIZ / 'notebooks' / unidad))
@@ -0,0 +1,85 @@
+"""
+Pruebas de la carga incremental de paneles y de los ratios de panel (unidad 2)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis_financiero import AnalizadorFinanciero, FAMILIAS_RATIOS, calcular_ratios_panel
+
+
+def _analizador():
+    analizador = AnalizadorFinanciero()
+    analizador.cargar_panel(pd.DataFrame({
+        'empresa': ['A', 'B'], 'periodo': ['2024', '2024'],
+        'activo_corriente': [1500.0, 800.0], 'pasivo_corriente': [1000.0, 400.0],
+    }))
+    return analizador
+
+
+def test_recarga_parcial_conserva_cuentas_no_informadas():
+    analizador = _analizador()
+    analizador.ratios('liquidez')
+    
+    # A informa sólo el pasivo corriente; B repite su activo corriente
+    modificadas = analizador.cargar_panel(pd.DataFrame({
+        'empresa': ['A', 'B'], 'periodo': ['2024', '2024'],
+        'activo_corriente': [np.nan, 800.0], 'pasivo_corriente': [750.0, np.nan],
+    }))
+    
+    assert modificadas.tolist() == [('A', '2024')]
+    assert analizador.estados.loc[('A', '2024'), 'activo_corriente'] == 1500.0
+    assert analizador.estados.loc[('B', '2024'), 'pasivo_corriente'] == 400.0
+    liquidez = analizador.ratios('liquidez')['liquidez_corriente']
+    assert liquidez[('A', '2024')] == 2.0
+    assert liquidez[('B', '2024')] == 2.0
+
+
+def test_recarga_sin_cambios_no_invalida():
+    analizador = _analizador()
+    modificadas = analizador.cargar_cuentas('A', '2024', activo_corriente=1500.0)
+    assert len(modificadas) == 0
+
+
+def _panel_con_faltantes():
+    """Una fila completa y otra sin activo ni patrimonio"""
+    cuentas = {
+        'activo_corriente': [1500.0, np.nan], 'pasivo_corriente': [1000.0, np.nan],
+        'inventarios': [300.0, 100.0], 'efectivo': [200.0, 50.0],
+        'ventas': [9000.0, 5000.0], 'costo_ventas': [6000.0, np.nan],
+        'cuentas_por_cobrar': [900.0, np.nan], 'cuentas_por_pagar': [500.0, 300.0],
+        'activo_total': [5000.0, np.nan], 'activo_fijo': [np.nan, 2000.0],
+        'pasivo_total': [2000.0, 50.0], 'patrimonio_neto': [3000.0, np.nan],
+        'pasivo_no_corriente': [1000.0, 20.0], 'gastos_financieros': [100.0, np.nan],
+        'resultado_operativo': [1200.0, 400.0], 'resultado_neto': [800.0, 300.0],
+    }
+    return pd.DataFrame(cuentas, index=pd.MultiIndex.from_tuples(
+        [('A', '2024'), ('B', '2024')], names=['empresa', 'periodo']))
+
+
+# Ratios de la fila incompleta que no dependen de ninguna cuenta faltante
+_CALCULABLES = {
+    'liquidez': [],
+    'actividad': ['rotacion_activo_fijo'],
+    'endeudamiento': ['pasivo_no_corriente_sobre_total'],
+    'rentabilidad': ['margen_neto', 'margen_operativo'],
+    'dupont': ['margen_neto'],
+}
+
+
+@pytest.mark.parametrize('familia', list(FAMILIAS_RATIOS))
+def test_ratios_panel_propagan_faltantes(familia):
+    ratios = FAMILIAS_RATIOS[familia](_panel_con_faltantes(), 'ancho')
+    incompleta = ratios.loc[('B', '2024')]
+    
+    calculables = _CALCULABLES[familia]
+    assert np.isfinite(incompleta[calculables]).all()
+    assert incompleta.drop(calculables).isna().all()
+
+
+def test_faltantes_no_se_reemplazan_por_cero():
+    fila = calcular_ratios_panel(_panel_con_faltantes()).loc[('B', '2024')]
+    for familia, ratio in [('endeudamiento', 'endeudamiento_total'), ('rentabilidad', 'roe'),
+                           ('rentabilidad', 'roi_activo_operativo')]:
+        assert np.isnan(fila[familia, ratio])
@@ -0,0 +1,24 @@
+"""
+Pruebas del bootstrapping de la curva cupón cero (unidad 3)
+"""
+
+import numpy as np
+import pytest
+
+from curva_cupon_cero import bootstrap_curva
+
+
+BONOS = dict(valor_nominal=100, tasa_cupon=[0.0, 0.04, 0.05, 0.06, 0.07],
+             años_vencimiento=[0.5, 2, 5, 10, 20], frecuencia=2,
+             rendimientos=[0.30, 0.27, 0.24, 0.22, 0.20])
+
+
+def test_cubica_revalua_los_bonos():
+    curva = bootstrap_curva(**BONOS, metodo='cubica_monotona')
+    np.testing.assert_allclose(curva.tasa_cero([1, 3, 7]), [0.307601, 0.272269, 0.237847],
+                               atol=1e-6)
+
+
+def test_cubica_sin_convergencia_lanza_error():
+    with pytest.raises(RuntimeError):
+        bootstrap_curva(**BONOS, metodo='cubica_monotona', max_pasadas=1)
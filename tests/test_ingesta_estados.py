@@ -0,0 +1,28 @@
+"""
+Pruebas de la lectura por bloques de estados financieros (unidad 2)
+"""
+
+import numpy as np
+import pandas as pd
+
+from analisis_financiero import CAMPOS_RATIOS
+from ingesta_estados import calcular_ratios_archivo
+
+
+def test_bloque_sin_una_cuenta_da_ratios_nan(tmp_path):
+    cuentas = CAMPOS_RATIOS['endeudamiento']
+    filas = [('A', '2024', cuenta, 100.0 * (i + 1)) for i, cuenta in enumerate(cuentas)]
+    filas += [('B', '2024', cuenta, 100.0 * (i + 1)) for i, cuenta in enumerate(cuentas)
+              if cuenta != 'activo_total']
+    ruta = tmp_path / 'estados.csv'
+    pd.DataFrame(filas, columns=['empresa', 'periodo', 'cuenta', 'valor']).to_csv(ruta, index=False)
+    
+    # El primer bloque trae todas las cuentas de A; el segundo, B sin activo total
+    ratios = calcular_ratios_archivo(ruta, familias=['endeudamiento'],
+                                     tamaño_bloque=len(cuentas))['endeudamiento']
+    b = ratios.xs('B', level='empresa').iloc[0]
+    
+    assert np.isnan(b['endeudamiento_total'])
+    assert np.isnan(b['autonomia'])
+    assert b['apalancamiento'] == 2 / 3
+    assert ratios.xs('A', level='empresa').notna().all(axis=None)
@@ -0,0 +1,26 @@
+"""
+Pruebas del Monte Carlo de tasa corta (unidad 3)
+"""
+
+import pytest
+
+from simulacion_tasa_corta import ModeloVasicek, simular_precios
+from valuacion_bonos import Bono
+
+
+MODELO = ModeloVasicek(kappa=0.3, theta=0.06, sigma=0.01, r0=0.05)
+
+
+@pytest.mark.parametrize('caminos, tamaño_lote, esperados', [
+    (20_001, 10_000, 20_002), (30_003, 10_000, 30_004), (20_000, 10_000, 20_000),
+    (7, 2, 8), (1, 100, 2)])
+def test_antiteticas_informan_caminos_simulados(caminos, tamaño_lote, esperados):
+    res = simular_precios(MODELO, Bono(1, 0.0, 1, 1), caminos=caminos, pasos_por_año=12,
+                          tamaño_lote=tamaño_lote, semilla=0, antiteticas=True)
+    assert res.caminos == esperados
+
+
+def test_sin_antiteticas_respeta_caminos():
+    res = simular_precios(MODELO, Bono(1, 0.0, 1, 1), caminos=20_001, pasos_por_año=12,
+                          tamaño_lote=10_000, semilla=0)
+    assert res.caminos == 20_001
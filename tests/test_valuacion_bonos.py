@@ -0,0 +1,42 @@
+"""
+Pruebas de los caminos escalares de valuación de bonos (unidad 3)
+"""
+
+import numpy as np
+import pytest
+
+from valuacion_bonos import (metricas_bono, rendimiento_al_vencimiento,
+                             rendimiento_al_vencimiento_lote)
+
+
+@pytest.mark.parametrize('rendimiento', [0.0, 1e-6, -0.02, 0.10, 0.45])
+@pytest.mark.parametrize('frecuencia', [1, 2, 12])
+def test_metricas_escalares_igual_a_vectoriales(rendimiento, frecuencia):
+    escalar = metricas_bono(1000, 0.08, 7, rendimiento, frecuencia)
+    vectorial = metricas_bono(1000, 0.08, np.array([7.0]), rendimiento, frecuencia)
+    
+    assert all(isinstance(campo, float) for campo in escalar)
+    np.testing.assert_allclose(escalar, [campo[0] for campo in vectorial], rtol=1e-12)
+
+
+def test_metricas_escalares_validan_argumentos():
+    with pytest.raises(ValueError):
+        metricas_bono(1000, 0.08, 0, 0.10)
+    with pytest.raises(ValueError):
+        metricas_bono(1000, 0.08, 5, -1.0)
+
+
+def test_ytm_escalar_igual_al_lote():
+    rng = np.random.default_rng(0)
+    precios = rng.uniform(50, 2500, 200)
+    cupones = rng.uniform(0, 0.2, 200)
+    plazos = rng.integers(1, 40, 200).astype(float)
+    lote = rendimiento_al_vencimiento_lote(precios, 1000, cupones, plazos, 2)
+    
+    escalares = [rendimiento_al_vencimiento(float(p), 1000, float(c), float(t), 2)
+                 for p, c, t in zip(precios, cupones, plazos)]
+    np.testing.assert_allclose(escalares, lote.rendimiento, rtol=1e-12, atol=1e-12)
+
+
+def test_ytm_escalar_sin_solucion():
+    assert rendimiento_al_vencimiento(-10, 1000, 0.08, 5) is None